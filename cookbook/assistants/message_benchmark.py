@@ -0,0 +1,50 @@
+"""Compare the cost of loading and dumping a 10k message history as Message and MessageRecord objects."""
+
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from phi.llm.message import Message, MessageRecord
+
+num_messages = 10_000
+history: List[Dict[str, Any]] = []
+for i in range(num_messages):
+    if i % 4 == 2:
+        history.append(
+            {
+                "role": "assistant",
+                "tool_calls": [
+                    {"id": f"call_{i}", "type": "function", "function": {"name": "search", "arguments": "{}"}}
+                ],
+                "metrics": {"time": 0.5, "input_tokens": 120, "output_tokens": 20},
+            }
+        )
+    else:
+        history.append(
+            {
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": f"Message {i} about Thai recipes and how to cook them.",
+                "metrics": {"time": 0.5},
+            }
+        )
+
+
+def measure(name: str, func: Callable[[], Any]) -> Any:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<28} time={elapsed * 1000:8.1f}ms allocated={allocated / 1024 / 1024:6.2f}MB")
+    return result
+
+
+print(f"History: {num_messages:,} messages")
+messages = measure("load Message", lambda: [Message(**m) for m in history])
+records = measure("load MessageRecord", lambda: [MessageRecord.from_dict(m) for m in history])
+measure("dump Message", lambda: json.dumps([m.model_dump(exclude_none=True) for m in messages]))
+measure("dump MessageRecord", lambda: json.dumps([r.model_dump(exclude_none=True) for r in records]))
+measure("to_dict Message", lambda: [m.to_dict() for m in messages])
+measure("to_dict MessageRecord", lambda: [r.to_dict() for r in records])
@@ -0,0 +1,46 @@
+import typer
+from rich.prompt import Prompt
+from typing import Optional
+
+from phi.assistant import Assistant
+from phi.knowledge.pdf import PDFUrlKnowledgeBase
+from phi.vectordb.numpydb import NumpyDb
+
+db_path = "tmp/numpydb"
+
+knowledge_base = PDFUrlKnowledgeBase(
+    urls=["https://phi-public.s3.amazonaws.com/recipes/ThaiRecipes.pdf"],
+    vector_db=NumpyDb(collection="recipes", path=db_path),
+)
+
+# Comment out after first run
+knowledge_base.load(recreate=False)
+
+
+def pdf_assistant(user: str = "user"):
+    run_id: Optional[str] = None
+
+    assistant = Assistant(
+        run_id=run_id,
+        user_id=user,
+        knowledge_base=knowledge_base,
+        use_tools=True,
+        show_tool_calls=True,
+        # Uncomment the following line to use traditional RAG
+        # add_references_to_prompt=True,
+    )
+    if run_id is None:
+        run_id = assistant.run_id
+        print(f"Started Run: {run_id}\n")
+    else:
+        print(f"Continuing Run: {run_id}\n")
+
+    while True:
+        message = Prompt.ask(f"[bold] :sunglasses: {user} [/bold]")
+        if message in ("exit", "bye"):
+            break
+        assistant.print_response(message)
+
+
+if __name__ == "__main__":
+    typer.run(pdf_assistant)
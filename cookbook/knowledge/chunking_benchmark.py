@@ -0,0 +1,36 @@
+"""Compare the speed and output of the document chunking strategies on a large synthetic corpus."""
+
+import time
+from typing import List
+
+from phi.document import Document
+from phi.document.chunking import ChunkingStrategy, FixedSizeChunking, RecursiveChunking, SentenceChunking
+
+paragraphs: List[str] = []
+for i in range(50_000):
+    paragraphs.append(f"Paragraph {i} talks about Thai recipes.  It has a few sentences!\tDoes it work?\nYes it does.")
+document = Document(name="benchmark", content="\n\n".join(paragraphs))
+
+strategies: List[ChunkingStrategy] = [
+    FixedSizeChunking(chunk_size=3000),
+    FixedSizeChunking(chunk_size=3000, chunk_overlap=300),
+    RecursiveChunking(chunk_size=3000, chunk_overlap=300),
+    SentenceChunking(chunk_size=3000, chunk_overlap=300),
+]
+try:
+    from phi.document.chunking import TokenChunking
+
+    TokenChunking().encoding
+    strategies.append(TokenChunking(chunk_size=500, chunk_overlap=50))
+except ImportError:
+    print("Skipping TokenChunking, `pip install tiktoken` to include it")
+
+print(f"Corpus: {len(document.content):,} characters")
+for strategy in strategies:
+    start = time.perf_counter()
+    chunks = strategy.chunk(document)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{strategy.__class__.__name__:<20} overlap={strategy.chunk_overlap:<4} "
+        f"chunks={len(chunks):<6} max_size={max(len(chunk.content) for chunk in chunks):<6} time={elapsed:.3f}s"
+    )
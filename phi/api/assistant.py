@@ -4,6 +4,7 @@ from typing import Union, Dict, List
 from httpx import Response
 
 from phi.api.api import api, invalid_response
+from phi.api.exporter import get_exporter
 from phi.api.routes import ApiRoutes
 from phi.api.schemas.assistant import (
     AssistantEventCreate,
@@ -76,3 +77,13 @@ def create_assistant_event(event: AssistantEventCreate) -> bool:
         except Exception as e:
             logger.debug(f"Could not create assistant event: {e}")
     return False
+
+
+def log_assistant_run(run: AssistantRunCreate) -> bool:
+    """Queue the assistant run to be sent by the background exporter. Returns False if it is dropped."""
+    return get_exporter().submit("assistant_run", run.model_dump(exclude_none=True))
+
+
+def log_assistant_event(event: AssistantEventCreate) -> bool:
+    """Queue the assistant event to be sent by the background exporter. Returns False if it is dropped."""
+    return get_exporter().submit("assistant_event", event.model_dump(exclude_none=True))
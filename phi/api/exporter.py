@@ -0,0 +1,229 @@
+import atexit
+import gzip
+import json
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from os import getenv
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from phi.api.api import api, invalid_response
+from phi.api.routes import ApiRoutes
+from phi.cli.settings import phi_cli_settings
+from phi.constants import PHI_API_KEY_ENV_VAR, PHI_WS_KEY_ENV_VAR
+from phi.utils.log import logger
+
+# An event is a dict with the event "type" and the "data" to export
+Event = Dict[str, Any]
+
+
+class EventSink(ABC):
+    """Destination of the monitoring events exported by an EventExporter"""
+
+    @abstractmethod
+    def export(self, events: List[Event]) -> None:
+        """Export a batch of events. Raise an exception to retry the batch."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class ApiSink(EventSink):
+    """Send the events to the phidata api"""
+
+    # Route and request body key for each event type
+    routes: Dict[str, Tuple[str, str]] = {
+        "assistant_run": (ApiRoutes.ASSISTANT_RUN_CREATE, "run"),
+        "assistant_event": (ApiRoutes.ASSISTANT_EVENT_CREATE, "event"),
+    }
+
+    def __init__(self, compress: bool = False):
+        # Send gzip compressed request bodies
+        self.compress = compress
+
+    def export(self, events: List[Event]) -> None:
+        if not phi_cli_settings.api_enabled:
+            return
+
+        headers = {
+            "Authorization": f"Bearer {getenv(PHI_API_KEY_ENV_VAR)}",
+            "PHI-WORKSPACE": f"{getenv(PHI_WS_KEY_ENV_VAR)}",
+        }
+        if self.compress:
+            headers["Content-Encoding"] = "gzip"
+        # Send the batch over one connection
+        with api.AuthenticatedClient() as api_client:
+            for i, event in enumerate(events):
+                route, key = self.routes[event["type"]]
+                content = json.dumps({key: event["data"]}).encode("utf-8")
+                if self.compress:
+                    content = gzip.compress(content)
+                try:
+                    r = api_client.post(route, headers=headers, content=content)
+                    if r.status_code >= 500:
+                        raise RuntimeError(f"Could not send {event['type']}: {r.status_code}")
+                except Exception:
+                    # Only retry the events that were not sent
+                    del events[:i]
+                    raise
+                if invalid_response(r):
+                    logger.debug(f"Dropping {event['type']}: {r.status_code}")
+
+
+class JsonlFileSink(EventSink):
+    """Append the events to a JSON lines file, e.g. for setups without access to the api"""
+
+    def __init__(self, path: Union[str, Path], compress: bool = False):
+        self.path = Path(path)
+        # Append each batch as a gzip member, the file can be read with gzip.open
+        self.compress = compress
+
+    def export(self, events: List[Event]) -> None:
+        lines = "".join(json.dumps(event, default=str) + "\n" for event in events).encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as f:
+            f.write(gzip.compress(lines) if self.compress else lines)
+
+
+class EventExporter:
+    """Export monitoring events from a background thread so they do not add latency to the caller.
+
+    Events are put on a bounded queue and dropped when the queue is full. The worker thread sends them
+    to the sink in batches, retrying failed batches with exponential backoff.
+    Pending events are flushed when the process exits.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[EventSink] = None,
+        max_queue_size: int = 1000,
+        batch_size: int = 20,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        shutdown_timeout: float = 5.0,
+    ):
+        self.sink: EventSink = sink or ApiSink()
+        self.batch_size = batch_size
+        # Seconds to wait for more events before sending a partial batch
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        # Seconds to wait for pending events on exit
+        self.shutdown_timeout = shutdown_timeout
+        self.num_dropped = 0
+
+        self._queue: "queue.Queue[Optional[Event]]" = queue.Queue(maxsize=max_queue_size)
+        self._pending = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def _start(self) -> None:
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="phi-event-exporter", daemon=True)
+                self._thread.start()
+                atexit.register(self.shutdown)
+
+    def submit(self, event_type: str, data: Dict[str, Any]) -> bool:
+        """Queue an event without blocking. Returns False if the event is dropped."""
+        if self._closed:
+            return False
+        self._start()
+        with self._condition:
+            self._pending += 1
+        try:
+            self._queue.put_nowait({"type": event_type, "data": data, "created_at": time.time()})
+        except queue.Full:
+            self.num_dropped += 1
+            logger.debug(f"Monitoring queue full, dropping {event_type}")
+            self._done(1)
+            return False
+        return True
+
+    def _done(self, n: int) -> None:
+        with self._condition:
+            self._pending -= n
+            if self._pending <= 0:
+                self._condition.notify_all()
+
+    def _export(self, batch: List[Event]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.sink.export(batch)
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.num_dropped += len(batch)
+                    logger.debug(f"Could not export {len(batch)} events: {e}")
+                    return
+                time.sleep(self.retry_backoff * (2**attempt))
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            event = self._queue.get()
+            if event is None:
+                break
+            batch = [event]
+            # Wait up to flush_interval for a full batch
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    event = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if event is None:
+                    stop = True
+                    break
+                batch.append(event)
+            num_events = len(batch)
+            self._export(batch)
+            self._done(num_events)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the queued events are exported. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending <= 0, timeout=timeout)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Export the queued events and stop the worker thread"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self.flush(timeout=timeout if timeout is not None else self.shutdown_timeout)
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            self._thread.join(timeout=1)
+        self.sink.close()
+
+
+_exporter: Optional[EventExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def get_exporter() -> EventExporter:
+    """Returns the exporter used for monitoring, creating one that sends events to the api on first use"""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = EventExporter()
+    return _exporter
+
+
+def set_exporter(exporter: EventExporter) -> None:
+    """Use a custom exporter for monitoring, e.g. EventExporter(sink=JsonlFileSink("monitoring.jsonl"))"""
+    global _exporter
+    with _exporter_lock:
+        previous = _exporter
+        _exporter = exporter
+    if previous is not None:
+        previous.shutdown()
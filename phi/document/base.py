@@ -25,7 +25,54 @@ class Document(BaseModel):
         if _embedder is None:
             raise ValueError("No embedder provided")
 
-        self.embedding, self.usage = _embedder.get_embedding_and_usage(self.content)
+        self.embedding, self.usage = _embedder.get_cached_embedding_and_usage(self.content)
+
+    @staticmethod
+    def embed_documents(documents: List["Document"], embedder: Embedder) -> None:
+        """Embed a list of documents using batched requests to the embedder.
+        Documents that already have an embedding are skipped.
+        """
+
+        documents_to_embed = [document for document in documents if document.embedding is None]
+        if len(documents_to_embed) == 0:
+            return
+
+        embeddings, usage = embedder.get_cached_embeddings_and_usage(
+            [document.content for document in documents_to_embed]
+        )
+        if len(embeddings) != len(documents_to_embed):
+            raise ValueError(f"Expected {len(documents_to_embed)} embeddings, got {len(embeddings)}")
+
+        for document, _embedding, _usage in zip(documents_to_embed, embeddings, usage):
+            document.embedding = _embedding
+            document.usage = _usage
+
+    async def aembed(self, embedder: Optional[Embedder] = None) -> None:
+        """Async version of `embed`"""
+
+        _embedder = embedder or self.embedder
+        if _embedder is None:
+            raise ValueError("No embedder provided")
+
+        self.embedding, self.usage = await _embedder.aget_cached_embedding_and_usage(self.content)
+
+    @staticmethod
+    async def aembed_documents(documents: List["Document"], embedder: Embedder) -> None:
+        """Async version of `embed_documents`"""
+
+        documents_to_embed = [document for document in documents if document.embedding is None]
+        if len(documents_to_embed) == 0:
+            return
+
+        embeddings, usage = await embedder.aget_cached_embeddings_and_usage(
+            [document.content for document in documents_to_embed]
+        )
+        if len(embeddings) != len(documents_to_embed):
+            raise ValueError(f"Expected {len(documents_to_embed)} embeddings, got {len(embeddings)}")
+
+        for document, _embedding, _usage in zip(documents_to_embed, embeddings, usage):
+            document.embedding = _embedding
+            document.usage = _usage
 
     def to_dict(self) -> Dict[str, Any]:
         """Returns a dictionary representation of the document"""
@@ -0,0 +1,5 @@
+from phi.document.chunking.base import ChunkingStrategy
+from phi.document.chunking.fixed import FixedSizeChunking
+from phi.document.chunking.recursive import RecursiveChunking
+from phi.document.chunking.sentence import SentenceChunking
+from phi.document.chunking.token import TokenChunking
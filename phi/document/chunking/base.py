@@ -0,0 +1,86 @@
+import re
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from phi.document.base import Document
+
+# Any run of whitespace (spaces, newlines, tabs, carriage returns, form feeds, vertical tabs)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+# Runs of horizontal whitespace, newlines are preserved
+_HORIZONTAL_WHITESPACE_PATTERN = re.compile(r"[^\S\n]+")
+# Blank lines collapsed to a single paragraph break
+_BLANK_LINES_PATTERN = re.compile(r"\n\s*\n")
+
+
+class ChunkingStrategy(BaseModel):
+    """Base class for strategies that split a document into smaller documents"""
+
+    # Target maximum size of each chunk
+    chunk_size: int = 3000
+    # Size of the overlap between consecutive chunks
+    chunk_overlap: int = 0
+
+    def chunk(self, document: Document) -> List[Document]:
+        raise NotImplementedError
+
+    @staticmethod
+    def clean_text(text: str) -> str:
+        """Collapse every run of whitespace into a single space in one pass"""
+        return _WHITESPACE_PATTERN.sub(" ", text)
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Collapse horizontal whitespace and blank lines, keeping paragraph and line breaks"""
+        return _BLANK_LINES_PATTERN.sub("\n\n", _HORIZONTAL_WHITESPACE_PATTERN.sub(" ", text))
+
+    def get_chunk_id(self, document: Document, chunk_number: int) -> Optional[str]:
+        if document.id:
+            return f"{document.id}_{chunk_number}"
+        elif document.name:
+            return f"{document.name}_{chunk_number}"
+        return None
+
+    def build_chunks(self, document: Document, chunks: List[str]) -> List[Document]:
+        """Create one document per chunk, numbering chunks from 1"""
+        chunked_documents: List[Document] = []
+        meta_data = document.meta_data
+        for chunk_number, chunk in enumerate(chunks, start=1):
+            # The content and meta_data are already validated, so skip pydantic validation for each chunk
+            chunked_documents.append(
+                Document.model_construct(
+                    id=self.get_chunk_id(document, chunk_number),
+                    name=document.name,
+                    meta_data={**meta_data, "chunk": chunk_number, "chunk_size": len(chunk)},
+                    content=chunk,
+                )
+            )
+        return chunked_documents
+
+    def merge_splits(self, splits: List[str], separator: str) -> List[str]:
+        """Greedily merge consecutive splits into chunks of at most `chunk_size`,
+        carrying over up to `chunk_overlap` characters of trailing splits into the next chunk.
+        Splits are expected to be no longer than `chunk_size`.
+        """
+        chunks: List[str] = []
+        current: List[str] = []
+        current_length = 0
+        separator_length = len(separator)
+        for split in splits:
+            split_length = len(split)
+            if current and current_length + separator_length + split_length > self.chunk_size:
+                chunks.append(separator.join(current))
+                # Drop splits from the front until the overlap fits, and the next split fits
+                while current and (
+                    current_length > self.chunk_overlap
+                    or current_length + separator_length + split_length > self.chunk_size
+                ):
+                    current_length -= len(current[0]) + (separator_length if len(current) > 1 else 0)
+                    current.pop(0)
+            if current:
+                current_length += separator_length
+            current.append(split)
+            current_length += split_length
+        if current:
+            chunks.append(separator.join(current))
+        return chunks
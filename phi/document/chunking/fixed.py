@@ -0,0 +1,45 @@
+from typing import List
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+
+
+class FixedSizeChunking(ChunkingStrategy):
+    """Split the cleaned text into chunks of at most `chunk_size` characters, breaking at spaces.
+
+    With no overlap this produces exactly the same chunks as the original `Reader.chunk_document`.
+    """
+
+    def split_text(self, text: str) -> List[str]:
+        cleaned_text = self.clean_text(text)
+        content_length = len(cleaned_text)
+        chunk_size = self.chunk_size
+        chunks: List[str] = []
+
+        start = 0
+        while start < content_length:
+            end = start + chunk_size
+            if end < content_length:
+                # Ensure we're not splitting a word in half: break at the last space in (start, end]
+                boundary = cleaned_text.rfind(" ", start + 1, end + 1)
+                # If the entire chunk is a word, then just split it at chunk_size
+                if boundary != -1:
+                    end = boundary
+            else:
+                end = content_length
+
+            chunks.append(cleaned_text[start:end])
+            if end >= content_length:
+                break
+
+            next_start = end
+            if self.chunk_overlap > 0:
+                # Start the next chunk at a word boundary within the overlap window
+                overlap_start = max(end - self.chunk_overlap, start + 1)
+                boundary = cleaned_text.find(" ", overlap_start, end)
+                next_start = boundary if boundary != -1 else end
+            start = next_start
+        return chunks
+
+    def chunk(self, document: Document) -> List[Document]:
+        return self.build_chunks(document, self.split_text(document.content))
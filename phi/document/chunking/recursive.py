@@ -0,0 +1,53 @@
+from typing import List
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+
+
+class RecursiveChunking(ChunkingStrategy):
+    """Split text on the first separator that produces pieces smaller than `chunk_size`,
+    recursing into larger pieces with the next separator, then merge pieces into chunks.
+
+    This keeps paragraphs, lines and sentences together whenever they fit in a chunk.
+    """
+
+    separators: List[str] = ["\n\n", "\n", ". ", " ", ""]
+
+    def _split(self, text: str, separators: List[str]) -> List[str]:
+        if len(text) <= self.chunk_size:
+            return [text] if text.strip() else []
+
+        separator = separators[-1]
+        remaining_separators: List[str] = []
+        for i, _separator in enumerate(separators):
+            if _separator == "" or _separator in text:
+                separator = _separator
+                remaining_separators = separators[i + 1 :]
+                break
+
+        if separator == "":
+            # No separator left: split at exactly chunk_size characters
+            return [text[i : i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+
+        chunks: List[str] = []
+        small_splits: List[str] = []
+        splits = text.split(separator)
+        # Keep the separator at the end of each split so merged chunks read like the original text
+        for split in [split + separator for split in splits[:-1]] + splits[-1:]:
+            if len(split) <= self.chunk_size:
+                if split.strip():
+                    small_splits.append(split)
+                continue
+            if small_splits:
+                chunks.extend(self.merge_splits(small_splits, ""))
+                small_splits = []
+            chunks.extend(self._split(split, remaining_separators))
+        if small_splits:
+            chunks.extend(self.merge_splits(small_splits, ""))
+        return chunks
+
+    def split_text(self, text: str) -> List[str]:
+        return [chunk.strip() for chunk in self._split(self.normalize_text(text), self.separators) if chunk.strip()]
+
+    def chunk(self, document: Document) -> List[Document]:
+        return self.build_chunks(document, self.split_text(document.content))
@@ -0,0 +1,39 @@
+import re
+from typing import List
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+
+# Sentence boundary: whitespace following a sentence terminator, optionally followed by a closing quote or bracket
+_SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+
+
+class SentenceChunking(ChunkingStrategy):
+    """Split the cleaned text into sentences and group consecutive sentences into chunks of at most `chunk_size`.
+    Sentences longer than `chunk_size` are split at word boundaries.
+    """
+
+    def split_sentences(self, text: str) -> List[str]:
+        return [sentence for sentence in _SENTENCE_BOUNDARY_PATTERN.split(self.clean_text(text)) if sentence]
+
+    def split_text(self, text: str) -> List[str]:
+        sentences: List[str] = []
+        for sentence in self.split_sentences(text):
+            if len(sentence) <= self.chunk_size:
+                sentences.append(sentence)
+                continue
+            # Split long sentences at word boundaries
+            sentences.extend(self.merge_splits(self._split_long(sentence), " "))
+        return self.merge_splits(sentences, " ")
+
+    def _split_long(self, sentence: str) -> List[str]:
+        words: List[str] = []
+        for word in sentence.split(" "):
+            if len(word) <= self.chunk_size:
+                words.append(word)
+            else:
+                words.extend(word[i : i + self.chunk_size] for i in range(0, len(word), self.chunk_size))
+        return words
+
+    def chunk(self, document: Document) -> List[Document]:
+        return self.build_chunks(document, self.split_text(document.content))
@@ -0,0 +1,39 @@
+from typing import Any, List, Optional
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+
+
+class TokenChunking(ChunkingStrategy):
+    """Split the cleaned text into chunks of at most `chunk_size` tokens using a local tiktoken tokenizer.
+    `chunk_overlap` is also measured in tokens.
+    """
+
+    chunk_size: int = 500
+    encoding_name: str = "cl100k_base"
+
+    _encoding: Optional[Any] = None
+
+    @property
+    def encoding(self) -> Any:
+        if self._encoding is None:
+            try:
+                import tiktoken
+            except ImportError:
+                raise ImportError("`tiktoken` not installed. Please install using `pip install tiktoken`")
+            self._encoding = tiktoken.get_encoding(self.encoding_name)
+        return self._encoding
+
+    def split_text(self, text: str) -> List[str]:
+        # Encode the whole text once and decode fixed windows of tokens
+        tokens = self.encoding.encode(self.clean_text(text))
+        step = max(self.chunk_size - self.chunk_overlap, 1)
+        chunks: List[str] = []
+        for start in range(0, len(tokens), step):
+            chunks.append(self.encoding.decode(tokens[start : start + self.chunk_size]))
+            if start + self.chunk_size >= len(tokens):
+                break
+        return chunks
+
+    def chunk(self, document: Document) -> List[Document]:
+        return self.build_chunks(document, self.split_text(document.content))
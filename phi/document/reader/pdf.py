@@ -1,15 +1,124 @@
+from io import BytesIO
 from pathlib import Path
-from typing import List, Union, IO, Any
+from typing import List, Union, IO, Any, Deque, Iterator, Optional
 
 from phi.document.base import Document
 from phi.document.reader.base import Reader
 from phi.utils.log import logger
 
 
+# OCR engine and PDF reader used by the current (worker) process.
+# RapidOCR is expensive to create, so it is initialized once per process and reused across reads.
+_ocr_engine: Optional[Any] = None
+_worker_doc_reader: Optional[Any] = None
+
+
+def _get_ocr_engine() -> Any:
+    global _ocr_engine
+    if _ocr_engine is None:
+        import rapidocr_onnxruntime as rapidocr
+
+        _ocr_engine = rapidocr.RapidOCR()
+    return _ocr_engine
+
+
+def _extract_page_content(page: Any) -> str:
+    """Returns the text of a PDF page followed by the text extracted from its images using OCR"""
+    ocr = _get_ocr_engine()
+    page_text = page.extract_text() or ""
+    images_text_list: List = []
+
+    for image_object in page.images:
+        image_data = image_object.data
+
+        # Perform OCR on the image
+        ocr_result, elapse = ocr(image_data)
+
+        # Extract text from OCR result
+        if ocr_result:
+            images_text_list += [item[1] for item in ocr_result]
+
+    images_text: str = "\n".join(images_text_list)
+    return page_text + "\n" + images_text
+
+
+def _init_ocr_worker(pdf_bytes: bytes) -> None:
+    """Process pool initializer: open the PDF and create the OCR engine once per worker"""
+    from pypdf import PdfReader as DocumentReader
+
+    global _worker_doc_reader
+    _worker_doc_reader = DocumentReader(BytesIO(pdf_bytes))
+    _get_ocr_engine()
+
+
+def _extract_worker_page_content(page_index: int) -> str:
+    if _worker_doc_reader is None:
+        raise RuntimeError("OCR worker not initialized")
+    return _extract_page_content(_worker_doc_reader.pages[page_index])
+
+
+def _iter_image_pdf_pages(
+    pdf: Union[str, Path, IO[Any]], doc_name: str, num_workers: Optional[int]
+) -> Iterator[Document]:
+    """Yield one document per page, in page order, with text extracted from the page and its images.
+
+    If `num_workers` is greater than 1, pages are processed on a pool of worker processes.
+    """
+    from pypdf import PdfReader as DocumentReader
+
+    if num_workers is None or num_workers <= 1:
+        doc_reader = DocumentReader(pdf)
+        for page_number, page in enumerate(doc_reader.pages, start=1):
+            yield Document(
+                name=doc_name,
+                id=f"{doc_name}_{page_number}",
+                meta_data={"page": page_number},
+                content=_extract_page_content(page),
+            )
+        return
+
+    from collections import deque
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    if isinstance(pdf, (str, Path)):
+        pdf_bytes = Path(pdf).read_bytes()
+    else:
+        pdf_bytes = pdf.read()
+    num_pages = len(DocumentReader(BytesIO(pdf_bytes)).pages)
+
+    logger.debug(f"Processing {num_pages} pages with {num_workers} workers")
+    # Keep at most 2 pages per worker in flight, so pages are yielded as they are processed
+    # and the OCR results of a large PDF are never all held in memory
+    max_pending = 2 * num_workers
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_ocr_worker, initargs=(pdf_bytes,)) as executor:
+        pending: Deque[Future] = deque()
+        next_page = 0
+        try:
+            for page_number in range(1, num_pages + 1):
+                while next_page < num_pages and len(pending) < max_pending:
+                    pending.append(executor.submit(_extract_worker_page_content, next_page))
+                    next_page += 1
+                # Results are yielded in page order
+                content = pending.popleft().result()
+                yield Document(
+                    name=doc_name,
+                    id=f"{doc_name}_{page_number}",
+                    meta_data={"page": page_number},
+                    content=content,
+                )
+        finally:
+            for future in pending:
+                future.cancel()
+
+
 class PDFReader(Reader):
     """Reader for PDF files"""
 
     def read(self, pdf: Union[str, Path, IO[Any]]) -> List[Document]:
+        return list(self.iter_read(pdf=pdf))
+
+    def iter_read(self, pdf: Union[str, Path, IO[Any]]) -> Iterator[Document]:
+        """Yield the pages (or chunks of pages) of a PDF one at a time"""
         if not pdf:
             raise ValueError("No pdf provided")
 
@@ -30,7 +139,7 @@ class PDFReader(Reader):
         logger.info(f"Reading: {doc_name}")
         doc_reader = DocumentReader(pdf)
 
-        documents = [
+        documents = (
             Document(
                 name=doc_name,
                 id=f"{doc_name}_{page_number}",
@@ -38,24 +147,21 @@ class PDFReader(Reader):
                 content=page.extract_text(),
             )
             for page_number, page in enumerate(doc_reader.pages, start=1)
-        ]
-        if self.chunk:
-            chunked_documents = []
-            for document in documents:
-                chunked_documents.extend(self.chunk_document(document))
-            return chunked_documents
-        return documents
+        )
+        yield from self.iter_chunks(documents)
 
 
 class PDFUrlReader(Reader):
     """Reader for PDF files from URL"""
 
     def read(self, url: str) -> List[Document]:
+        return list(self.iter_read(url=url))
+
+    def iter_read(self, url: str) -> Iterator[Document]:
+        """Yield the pages (or chunks of pages) of a PDF url one at a time"""
         if not url:
             raise ValueError("No url provided")
 
-        from io import BytesIO
-
         try:
             import httpx
         except ImportError:
@@ -72,7 +178,7 @@ class PDFUrlReader(Reader):
         doc_name = url.split("/")[-1].split(".")[0].replace("/", "_").replace(" ", "_")
         doc_reader = DocumentReader(BytesIO(response.content))
 
-        documents = [
+        documents = (
             Document(
                 name=doc_name,
                 id=f"{doc_name}_{page_number}",
@@ -80,24 +186,27 @@ class PDFUrlReader(Reader):
                 content=page.extract_text(),
             )
             for page_number, page in enumerate(doc_reader.pages, start=1)
-        ]
-        if self.chunk:
-            chunked_documents = []
-            for document in documents:
-                chunked_documents.extend(self.chunk_document(document))
-            return chunked_documents
-        return documents
+        )
+        yield from self.iter_chunks(documents)
 
 
 class PDFImageReader(Reader):
     """Reader for PDF files with text and images extraction"""
 
+    # Number of processes used to extract text and run OCR on pages in parallel.
+    # If None or 1, pages are processed sequentially in the current process.
+    num_workers: Optional[int] = None
+
     def read(self, pdf: Union[str, Path, IO[Any]]) -> List[Document]:
+        return list(self.iter_read(pdf=pdf))
+
+    def iter_read(self, pdf: Union[str, Path, IO[Any]]) -> Iterator[Document]:
+        """Yield the pages (or chunks of pages) of a PDF one at a time, including text extracted from images"""
         if not pdf:
             raise ValueError("No pdf provided")
 
         try:
-            import rapidocr_onnxruntime as rapidocr
+            import rapidocr_onnxruntime as rapidocr  # noqa: F401
             from pypdf import PdfReader as DocumentReader  # noqa: F401
         except ImportError:
             raise ImportError("`pypdf` or `rapidocr_onnxruntime` not installed")
@@ -112,60 +221,28 @@ class PDFImageReader(Reader):
             doc_name = "pdf"
 
         logger.info(f"Reading: {doc_name}")
-        doc_reader = DocumentReader(pdf)
-
-        # Initialize RapidOCR
-        ocr = rapidocr.RapidOCR()
-
-        documents = []
-        for page_number, page in enumerate(doc_reader.pages, start=1):
-            page_text = page.extract_text() or ""
-            images_text_list: List = []
-
-            for image_object in page.images:
-                image_data = image_object.data
-
-                # Perform OCR on the image
-                ocr_result, elapse = ocr(image_data)
-
-                # Extract text from OCR result
-                if ocr_result:
-                    images_text_list += [item[1] for item in ocr_result]
-
-            images_text: str = "\n".join(images_text_list)
-            content = page_text + "\n" + images_text
-
-            documents.append(
-                Document(
-                    name=doc_name,
-                    id=f"{doc_name}_{page_number}",
-                    meta_data={"page": page_number},
-                    content=content,
-                )
-            )
-
-        if self.chunk:
-            chunked_documents = []
-            for document in documents:
-                chunked_documents.extend(self.chunk_document(document))
-            return chunked_documents
-
-        return documents
+        yield from self.iter_chunks(_iter_image_pdf_pages(pdf=pdf, doc_name=doc_name, num_workers=self.num_workers))
 
 
 class PDFUrlImageReader(Reader):
     """Reader for PDF files from URL with text and images extraction"""
 
+    # Number of processes used to extract text and run OCR on pages in parallel.
+    # If None or 1, pages are processed sequentially in the current process.
+    num_workers: Optional[int] = None
+
     def read(self, url: str) -> List[Document]:
+        return list(self.iter_read(url=url))
+
+    def iter_read(self, url: str) -> Iterator[Document]:
+        """Yield the pages (or chunks of pages) of a PDF url one at a time, including text extracted from images"""
         if not url:
             raise ValueError("No url provided")
 
-        from io import BytesIO
-
         try:
             import httpx
-            from pypdf import PdfReader as DocumentReader
-            import rapidocr_onnxruntime as rapidocr
+            from pypdf import PdfReader as DocumentReader  # noqa: F401
+            import rapidocr_onnxruntime as rapidocr  # noqa: F401
         except ImportError:
             raise ImportError("`httpx`, `pypdf` or `rapidocr_onnxruntime` not installed")
 
@@ -174,46 +251,8 @@ class PDFUrlImageReader(Reader):
         response = httpx.get(url)
 
         doc_name = url.split("/")[-1].split(".")[0].replace(" ", "_")
-        doc_reader = DocumentReader(BytesIO(response.content))
-
-        # Initialize RapidOCR
-        ocr = rapidocr.RapidOCR()
-
-        # Process each page of the PDF
-        documents = []
-        for page_number, page in enumerate(doc_reader.pages, start=1):
-            page_text = page.extract_text() or ""
-            images_text_list = []
-
-            # Extract and process images
-            for image_object in page.images:
-                image_data = image_object.data
-
-                # Perform OCR on the image
-                ocr_result, elapse = ocr(image_data)
-
-                # Extract text from OCR result
-                if ocr_result:
-                    images_text_list += [item[1] for item in ocr_result]
-
-            images_text = "\n".join(images_text_list)
-            content = page_text + "\n" + images_text
-
-            # Append the document
-            documents.append(
-                Document(
-                    name=doc_name,
-                    id=f"{doc_name}_{page_number}",
-                    meta_data={"page": page_number},
-                    content=content,
-                )
-            )
-
-        # Optionally chunk documents
-        if self.chunk:
-            chunked_documents = []
-            for document in documents:
-                chunked_documents.extend(self.chunk_document(document))
-            return chunked_documents
 
-        return documents
+        # Process each page of the PDF and optionally chunk documents
+        yield from self.iter_chunks(
+            _iter_image_pdf_pages(pdf=BytesIO(response.content), doc_name=doc_name, num_workers=self.num_workers)
+        )
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterator, List
 
 from phi.document.base import Document
 from phi.document.reader.base import Reader
@@ -10,6 +10,10 @@ class S3PDFReader(Reader):
     """Reader for PDF files on S3"""
 
     def read(self, s3_object: S3Object) -> List[Document]:
+        return list(self.iter_read(s3_object=s3_object))
+
+    def iter_read(self, s3_object: S3Object) -> Iterator[Document]:
+        """Yield the pages (or chunks of pages) of a PDF on S3 one at a time"""
         from io import BytesIO
 
         if not s3_object:
@@ -20,27 +24,19 @@ class S3PDFReader(Reader):
         except ImportError:
             raise ImportError("`pypdf` not installed")
 
-        try:
-            logger.info(f"Reading: {s3_object.uri}")
-
-            object_resource = s3_object.get_resource()
-            object_body = object_resource.get()["Body"]
-            doc_name = s3_object.name.split("/")[-1].split(".")[0].replace("/", "_").replace(" ", "_")
-            doc_reader = DocumentReader(BytesIO(object_body.read()))
-            documents = [
-                Document(
-                    name=doc_name,
-                    id=f"{doc_name}_{page_number}",
-                    meta_data={"page": page_number},
-                    content=page.extract_text(),
-                )
-                for page_number, page in enumerate(doc_reader.pages, start=1)
-            ]
-            if self.chunk:
-                chunked_documents = []
-                for document in documents:
-                    chunked_documents.extend(self.chunk_document(document))
-                return chunked_documents
-            return documents
-        except Exception:
-            raise
+        logger.info(f"Reading: {s3_object.uri}")
+
+        object_resource = s3_object.get_resource()
+        object_body = object_resource.get()["Body"]
+        doc_name = s3_object.name.split("/")[-1].split(".")[0].replace("/", "_").replace(" ", "_")
+        doc_reader = DocumentReader(BytesIO(object_body.read()))
+        documents = (
+            Document(
+                name=doc_name,
+                id=f"{doc_name}_{page_number}",
+                meta_data={"page": page_number},
+                content=page.extract_text(),
+            )
+            for page_number, page in enumerate(doc_reader.pages, start=1)
+        )
+        yield from self.iter_chunks(documents)
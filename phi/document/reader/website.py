@@ -1,11 +1,17 @@
+import asyncio
 import time
-import random
-from typing import Set, Dict, List, Tuple
-from urllib.parse import urljoin, urlparse
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse, urldefrag
+from urllib.robotparser import RobotFileParser
+from xml.etree import ElementTree
+
+from pydantic import BaseModel
 
 from phi.document.base import Document
 from phi.document.reader.base import Reader
 from phi.utils.log import logger
+from phi.utils.run_async import iter_async_sync, run_coroutine_sync, run_in_thread
 
 import httpx
 
@@ -15,24 +21,42 @@ except ImportError:
     raise ImportError("The `bs4` package is not installed. Please install it via `pip install beautifulsoup4`.")
 
 
+class CrawledPage(BaseModel):
+    """A page crawled by the WebsiteReader and its HTTP validators"""
+
+    url: str
+    # Main content of the page. None if the page was not modified since the validators were returned.
+    content: Optional[str] = None
+    # Links on the page to crawl
+    links: List[str] = []
+    # HTTP validators used for conditional requests when the page is crawled again
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
 class WebsiteReader(Reader):
     """Reader for Websites"""
 
     max_depth: int = 3
     max_links: int = 10
 
-    _visited: Set[str] = set()
-    _urls_to_crawl: List[Tuple[str, int]] = []
-
-    def delay(self, min_seconds=1, max_seconds=3):
-        """
-        Introduce a random delay.
+    # Maximum number of requests in flight, and per host
+    max_concurrency: int = 10
+    max_concurrency_per_host: int = 2
+    # Maximum number of requests per second to each host. If None, requests are not rate limited.
+    # A Crawl-delay in robots.txt lowers this rate.
+    requests_per_second: Optional[float] = 2.0
+    # Skip urls disallowed by robots.txt
+    respect_robots_txt: bool = True
+    # Add the urls in the website sitemap to the crawl
+    use_sitemap: bool = False
+    timeout: float = 10
+    user_agent: str = "phidata"
+    # Maximum number of pages kept in memory for conditional requests when the website is crawled again
+    max_cached_pages: int = 100
 
-        :param min_seconds: Minimum number of seconds to delay. Default is 1.
-        :param max_seconds: Maximum number of seconds to delay. Default is 3.
-        """
-        sleep_time = random.uniform(min_seconds, max_seconds)
-        time.sleep(sleep_time)
+    # Pages crawled before with an ETag or Last-Modified header, least recently used first
+    _page_cache: "OrderedDict[str, CrawledPage]" = OrderedDict()
 
     def _get_primary_domain(self, url: str) -> str:
         """
@@ -65,17 +89,258 @@ class WebsiteReader(Reader):
 
         return ""
 
-    def crawl(self, url: str, starting_depth: int = 1) -> Dict[str, str]:
+    def _parse_page(self, url: str, html: bytes, primary_domain: str) -> Tuple[str, List[str]]:
+        """Returns the main content of the page and the links to crawl"""
+        soup = BeautifulSoup(html, "html.parser")
+        links: List[str] = []
+        for link in soup.find_all("a", href=True):
+            full_url = urldefrag(urljoin(url, str(link["href"])))[0]
+            parsed_url = urlparse(full_url)
+            if parsed_url.netloc.endswith(primary_domain) and not any(
+                parsed_url.path.endswith(ext) for ext in [".pdf", ".jpg", ".png"]
+            ):
+                links.append(full_url)
+        return self._extract_main_content(soup), links
+
+    async def _get_robots(self, client: httpx.AsyncClient, url: str) -> Optional[RobotFileParser]:
+        robots_url = urljoin(url, "/robots.txt")
+        try:
+            response = await client.get(robots_url)
+        except Exception as e:
+            logger.debug(f"Failed to read {robots_url}: {e}")
+            return None
+        if response.status_code != 200:
+            return None
+        robots = RobotFileParser(robots_url)
+        robots.parse(response.text.splitlines())
+        return robots
+
+    async def _get_sitemap_urls(
+        self, client: httpx.AsyncClient, url: str, robots: Optional[RobotFileParser], primary_domain: str
+    ) -> List[str]:
+        """Returns the page urls in the sitemaps listed in robots.txt, or in /sitemap.xml"""
+        sitemaps: Deque[str] = deque()
+        if robots is not None and getattr(robots, "site_maps", None) is not None:
+            sitemaps.extend(robots.site_maps() or [])
+        if len(sitemaps) == 0:
+            sitemaps.append(urljoin(url, "/sitemap.xml"))
+
+        urls: List[str] = []
+        # Sitemap indexes list other sitemaps, limit the number of sitemaps read
+        num_sitemaps = 0
+        while sitemaps and num_sitemaps < 20 and len(urls) < self.max_links * 10:
+            sitemap_url = sitemaps.popleft()
+            num_sitemaps += 1
+            try:
+                response = await client.get(sitemap_url)
+                if response.status_code != 200:
+                    continue
+                root = ElementTree.fromstring(response.content)
+            except Exception as e:
+                logger.debug(f"Failed to read sitemap {sitemap_url}: {e}")
+                continue
+            is_index = root.tag.endswith("sitemapindex")
+            for element in root.iter():
+                if element.tag.endswith("loc") and element.text:
+                    loc = element.text.strip()
+                    if is_index:
+                        sitemaps.append(loc)
+                    elif urlparse(loc).netloc.endswith(primary_domain):
+                        urls.append(loc)
+        return urls
+
+    async def acrawl(self, url: str, starting_depth: int = 1) -> AsyncIterator[Tuple[str, str]]:
         """
-        Crawls a website and returns a dictionary of URLs and their corresponding content.
+        Crawls a website concurrently and yields each URL and its main content as soon as the page is fetched.
+        See `acrawl_pages` for details.
+
+        Parameters:
+        - url (str): The starting URL to begin the crawl.
+        - starting_depth (int, optional): The starting depth level for the crawl. Defaults to 1.
+
+        Yields:
+        - Tuple[str, str]: The URL and the main content extracted from that URL.
+        """
+        async for page in self.acrawl_pages(url=url, starting_depth=starting_depth):
+            if page.content is not None:
+                yield page.url, page.content
+
+    async def acrawl_pages(
+        self, url: str, starting_depth: int = 1, known_pages: Optional[Dict[str, CrawledPage]] = None
+    ) -> AsyncIterator[CrawledPage]:
+        """
+        Crawls a website concurrently and yields each page as soon as it is fetched.
+
+        Pages are fetched breadth first with at most `max_concurrency` requests in flight,
+        `max_concurrency_per_host` requests per host and `requests_per_second` requests per second per host.
+        Connections are reused across requests. Pages crawled before are requested with
+        If-None-Match/If-Modified-Since headers:
+            - Pages in the reader's cache of the last `max_cached_pages` pages are returned from the cache
+              if they have not changed.
+            - Pages in `known_pages`, e.g. validators stored by a previous process, are returned without content
+              if they have not changed, and the crawl continues from their known links.
 
         Parameters:
         - url (str): The starting URL to begin the crawl.
         - starting_depth (int, optional): The starting depth level for the crawl. Defaults to 1.
+        - known_pages (Dict[str, CrawledPage], optional): Validators and links of pages crawled before, by url.
+
+        Yields:
+        - CrawledPage: The URL, main content, links and validators of each page.
+        """
+        primary_domain = self._get_primary_domain(url)
+        headers = {"User-Agent": self.user_agent}
+        limits = httpx.Limits(max_connections=self.max_concurrency)
+        async with httpx.AsyncClient(
+            timeout=self.timeout, headers=headers, limits=limits, follow_redirects=True
+        ) as client:
+            robots = await self._get_robots(client, url) if self.respect_robots_txt else None
+            min_interval = 1 / self.requests_per_second if self.requests_per_second else 0.0
+            if robots is not None:
+                crawl_delay = robots.crawl_delay(self.user_agent)
+                if crawl_delay:
+                    min_interval = max(min_interval, float(crawl_delay))
+
+            # Frontier of urls to crawl with their depth, and every url added to it
+            frontier: Deque[Tuple[str, int]] = deque([(url, starting_depth)])
+            seen: Set[str] = {url}
+            if self.use_sitemap:
+                for sitemap_url in await self._get_sitemap_urls(client, url, robots, primary_domain):
+                    if sitemap_url not in seen:
+                        seen.add(sitemap_url)
+                        frontier.append((sitemap_url, starting_depth))
+
+            host_semaphores: Dict[str, asyncio.Semaphore] = {}
+            # Time of the next request allowed to each host
+            next_request_at: Dict[str, float] = {}
+
+            async def fetch(page_url: str, depth: int) -> Tuple[int, CrawledPage]:
+                host = urlparse(page_url).netloc
+                semaphore = host_semaphores.setdefault(host, asyncio.Semaphore(self.max_concurrency_per_host))
+                async with semaphore:
+                    # Reserve the next request slot for this host
+                    now = time.monotonic()
+                    request_at = max(now, next_request_at.get(host, now))
+                    next_request_at[host] = request_at + min_interval
+                    if request_at > now:
+                        await asyncio.sleep(request_at - now)
+
+                    request_headers: Dict[str, str] = {}
+                    known = self._page_cache.get(page_url)
+                    if known is None and known_pages is not None:
+                        known = known_pages.get(page_url)
+                    if known is not None:
+                        if known.etag:
+                            request_headers["If-None-Match"] = known.etag
+                        if known.last_modified:
+                            request_headers["If-Modified-Since"] = known.last_modified
+                    logger.debug(f"Crawling: {page_url}")
+                    response = await client.get(page_url, headers=request_headers)
+
+                if response.status_code == 304 and known is not None:
+                    if page_url in self._page_cache:
+                        self._page_cache.move_to_end(page_url)
+                    return depth, known
+                response.raise_for_status()
+                content, links = await run_in_thread(self._parse_page, page_url, response.content, primary_domain)
+                page = CrawledPage(
+                    url=page_url,
+                    content=content,
+                    links=links,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+                self._cache_page(page)
+                return depth, page
+
+            num_links = 0
+            tasks: Set["asyncio.Task[Any]"] = set()
+            try:
+                while (frontier or tasks) and num_links < self.max_links:
+                    while frontier and len(tasks) < self.max_concurrency:
+                        current_url, current_depth = frontier.popleft()
+                        if current_depth > self.max_depth or not urlparse(current_url).netloc.endswith(primary_domain):
+                            continue
+                        if robots is not None and not robots.can_fetch(self.user_agent, current_url):
+                            logger.debug(f"Disallowed by robots.txt: {current_url}")
+                            continue
+                        tasks.add(asyncio.ensure_future(fetch(current_url, current_depth)))
+                    if not tasks:
+                        break
+
+                    done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        try:
+                            depth, page = task.result()
+                        except Exception as e:
+                            logger.debug(f"Failed to crawl: {e}")
+                            continue
+                        # Add found URLs to the frontier, with incremented depth
+                        if depth < self.max_depth:
+                            for link in page.links:
+                                if link not in seen:
+                                    seen.add(link)
+                                    frontier.append((link, depth + 1))
+                        # Skip pages without main content
+                        if page.content == "":
+                            continue
+                        if num_links < self.max_links:
+                            num_links += 1
+                            yield page
+            finally:
+                for task in tasks:
+                    task.cancel()
 
-        Returns:
-        - Dict[str, str]: A dictionary where each key is a URL and the corresponding value is the main
-                          content extracted from that URL.
+    def _cache_page(self, page: CrawledPage) -> None:
+        """Keep the page for conditional requests, evicting the least recently used pages"""
+        if self.max_cached_pages <= 0 or not (page.etag or page.last_modified):
+            return
+        self._page_cache[page.url] = page
+        self._page_cache.move_to_end(page.url)
+        while len(self._page_cache) > self.max_cached_pages:
+            self._page_cache.popitem(last=False)
+
+    async def aget_gone_urls(self, urls: List[str]) -> Set[str]:
+        """
+        Returns the urls that respond with 404 Not Found or 410 Gone.
+        Urls that could not be checked, e.g. because of a timeout or a server error, are not returned.
+
+        :param urls: The urls to check.
+        :return: The urls that no longer exist.
+        """
+        gone: Set[str] = set()
+        if len(urls) == 0:
+            return gone
+        min_interval = 1 / self.requests_per_second if self.requests_per_second else 0.0
+        headers = {"User-Agent": self.user_agent}
+        async with httpx.AsyncClient(timeout=self.timeout, headers=headers, follow_redirects=True) as client:
+            for i, page_url in enumerate(urls):
+                if i > 0 and min_interval > 0:
+                    await asyncio.sleep(min_interval)
+                try:
+                    response = await client.head(page_url)
+                except Exception as e:
+                    logger.debug(f"Failed to check {page_url}: {e}")
+                    continue
+                if response.status_code in (404, 410):
+                    gone.add(page_url)
+        return gone
+
+    def get_gone_urls(self, urls: List[str]) -> Set[str]:
+        """Sync version of `aget_gone_urls`"""
+        return run_coroutine_sync(self.aget_gone_urls(urls))
+
+    def crawl(self, url: str, starting_depth: int = 1) -> Dict[str, str]:
+        """
+        Crawls a website and returns a dictionary of URLs and their corresponding content.
+        See `acrawl` for details.
+        """
+        return dict(self.iter_crawl(url=url, starting_depth=starting_depth))
+
+    def iter_crawl(self, url: str, starting_depth: int = 1) -> Iterator[Tuple[str, str]]:
+        """
+        Crawls a website and yields each URL and its main content as soon as the page is fetched.
+        Runs `acrawl` on an event loop in another thread, see `acrawl` for details.
 
         Note:
         The function focuses on extracting the main content by prioritizing content inside common HTML tags
@@ -83,88 +348,67 @@ class WebsiteReader(Reader):
         The crawler will also respect the `max_depth` attribute of the WebCrawler class, ensuring it does not
         crawl deeper than the specified depth.
         """
-        num_links = 0
-        crawler_result: Dict[str, str] = {}
-        primary_domain = self._get_primary_domain(url)
-        # Add starting URL with its depth to the global list
-        self._urls_to_crawl.append((url, starting_depth))
-        while self._urls_to_crawl:
-            # Unpack URL and depth from the global list
-            current_url, current_depth = self._urls_to_crawl.pop(0)
-
-            # Skip if
-            # - URL is already visited
-            # - does not end with the primary domain,
-            # - exceeds max depth
-            # - exceeds max links
-            if (
-                current_url in self._visited
-                or not urlparse(current_url).netloc.endswith(primary_domain)
-                or current_depth > self.max_depth
-                or num_links >= self.max_links
-            ):
-                continue
+        yield from iter_async_sync(lambda: self.acrawl(url=url, starting_depth=starting_depth))
 
-            self._visited.add(current_url)
-            self.delay()
+    def iter_crawl_pages(
+        self, url: str, starting_depth: int = 1, known_pages: Optional[Dict[str, CrawledPage]] = None
+    ) -> Iterator[CrawledPage]:
+        """
+        Crawls a website and yields each page as soon as it is fetched.
+        Runs `acrawl_pages` on an event loop in another thread, see `acrawl_pages` for details.
+        """
+        yield from iter_async_sync(
+            lambda: self.acrawl_pages(url=url, starting_depth=starting_depth, known_pages=known_pages)
+        )
 
-            try:
-                logger.debug(f"Crawling: {current_url}")
-                response = httpx.get(current_url, timeout=10)
-                soup = BeautifulSoup(response.content, "html.parser")
-
-                # Extract main content
-                main_content = self._extract_main_content(soup)
-                if main_content:
-                    crawler_result[current_url] = main_content
-                    num_links += 1
-
-                # Add found URLs to the global list, with incremented depth
-                for link in soup.find_all("a", href=True):
-                    full_url = urljoin(current_url, link["href"])
-                    parsed_url = urlparse(full_url)
-                    if parsed_url.netloc.endswith(primary_domain) and not any(
-                        parsed_url.path.endswith(ext) for ext in [".pdf", ".jpg", ".png"]
-                    ):
-                        if full_url not in self._visited and (full_url, current_depth + 1) not in self._urls_to_crawl:
-                            self._urls_to_crawl.append((full_url, current_depth + 1))
+    def read(self, url: str) -> List[Document]:
+        """
+        Reads a website and returns a list of documents.
 
-            except Exception as e:
-                logger.debug(f"Failed to crawl: {current_url}: {e}")
-                pass
+        :param url: The URL of the website to read.
+        :return: A list of documents.
+        """
+        return list(self.iter_read(url=url))
+
+    def iter_read(self, url: str) -> Iterator[Document]:
+        """
+        Reads a website and yields documents as pages are crawled.
 
-        return crawler_result
+        Each crawled page is chunked (if enabled) and yielded as soon as it is fetched,
+        so the full website is never held in memory.
 
-    def read(self, url: str) -> List[Document]:
+        :param url: The URL of the website to read.
+        :return: An iterator of documents.
         """
-        Reads a website and returns a list of documents.
 
-        This function first converts the website into a dictionary of URLs and their corresponding content.
-        Then iterates through the dictionary and returns chunks of content.
+        logger.debug(f"Reading: {url}")
+        yield from self.iter_chunks(self.iter_pages(url))
+
+    def iter_pages(self, url: str) -> Iterator[Document]:
+        """
+        Crawls a website and yields one document per page, without chunking.
 
         :param url: The URL of the website to read.
-        :return: A list of documents.
+        :return: An iterator of documents.
         """
+        for crawled_url, crawled_content in self.iter_crawl(url):
+            yield Document(
+                name=url,
+                id=str(crawled_url),
+                meta_data={"url": str(crawled_url)},
+                content=crawled_content,
+            )
+
+    async def aiter_read(self, url: str) -> AsyncIterator[Document]:
+        """Async version of `iter_read`"""
 
         logger.debug(f"Reading: {url}")
-        crawler_result = self.crawl(url)
-        documents = []
-        for crawled_url, crawled_content in crawler_result.items():
-            if self.chunk:
-                documents.extend(
-                    self.chunk_document(
-                        Document(
-                            name=url, id=str(crawled_url), meta_data={"url": str(crawled_url)}, content=crawled_content
-                        )
-                    )
-                )
-            else:
-                documents.append(
-                    Document(
-                        name=url,
-                        id=str(crawled_url),
-                        meta_data={"url": str(crawled_url)},
-                        content=crawled_content,
-                    )
-                )
-        return documents
+        async for crawled_url, crawled_content in self.acrawl(url):
+            document = Document(
+                name=url,
+                id=str(crawled_url),
+                meta_data={"url": str(crawled_url)},
+                content=crawled_content,
+            )
+            for chunk in self.iter_chunks([document]):
+                yield chunk
@@ -1,9 +1,10 @@
 from os import getenv
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Union
 from typing_extensions import Literal
 
 from phi.embedder.base import Embedder
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client
 
 try:
     from openai import AzureOpenAI as AzureOpenAIClient
@@ -27,6 +28,9 @@ class AzureOpenAIEmbedder(Embedder):
     organization: Optional[str] = None
     request_params: Optional[Dict[str, Any]] = None
     client_params: Optional[Dict[str, Any]] = None
+    # Azure OpenAI accepts up to 2048 inputs per request
+    batch_size: int = 2048
+    max_batch_tokens: Optional[int] = 300000
     openai_client: Optional[AzureOpenAIClient] = None
 
     @property
@@ -51,9 +55,9 @@ class AzureOpenAIEmbedder(Embedder):
             _client_params["azure_ad_token"] = self.azure_ad_token
         if self.azure_ad_token_provider:
             _client_params["azure_ad_token_provider"] = self.azure_ad_token_provider
-        return AzureOpenAIClient(**_client_params)
+        return get_cached_client(AzureOpenAIClient, _client_params, http_client_param="http_client")
 
-    def _response(self, text: str) -> CreateEmbeddingResponse:
+    def _response(self, text: Union[str, List[str]]) -> CreateEmbeddingResponse:
         _request_params: Dict[str, Any] = {
             "input": text,
             "model": self.model,
@@ -81,3 +85,17 @@ class AzureOpenAIEmbedder(Embedder):
         embedding = response.data[0].embedding
         usage = response.usage
         return embedding, usage.model_dump()
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        embeddings, _ = self.get_embeddings_and_usage(texts)
+        return embeddings
+
+    def get_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        embeddings: List[List[float]] = []
+        usage: List[Optional[Dict]] = []
+        for batch in self.get_batches(texts):
+            response: CreateEmbeddingResponse = self._response(text=batch)
+            embeddings.extend([data.embedding for data in sorted(response.data, key=lambda d: d.index)])
+            usage.append(response.usage.model_dump())
+            usage.extend([None] * (len(batch) - 1))
+        return embeddings, usage
@@ -2,11 +2,22 @@ from typing import Optional, Dict, List, Tuple
 
 from pydantic import BaseModel, ConfigDict
 
+from phi.embedder.cache.base import EmbeddingCache
+from phi.utils.run_async import run_in_thread
+
 
 class Embedder(BaseModel):
     """Base class for managing embedders"""
 
     dimensions: int = 1536
+    # -*- Batching parameters
+    # Maximum number of texts to embed in a single request
+    batch_size: int = 100
+    # Maximum number of (estimated) tokens to embed in a single request
+    max_batch_tokens: Optional[int] = None
+    # -*- Cache for embeddings keyed by (model, dimensions, content hash)
+    # The same cache can be shared across embedders, knowledge bases and vector dbs.
+    cache: Optional[EmbeddingCache] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -15,3 +26,176 @@ class Embedder(BaseModel):
 
     def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
         raise NotImplementedError
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Returns the embeddings for a list of texts, in the same order as the texts.
+
+        Embedders that support multiple inputs per request override this method,
+        the default implementation embeds one text at a time.
+        """
+        return [self.get_embedding(text) for text in texts]
+
+    def get_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Returns the embeddings and usage for a list of texts, in the same order as the texts.
+
+        When multiple texts are embedded in one request, the usage for that request
+        is attributed to the first text of the batch and the remaining texts get None.
+        """
+        embeddings: List[List[float]] = []
+        usage: List[Optional[Dict]] = []
+        for text in texts:
+            _embedding, _usage = self.get_embedding_and_usage(text)
+            embeddings.append(_embedding)
+            usage.append(_usage)
+        return embeddings, usage
+
+    async def aget_embedding(self, text: str) -> List[float]:
+        """Async version of `get_embedding`.
+
+        Embedders with an async client override this method,
+        the default implementation runs `get_embedding` in a thread so it does not block the event loop.
+        """
+        return await run_in_thread(self.get_embedding, text)
+
+    async def aget_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        """Async version of `get_embedding_and_usage`"""
+        return await run_in_thread(self.get_embedding_and_usage, text)
+
+    async def aget_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Async version of `get_embeddings_and_usage`"""
+        return await run_in_thread(self.get_embeddings_and_usage, texts)
+
+    def get_cache_key(self, text: str) -> str:
+        model: str = getattr(self, "model", None) or self.__class__.__name__
+        return EmbeddingCache.get_key(model=model, dimensions=self.dimensions, text=text)
+
+    def get_cached_embedding(self, text: str) -> List[float]:
+        """Returns the embedding for a text, using the cache if one is configured"""
+        embedding, _ = self.get_cached_embedding_and_usage(text)
+        return embedding
+
+    def get_cached_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        """Returns the embedding and usage for a text, using the cache if one is configured.
+        Usage is None for embeddings read from the cache.
+        """
+        if self.cache is None:
+            return self.get_embedding_and_usage(text)
+
+        key = self.get_cache_key(text)
+        cached_embedding = self.cache.get(key)
+        if cached_embedding is not None:
+            return cached_embedding, None
+
+        embedding, usage = self.get_embedding_and_usage(text)
+        if embedding:
+            self.cache.set(key, embedding)
+        return embedding, usage
+
+    def get_cached_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Returns the embeddings and usage for a list of texts, only embedding texts missing from the cache"""
+        if self.cache is None:
+            return self.get_embeddings_and_usage(texts)
+
+        keys, cached_embeddings, missing = self._get_missing_from_cache(texts)
+        embeddings, usage = self.get_embeddings_and_usage(list(missing.values())) if len(missing) > 0 else ([], [])
+        return self._merge_with_cache(keys, cached_embeddings, missing, embeddings, usage)
+
+    def _get_missing_from_cache(self, texts: List[str]) -> Tuple[List[str], Dict[str, List[float]], Dict[str, str]]:
+        """Returns the cache keys for the texts, the cached embeddings and the texts missing from the cache by key"""
+        assert self.cache is not None
+        keys = [self.get_cache_key(text) for text in texts]
+        cached_embeddings = self.cache.get_many(keys)
+
+        # Embed each missing text once, even if it appears multiple times
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached_embeddings and key not in missing:
+                missing[key] = text
+        return keys, cached_embeddings, missing
+
+    def _merge_with_cache(
+        self,
+        keys: List[str],
+        cached_embeddings: Dict[str, List[float]],
+        missing: Dict[str, str],
+        embeddings: List[List[float]],
+        usage: List[Optional[Dict]],
+    ) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Stores the new embeddings in the cache and returns the embeddings and usage in the order of the keys"""
+        assert self.cache is not None
+        new_embeddings: Dict[str, List[float]] = {}
+        new_usage: Dict[str, Optional[Dict]] = {}
+        for key, _embedding, _usage in zip(missing.keys(), embeddings, usage):
+            new_embeddings[key] = _embedding
+            new_usage[key] = _usage
+        if len(new_embeddings) > 0:
+            self.cache.set_many({key: _embedding for key, _embedding in new_embeddings.items() if _embedding})
+
+        result_embeddings: List[List[float]] = []
+        result_usage: List[Optional[Dict]] = []
+        for key in keys:
+            if key in cached_embeddings:
+                result_embeddings.append(cached_embeddings[key])
+                result_usage.append(None)
+            else:
+                result_embeddings.append(new_embeddings.get(key, []))
+                # Attribute usage only once for duplicate texts
+                result_usage.append(new_usage.pop(key, None))
+        return result_embeddings, result_usage
+
+    async def aget_cached_embedding(self, text: str) -> List[float]:
+        """Async version of `get_cached_embedding`"""
+        embedding, _ = await self.aget_cached_embedding_and_usage(text)
+        return embedding
+
+    async def aget_cached_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        """Async version of `get_cached_embedding_and_usage`"""
+        if self.cache is None:
+            return await self.aget_embedding_and_usage(text)
+
+        key = self.get_cache_key(text)
+        cached_embedding = self.cache.get(key)
+        if cached_embedding is not None:
+            return cached_embedding, None
+
+        embedding, usage = await self.aget_embedding_and_usage(text)
+        if embedding:
+            self.cache.set(key, embedding)
+        return embedding, usage
+
+    async def aget_cached_embeddings_and_usage(
+        self, texts: List[str]
+    ) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        """Async version of `get_cached_embeddings_and_usage`"""
+        if self.cache is None:
+            return await self.aget_embeddings_and_usage(texts)
+
+        keys, cached_embeddings, missing = self._get_missing_from_cache(texts)
+        embeddings, usage = (
+            await self.aget_embeddings_and_usage(list(missing.values())) if len(missing) > 0 else ([], [])
+        )
+        return self._merge_with_cache(keys, cached_embeddings, missing, embeddings, usage)
+
+    def estimate_tokens(self, text: str) -> int:
+        """Cheap estimate of the number of tokens in a text, used to size batches"""
+        return len(text) // 3 + 1
+
+    def get_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into batches that respect `batch_size` and `max_batch_tokens`"""
+        batches: List[List[str]] = []
+        current_batch: List[str] = []
+        current_tokens = 0
+        for text in texts:
+            text_tokens = self.estimate_tokens(text) if self.max_batch_tokens is not None else 0
+            if current_batch and (
+                len(current_batch) >= self.batch_size
+                or (self.max_batch_tokens is not None and current_tokens + text_tokens > self.max_batch_tokens)
+            ):
+                batches.append(current_batch)
+                current_batch = []
+                current_tokens = 0
+            current_batch.append(text)
+            current_tokens += text_tokens
+        if current_batch:
+            batches.append(current_batch)
+        return batches
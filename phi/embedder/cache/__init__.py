@@ -0,0 +1,3 @@
+from phi.embedder.cache.base import EmbeddingCache
+from phi.embedder.cache.memory import InMemoryEmbeddingCache
+from phi.embedder.cache.sqlite import SqliteEmbeddingCache
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from hashlib import sha256
+from typing import Dict, List, Optional
+
+
+class EmbeddingCache(ABC):
+    """Base class for caching embeddings by (model, dimensions, content hash)"""
+
+    @staticmethod
+    def get_key(model: str, dimensions: Optional[int], text: str) -> str:
+        content_hash = sha256(text.encode("utf-8", errors="replace")).hexdigest()
+        return f"{model}:{dimensions}:{content_hash}"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[List[float]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, embedding: List[float]) -> None:
+        raise NotImplementedError
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Returns the cached embeddings for the keys that are present in the cache"""
+        result: Dict[str, List[float]] = {}
+        for key in keys:
+            embedding = self.get(key)
+            if embedding is not None:
+                result[key] = embedding
+        return result
+
+    def set_many(self, embeddings: Dict[str, List[float]]) -> None:
+        for key, embedding in embeddings.items():
+            self.set(key, embedding)
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,40 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Optional
+
+from phi.embedder.cache.base import EmbeddingCache
+
+
+class InMemoryEmbeddingCache(EmbeddingCache):
+    def __init__(self, max_size: int = 10000):
+        """
+        Thread-safe LRU cache of embeddings held in process memory.
+
+        :param max_size: Maximum number of embeddings to keep, the least recently used entries are evicted first.
+        """
+        self.max_size: int = max_size
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+            return embedding
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,101 @@
+import sqlite3
+from array import array
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Union
+
+from phi.embedder.cache.base import EmbeddingCache
+from phi.embedder.cache.memory import InMemoryEmbeddingCache
+from phi.utils.log import logger
+
+
+class SqliteEmbeddingCache(EmbeddingCache):
+    def __init__(
+        self,
+        db_file: Union[str, Path] = Path.home().joinpath(".phi", "embeddings.db"),
+        table_name: str = "embedding_cache",
+        memory_cache_size: int = 10000,
+    ):
+        """
+        Persistent embedding cache stored in a local sqlite database, with an in-memory LRU layer in front.
+
+        Embeddings are stored as packed float32 values, so the same cache file can be shared
+        between knowledge bases, vector dbs and processes.
+
+        :param db_file: The sqlite database file to store embeddings in.
+        :param table_name: The name of the table to store embeddings in.
+        :param memory_cache_size: Number of embeddings to keep in memory, 0 disables the in-memory layer.
+        """
+        self.db_file: Path = Path(db_file)
+        self.table_name: str = table_name
+        self.memory_cache: InMemoryEmbeddingCache = InMemoryEmbeddingCache(max_size=memory_cache_size)
+
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._connection = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table_name} (key TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def _to_blob(embedding: List[float]) -> bytes:
+        return array("f", embedding).tobytes()
+
+    @staticmethod
+    def _from_blob(blob: bytes) -> List[float]:
+        embedding = array("f")
+        embedding.frombytes(blob)
+        return embedding.tolist()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        result: Dict[str, List[float]] = self.memory_cache.get_many(keys)
+        missing_keys = [key for key in keys if key not in result]
+        # sqlite limits the number of bound parameters per statement
+        for start in range(0, len(missing_keys), 500):
+            batch = missing_keys[start : start + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            try:
+                with self._lock:
+                    rows = self._connection.execute(
+                        f"SELECT key, embedding FROM {self.table_name} WHERE key IN ({placeholders})", batch
+                    ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Error reading from embedding cache: {e}")
+                continue
+            for key, blob in rows:
+                embedding = self._from_blob(blob)
+                result[key] = embedding
+                self.memory_cache.set(key, embedding)
+        return result
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        self.set_many({key: embedding})
+
+    def set_many(self, embeddings: Dict[str, List[float]]) -> None:
+        if len(embeddings) == 0:
+            return
+        self.memory_cache.set_many(embeddings)
+        try:
+            with self._lock:
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO {self.table_name} (key, embedding) VALUES (?, ?)",
+                    [(key, self._to_blob(embedding)) for key, embedding in embeddings.items()],
+                )
+                self._connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Error writing to embedding cache: {e}")
+
+    def clear(self) -> None:
+        self.memory_cache.clear()
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self.table_name}")
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
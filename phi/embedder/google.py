@@ -16,6 +16,8 @@ class GeminiEmbedder(Embedder):
     task_type: str = "RETRIEVAL_QUERY"
     title: Optional[str] = None
     output_dimensionality: Optional[int] = None
+    # Gemini accepts up to 100 texts per batch request
+    batch_size: int = 100
     api_key: Optional[str] = None
     request_params: Optional[Dict[str, Any]] = None
     client_params: Optional[Dict[str, Any]] = None
@@ -34,7 +36,7 @@ class GeminiEmbedder(Embedder):
         self.gemini_client.configure(**_client_params)
         return self.gemini_client
 
-    def _response(self, text: str) -> Union[EmbeddingDict, BatchEmbeddingDict]:
+    def _response(self, text: Union[str, List[str]]) -> Union[EmbeddingDict, BatchEmbeddingDict]:
         _request_params: Dict[str, Any] = {
             "content": text,
             "model": self.model,
@@ -62,3 +64,21 @@ class GeminiEmbedder(Embedder):
         except Exception as e:
             logger.warning(e)
             return [], usage
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        embeddings, _ = self.get_embeddings_and_usage(texts)
+        return embeddings
+
+    def get_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        embeddings: List[List[float]] = []
+        for batch in self.get_batches(texts):
+            response = self._response(text=batch)
+            try:
+                batch_embeddings = response.get("embedding", [])
+            except Exception as e:
+                logger.warning(e)
+                batch_embeddings = []
+            if len(batch_embeddings) != len(batch):
+                batch_embeddings = [[] for _ in batch]
+            embeddings.extend(batch_embeddings)
+        return embeddings, [None] * len(embeddings)
@@ -1,7 +1,8 @@
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Union
 
 from phi.embedder.base import Embedder
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client
 
 try:
     from mistralai.client import MistralClient
@@ -15,6 +16,9 @@ class MistralEmbedder(Embedder):
     dimensions: int = 1024
     # -*- Request parameters
     request_params: Optional[Dict[str, Any]] = None
+    # -*- Batching parameters: mistral-embed accepts up to 16384 tokens per request
+    batch_size: int = 100
+    max_batch_tokens: Optional[int] = 16000
     # -*- Client parameters
     api_key: Optional[str] = None
     endpoint: Optional[str] = None
@@ -40,9 +44,9 @@ class MistralEmbedder(Embedder):
             _client_params["timeout"] = self.timeout
         if self.client_params:
             _client_params.update(self.client_params)
-        return MistralClient(**_client_params)
+        return get_cached_client(MistralClient, _client_params)
 
-    def _response(self, text: str) -> EmbeddingResponse:
+    def _response(self, text: Union[str, List[str]]) -> EmbeddingResponse:
         _request_params: Dict[str, Any] = {
             "input": text,
             "model": self.model,
@@ -65,3 +69,17 @@ class MistralEmbedder(Embedder):
         embedding = response.data[0].embedding
         usage = response.usage
         return embedding, usage.model_dump()
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        embeddings, _ = self.get_embeddings_and_usage(texts)
+        return embeddings
+
+    def get_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        embeddings: List[List[float]] = []
+        usage: List[Optional[Dict]] = []
+        for batch in self.get_batches(texts):
+            response: EmbeddingResponse = self._response(text=batch)
+            embeddings.extend([data.embedding for data in sorted(response.data, key=lambda d: d.index)])
+            usage.append(response.usage.model_dump())
+            usage.extend([None] * (len(batch) - 1))
+        return embeddings, usage
@@ -2,6 +2,7 @@ from typing import Optional, Dict, List, Tuple, Any
 
 from phi.embedder.base import Embedder
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client
 
 try:
     from ollama import Client as OllamaClient
@@ -16,6 +17,7 @@ class OllamaEmbedder(Embedder):
     host: Optional[str] = None
     timeout: Optional[Any] = None
     options: Optional[Any] = None
+    batch_size: int = 512
     client_kwargs: Optional[Dict[str, Any]] = None
     ollama_client: Optional[OllamaClient] = None
 
@@ -31,7 +33,7 @@ class OllamaEmbedder(Embedder):
             _ollama_params["timeout"] = self.timeout
         if self.client_kwargs:
             _ollama_params.update(self.client_kwargs)
-        return OllamaClient(**_ollama_params)
+        return get_cached_client(OllamaClient, _ollama_params)
 
     def _response(self, text: str) -> Dict[str, Any]:
         kwargs: Dict[str, Any] = {}
@@ -60,3 +62,32 @@ class OllamaEmbedder(Embedder):
         except Exception as e:
             logger.warning(e)
         return embedding, usage
+
+    def _batch_response(self, texts: List[str]) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {}
+        if self.options is not None:
+            kwargs["options"] = self.options
+
+        return self.client.embed(input=texts, model=self.model, **kwargs)  # type: ignore
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        embeddings, _ = self.get_embeddings_and_usage(texts)
+        return embeddings
+
+    def get_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        # The batch `embed` endpoint is only available in ollama>=0.3
+        if not hasattr(self.client, "embed"):
+            return super().get_embeddings_and_usage(texts)
+
+        embeddings: List[List[float]] = []
+        for batch in self.get_batches(texts):
+            try:
+                response = self._batch_response(texts=batch)
+                batch_embeddings = response.get("embeddings", []) if response is not None else []
+            except Exception as e:
+                logger.warning(e)
+                batch_embeddings = []
+            if len(batch_embeddings) != len(batch):
+                batch_embeddings = [[] for _ in batch]
+            embeddings.extend(batch_embeddings)
+        return embeddings, [None] * len(embeddings)
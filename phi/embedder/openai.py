@@ -1,11 +1,12 @@
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Union
 from typing_extensions import Literal
 
 from phi.embedder.base import Embedder
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client, get_cached_async_client
 
 try:
-    from openai import OpenAI as OpenAIClient
+    from openai import OpenAI as OpenAIClient, AsyncOpenAI as AsyncOpenAIClient
     from openai.types.create_embedding_response import CreateEmbeddingResponse
 except ImportError:
     raise ImportError("`openai` not installed")
@@ -21,7 +22,11 @@ class OpenAIEmbedder(Embedder):
     base_url: Optional[str] = None
     request_params: Optional[Dict[str, Any]] = None
     client_params: Optional[Dict[str, Any]] = None
+    # OpenAI accepts up to 2048 inputs and 300k tokens per request
+    batch_size: int = 2048
+    max_batch_tokens: Optional[int] = 300000
     openai_client: Optional[OpenAIClient] = None
+    async_client: Optional[AsyncOpenAIClient] = None
 
     @property
     def client(self) -> OpenAIClient:
@@ -37,9 +42,24 @@ class OpenAIEmbedder(Embedder):
             _client_params["base_url"] = self.base_url
         if self.client_params:
             _client_params.update(self.client_params)
-        return OpenAIClient(**_client_params)
+        return get_cached_client(OpenAIClient, _client_params, http_client_param="http_client")
 
-    def _response(self, text: str) -> CreateEmbeddingResponse:
+    def get_async_client(self) -> AsyncOpenAIClient:
+        if self.async_client:
+            return self.async_client
+
+        _client_params: Dict[str, Any] = {}
+        if self.api_key:
+            _client_params["api_key"] = self.api_key
+        if self.organization:
+            _client_params["organization"] = self.organization
+        if self.base_url:
+            _client_params["base_url"] = self.base_url
+        if self.client_params:
+            _client_params.update(self.client_params)
+        return get_cached_async_client(AsyncOpenAIClient, _client_params, http_client_param="http_client")
+
+    def _request_params(self, text: Union[str, List[str]]) -> Dict[str, Any]:
         _request_params: Dict[str, Any] = {
             "input": text,
             "model": self.model,
@@ -51,7 +71,13 @@ class OpenAIEmbedder(Embedder):
             _request_params["dimensions"] = self.dimensions
         if self.request_params:
             _request_params.update(self.request_params)
-        return self.client.embeddings.create(**_request_params)
+        return _request_params
+
+    def _response(self, text: Union[str, List[str]]) -> CreateEmbeddingResponse:
+        return self.client.embeddings.create(**self._request_params(text))
+
+    async def _aresponse(self, text: Union[str, List[str]]) -> CreateEmbeddingResponse:
+        return await self.get_async_client().embeddings.create(**self._request_params(text))
 
     def get_embedding(self, text: str) -> List[float]:
         response: CreateEmbeddingResponse = self._response(text=text)
@@ -67,3 +93,42 @@ class OpenAIEmbedder(Embedder):
         embedding = response.data[0].embedding
         usage = response.usage
         return embedding, usage.model_dump()
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        embeddings, _ = self.get_embeddings_and_usage(texts)
+        return embeddings
+
+    def get_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        embeddings: List[List[float]] = []
+        usage: List[Optional[Dict]] = []
+        for batch in self.get_batches(texts):
+            response: CreateEmbeddingResponse = self._response(text=batch)
+            embeddings.extend([data.embedding for data in sorted(response.data, key=lambda d: d.index)])
+            usage.append(response.usage.model_dump())
+            usage.extend([None] * (len(batch) - 1))
+        return embeddings, usage
+
+    async def aget_embedding(self, text: str) -> List[float]:
+        response: CreateEmbeddingResponse = await self._aresponse(text=text)
+        try:
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(e)
+            return []
+
+    async def aget_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        response: CreateEmbeddingResponse = await self._aresponse(text=text)
+
+        embedding = response.data[0].embedding
+        usage = response.usage
+        return embedding, usage.model_dump()
+
+    async def aget_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        embeddings: List[List[float]] = []
+        usage: List[Optional[Dict]] = []
+        for batch in self.get_batches(texts):
+            response: CreateEmbeddingResponse = await self._aresponse(text=batch)
+            embeddings.extend([data.embedding for data in sorted(response.data, key=lambda d: d.index)])
+            usage.append(response.usage.model_dump())
+            usage.extend([None] * (len(batch) - 1))
+        return embeddings, usage
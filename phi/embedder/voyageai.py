@@ -14,6 +14,9 @@ class VoyageAIEmbedder(Embedder):
     model: str = "voyage-2"
     dimensions: int = 1024
     request_params: Optional[Dict[str, Any]] = None
+    # VoyageAI accepts up to 128 texts and 120k tokens (voyage-large-2) per request
+    batch_size: int = 128
+    max_batch_tokens: Optional[int] = 120000
     api_key: Optional[str] = None
     base_url: str = "https://api.voyageai.com/v1/embeddings"
     max_retries: Optional[int] = None
@@ -38,8 +41,11 @@ class VoyageAIEmbedder(Embedder):
         return Client(**_client_params)
 
     def _response(self, text: str) -> EmbeddingsObject:
+        return self._batch_response(texts=[text])
+
+    def _batch_response(self, texts: List[str]) -> EmbeddingsObject:
         _request_params: Dict[str, Any] = {
-            "texts": [text],
+            "texts": texts,
             "model": self.model,
         }
         if self.request_params:
@@ -60,3 +66,17 @@ class VoyageAIEmbedder(Embedder):
         embedding = response.embeddings[0]
         usage = {"total_tokens": response.total_tokens}
         return embedding, usage
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        embeddings, _ = self.get_embeddings_and_usage(texts)
+        return embeddings
+
+    def get_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict]]]:
+        embeddings: List[List[float]] = []
+        usage: List[Optional[Dict]] = []
+        for batch in self.get_batches(texts):
+            response: EmbeddingsObject = self._batch_response(texts=batch)
+            embeddings.extend(response.embeddings)
+            usage.append({"total_tokens": response.total_tokens})
+            usage.extend([None] * (len(batch) - 1))
+        return embeddings, usage
@@ -1,11 +1,20 @@
-from typing import List, Optional, Iterator, Dict, Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from hashlib import md5
+from pathlib import Path
+from typing import List, Optional, Iterator, Iterable, Dict, Any, Deque, Set, Tuple, Union
 
+import httpx
 from pydantic import BaseModel, ConfigDict
 
 from phi.document import Document
 from phi.document.reader.base import Reader
+from phi.embedder import Embedder
+from phi.knowledge.manifest import KnowledgeManifest, KnowledgeSource, SourceRecord, get_file_hash
 from phi.vectordb import VectorDb
 from phi.utils.log import logger
+from phi.utils.rate_limit import RateLimiter
+from phi.utils.run_async import run_in_thread
 
 
 class AssistantKnowledge(BaseModel):
@@ -19,6 +28,21 @@ class AssistantKnowledge(BaseModel):
     num_documents: int = 2
     # Number of documents to optimize the vector db on
     optimize_on: Optional[int] = 1000
+    # Maximum number of documents per list when streaming documents from a reader
+    read_batch_size: int = 100
+    # -*- Load pipeline settings
+    # Number of threads used to embed documents while the next documents are being read.
+    # If None or 1, documents are embedded by the vector db when they are inserted.
+    load_concurrency: Optional[int] = None
+    # Maximum number of embedding requests started per second when loading concurrently
+    load_rate_limit: Optional[float] = None
+    # Maximum number of document lists read but not yet written to the vector db.
+    # Reading pauses when this limit is reached, which keeps memory bounded. Defaults to 2 * load_concurrency.
+    max_pending_loads: Optional[int] = None
+    # -*- Incremental load settings
+    # Path of the manifest recording the sources loaded to the vector db.
+    # If provided, `load` only reads new and modified sources and deletes the documents of removed sources.
+    manifest_path: Optional[Union[str, Path]] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -29,6 +53,25 @@ class AssistantKnowledge(BaseModel):
         """
         raise NotImplementedError
 
+    def iter_sources(self) -> Iterator[KnowledgeSource]:
+        """Iterator that yields the files or urls in the knowledge base, used to load it incrementally"""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support incremental loading using a manifest")
+
+    def read_source(self, source: KnowledgeSource) -> Iterator[Document]:
+        """Yield the documents of a source returned by `iter_sources`"""
+        raise NotImplementedError
+
+    def batch_documents(self, documents: Iterable[Document]) -> Iterator[List[Document]]:
+        """Group a stream of documents into lists of at most `read_batch_size` documents"""
+        batch: List[Document] = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= self.read_batch_size:
+                yield batch
+                batch = []
+        if len(batch) > 0:
+            yield batch
+
     def search(self, query: str, num_documents: Optional[int] = None) -> List[Document]:
         """Returns relevant documents matching the query"""
         try:
@@ -43,6 +86,24 @@ class AssistantKnowledge(BaseModel):
             logger.error(f"Error searching for documents: {e}")
             return []
 
+    async def async_search(self, query: str, num_documents: Optional[int] = None) -> List[Document]:
+        """Async version of `search`, does not block the event loop while embedding the query and querying the vector db"""
+        # Knowledge bases that override search (e.g. LangChain, LlamaIndex) are searched in a thread
+        if type(self).search is not AssistantKnowledge.search:
+            return await run_in_thread(self.search, query, num_documents)
+
+        try:
+            if self.vector_db is None:
+                logger.warning("No vector db provided")
+                return []
+
+            _num_documents = num_documents or self.num_documents
+            logger.debug(f"Getting {_num_documents} relevant documents for query: {query}")
+            return await self.vector_db.async_search(query=query, limit=_num_documents)
+        except Exception as e:
+            logger.error(f"Error searching for documents: {e}")
+            return []
+
     def load(self, recreate: bool = False, upsert: bool = False, skip_existing: bool = True) -> None:
         """Load the knowledge base to the vector db
 
@@ -64,27 +125,216 @@ class AssistantKnowledge(BaseModel):
         self.vector_db.create()
 
         logger.info("Loading knowledge base")
-        num_documents = 0
-        for document_list in self.document_lists:
-            documents_to_load = document_list
-            # Upsert documents if upsert is True and vector db supports upsert
-            if upsert and self.vector_db.upsert_available():
-                self.vector_db.upsert(documents=documents_to_load)
-            # Insert documents
-            else:
-                # Filter out documents which already exist in the vector db
-                if skip_existing:
-                    documents_to_load = [
-                        document for document in document_list if not self.vector_db.doc_exists(document)
-                    ]
-                self.vector_db.insert(documents=documents_to_load)
-            num_documents += len(documents_to_load)
-            logger.info(f"Added {len(documents_to_load)} documents to knowledge base")
+        manifest: Optional[KnowledgeManifest] = None
+        document_lists: Iterable[List[Document]] = self.document_lists
+        if self.manifest_path is not None:
+            # Start from an empty manifest when the collection is recreated
+            manifest = KnowledgeManifest(path=Path(self.manifest_path))
+            if not recreate:
+                manifest = KnowledgeManifest.read(self.manifest_path)
+            document_lists = self._iter_modified_document_lists(manifest)
+
+        if self.load_concurrency is not None and self.load_concurrency > 1:
+            num_documents = self._load_concurrently(document_lists, upsert=upsert, skip_existing=skip_existing)
+        else:
+            num_documents = self._load_sequentially(document_lists, upsert=upsert, skip_existing=skip_existing)
+
+        # The manifest is only written once all documents are written to the vector db
+        if manifest is not None:
+            manifest.write()
 
         if self.optimize_on is not None and num_documents > self.optimize_on:
             logger.info("Optimizing Vector DB")
             self.vector_db.optimize()
 
+    def _filter_existing(self, documents: List[Document], upsert: bool, skip_existing: bool) -> List[Document]:
+        """Returns the documents that need to be loaded to the vector db"""
+        if self.vector_db is None:
+            return []
+        # Upserted documents are always written
+        if upsert and self.vector_db.upsert_available():
+            return documents
+        # Filter out documents which already exist in the vector db
+        if skip_existing:
+            return self._filter_existing_documents(documents)
+        return documents
+
+    def _filter_existing_documents(self, documents: List[Document]) -> List[Document]:
+        """Returns the documents which do not exist in the vector db, using a single bulk lookup"""
+        if self.vector_db is None or len(documents) == 0:
+            return documents
+        existing_hashes = self.vector_db.docs_exist(documents)
+        return [document for document in documents if self.vector_db.get_content_hash(document) not in existing_hashes]
+
+    def _write_documents(self, documents: List[Document], upsert: bool) -> None:
+        """Write documents to the vector db"""
+        if self.vector_db is None:
+            return
+        # Upsert documents if upsert is True and vector db supports upsert
+        if upsert and self.vector_db.upsert_available():
+            self.vector_db.upsert(documents=documents)
+        # Insert documents
+        else:
+            self.vector_db.insert(documents=documents)
+        logger.info(f"Added {len(documents)} documents to knowledge base")
+
+    def get_source_record(self, source: KnowledgeSource) -> SourceRecord:
+        """Returns the modification time and size of a file, or the ETag and Last-Modified headers of a url"""
+        if source.path is not None:
+            stat = source.path.stat()
+            return SourceRecord(mtime=stat.st_mtime, size=stat.st_size)
+        if source.url is not None:
+            try:
+                response = httpx.head(source.url, follow_redirects=True, timeout=10)
+                return SourceRecord(
+                    etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified")
+                )
+            except Exception as e:
+                logger.debug(f"Could not get headers of {source.url}: {e}")
+        return SourceRecord()
+
+    @staticmethod
+    def _is_unchanged(previous: SourceRecord, current: SourceRecord) -> bool:
+        """Returns True if the source has not changed since the previous load, without reading it"""
+        if current.mtime is not None:
+            return current.mtime == previous.mtime and current.size == previous.size
+        if current.etag is not None:
+            return current.etag == previous.etag
+        if current.last_modified is not None:
+            return current.last_modified == previous.last_modified
+        return False
+
+    def _delete_documents(self, content_hashes: List[str]) -> None:
+        """Delete documents that are no longer part of any source from the vector db"""
+        if self.vector_db is None or len(content_hashes) == 0:
+            return
+        try:
+            self.vector_db.delete_by_content_hash(content_hashes)
+            logger.info(f"Deleted {len(content_hashes)} outdated documents from knowledge base")
+        except NotImplementedError:
+            logger.warning(
+                f"{self.vector_db.__class__.__name__} does not support deleting documents, "
+                f"keeping {len(content_hashes)} outdated documents"
+            )
+
+    def _update_source(self, manifest: KnowledgeManifest, name: str, record: Optional[SourceRecord]) -> None:
+        """Update the manifest record of a source and delete the documents it no longer uses"""
+        self._delete_documents(manifest.update(name, record))
+
+    def _iter_modified_document_lists(self, manifest: KnowledgeManifest) -> Iterator[List[Document]]:
+        """Yield the documents of the sources that are new or modified since the manifest was written.
+
+        Sources whose modification time and size, or ETag/Last-Modified, are unchanged are not read.
+        Sources whose content hash is unchanged are not written to the vector db.
+        The documents of modified and removed sources are deleted from the vector db.
+        """
+        if self.vector_db is None:
+            return
+
+        seen: Set[str] = set()
+        num_unchanged = 0
+        for source in self.iter_sources():
+            seen.add(source.name)
+            previous = manifest.sources.get(source.name)
+            record = self.get_source_record(source)
+            if previous is not None and self._is_unchanged(previous, record):
+                num_unchanged += 1
+                continue
+
+            documents: Optional[List[Document]] = None
+            if source.path is not None:
+                record.content_hash = get_file_hash(source.path)
+            else:
+                documents = list(self.read_source(source))
+                record.content_hash = md5("".join(document.content for document in documents).encode()).hexdigest()
+            if previous is not None and previous.content_hash == record.content_hash:
+                # Only the modification time or headers changed
+                record.chunk_hashes = previous.chunk_hashes
+                manifest.update(source.name, record)
+                num_unchanged += 1
+                continue
+
+            logger.debug(f"Reading {source.name}")
+            if documents is None:
+                documents = list(self.read_source(source))
+            record.chunk_hashes = [self.vector_db.get_content_hash(document) for document in documents]
+            self._update_source(manifest, source.name, record)
+            yield from self.batch_documents(documents)
+
+        # Sources removed from the knowledge base
+        for name in [name for name in manifest.sources if name not in seen]:
+            logger.debug(f"Removing {name}")
+            self._update_source(manifest, name, None)
+        logger.info(f"Skipped {num_unchanged} unchanged sources")
+
+    def _load_sequentially(self, document_lists: Iterable[List[Document]], upsert: bool, skip_existing: bool) -> int:
+        """Load the knowledge base one document list at a time"""
+        num_documents = 0
+        for document_list in document_lists:
+            documents_to_load = self._filter_existing(document_list, upsert=upsert, skip_existing=skip_existing)
+            self._write_documents(documents_to_load, upsert=upsert)
+            num_documents += len(documents_to_load)
+        return num_documents
+
+    def _load_concurrently(self, document_lists: Iterable[List[Document]], upsert: bool, skip_existing: bool) -> int:
+        """Load the knowledge base using a pipeline that overlaps reading, embedding and writing.
+
+        Document lists are read and filtered on the calling thread, embedded on a thread pool
+        and written to the vector db in the order they were read. At most `max_pending_loads`
+        document lists are held in memory at any time.
+        """
+        if self.vector_db is None:
+            return 0
+
+        _embedder: Optional[Embedder] = getattr(self.vector_db, "embedder", None)
+        if _embedder is None:
+            logger.warning("Vector db does not expose an embedder, loading sequentially")
+            return self._load_sequentially(document_lists, upsert=upsert, skip_existing=skip_existing)
+        embedder: Embedder = _embedder
+
+        concurrency: int = self.load_concurrency or 1
+        max_pending: int = max(self.max_pending_loads or 2 * concurrency, 1)
+        batch_size: int = max(embedder.batch_size, 1)
+        rate_limiter = RateLimiter(rate=self.load_rate_limit)
+
+        def embed(documents: List[Document]) -> None:
+            rate_limiter.acquire()
+            Document.embed_documents(documents, embedder=embedder)
+
+        def write_oldest() -> int:
+            documents, futures = pending.popleft()
+            for future in futures:
+                future.result()
+            self._write_documents(documents, upsert=upsert)
+            return len(documents)
+
+        num_documents = 0
+        # Each pending entry is a document list and the futures embedding its batches
+        pending: Deque[Tuple[List[Document], List[Future]]] = deque()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="phi-embed") as executor:
+            try:
+                for document_list in document_lists:
+                    documents_to_load = self._filter_existing(document_list, upsert=upsert, skip_existing=skip_existing)
+                    if len(documents_to_load) == 0:
+                        continue
+                    futures = [
+                        executor.submit(embed, documents_to_load[start : start + batch_size])
+                        for start in range(0, len(documents_to_load), batch_size)
+                    ]
+                    pending.append((documents_to_load, futures))
+                    # Apply backpressure: write the oldest document list before reading more documents
+                    while len(pending) >= max_pending:
+                        num_documents += write_oldest()
+
+                while len(pending) > 0:
+                    num_documents += write_oldest()
+            except Exception:
+                for _, futures in pending:
+                    for future in futures:
+                        future.cancel()
+                raise
+        return num_documents
+
     def load_documents(self, documents: List[Document], upsert: bool = False, skip_existing: bool = True) -> None:
         """Load documents to the knowledge base
 
@@ -109,11 +359,7 @@ class AssistantKnowledge(BaseModel):
             return
 
         # Filter out documents which already exist in the vector db
-        documents_to_load = (
-            [document for document in documents if not self.vector_db.doc_exists(document)]
-            if skip_existing
-            else documents
-        )
+        documents_to_load = self._filter_existing_documents(documents) if skip_existing else documents
 
         # Insert documents
         if len(documents_to_load) > 0:
@@ -4,6 +4,7 @@ from typing import Union, List, Iterator
 from phi.document import Document
 from phi.document.reader.csv_reader import CSVReader
 from phi.knowledge.base import AssistantKnowledge
+from phi.knowledge.manifest import KnowledgeSource
 
 
 class CSVKnowledgeBase(AssistantKnowledge):
@@ -19,10 +20,17 @@ class CSVKnowledgeBase(AssistantKnowledge):
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        for source in self.iter_sources():
+            yield list(self.read_source(source))
+
+    def iter_sources(self) -> Iterator[KnowledgeSource]:
         _csv_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _csv_path.exists() and _csv_path.is_dir():
             for _csv in _csv_path.glob("**/*.csv"):
-                yield self.reader.read(path=_csv)
+                yield KnowledgeSource(name=str(_csv), path=_csv)
         elif _csv_path.exists() and _csv_path.is_file() and _csv_path.suffix == ".csv":
-            yield self.reader.read(path=_csv_path)
+            yield KnowledgeSource(name=str(_csv_path), path=_csv_path)
+
+    def read_source(self, source: KnowledgeSource) -> Iterator[Document]:
+        return iter(self.reader.read(path=source.path or Path(source.name)))
@@ -4,6 +4,7 @@ from typing import Union, List, Iterator
 from phi.document import Document
 from phi.document.reader.json import JSONReader
 from phi.knowledge.base import AssistantKnowledge
+from phi.knowledge.manifest import KnowledgeSource
 
 
 class JSONKnowledgeBase(AssistantKnowledge):
@@ -19,10 +20,17 @@ class JSONKnowledgeBase(AssistantKnowledge):
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        for source in self.iter_sources():
+            yield list(self.read_source(source))
+
+    def iter_sources(self) -> Iterator[KnowledgeSource]:
         _json_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _json_path.exists() and _json_path.is_dir():
             for _pdf in _json_path.glob("*.json"):
-                yield self.reader.read(path=_pdf)
+                yield KnowledgeSource(name=str(_pdf), path=_pdf)
         elif _json_path.exists() and _json_path.is_file() and _json_path.suffix == ".json":
-            yield self.reader.read(path=_json_path)
+            yield KnowledgeSource(name=str(_json_path), path=_json_path)
+
+    def read_source(self, source: KnowledgeSource) -> Iterator[Document]:
+        return iter(self.reader.read(path=source.path or Path(source.name)))
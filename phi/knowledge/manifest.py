@@ -0,0 +1,108 @@
+import json
+from hashlib import md5
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from pydantic import BaseModel
+
+from phi.utils.log import logger
+
+
+class KnowledgeSource(BaseModel):
+    """A file or url loaded to a knowledge base"""
+
+    # Key of the source in the manifest: the file path or the url
+    name: str
+    path: Optional[Path] = None
+    url: Optional[str] = None
+
+
+class SourceRecord(BaseModel):
+    """State of a source when it was last loaded to the vector db"""
+
+    # File modification time and size
+    mtime: Optional[float] = None
+    size: Optional[int] = None
+    # md5 of the file contents, or of the content of the documents read from a url
+    content_hash: Optional[str] = None
+    # HTTP validators of a url
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Url of the website a crawled page belongs to, and the links on the page
+    parent: Optional[str] = None
+    links: List[str] = []
+    # Content hashes of the chunks written to the vector db, which is how vector dbs identify documents
+    chunk_hashes: List[str] = []
+
+
+class KnowledgeManifest(BaseModel):
+    """Sources loaded to a knowledge base, persisted as a JSON file.
+
+    Used by `AssistantKnowledge.load` to only read new and modified sources
+    and to delete the chunks of modified and removed sources from the vector db.
+    """
+
+    path: Path
+    sources: Dict[str, SourceRecord] = {}
+
+    # Number of sources using each chunk hash
+    _refs: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def read(cls, path: Union[str, Path]) -> "KnowledgeManifest":
+        path = Path(path)
+        if not path.exists():
+            return cls(path=path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            return cls(path=path, sources=data.get("sources", {}))
+        except Exception as e:
+            logger.warning(f"Could not read manifest {path}, loading all sources: {e}")
+            return cls(path=path)
+
+    def write(self) -> None:
+        """Write the manifest, replacing the previous file only once the new one is complete"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"sources": {name: record.model_dump(exclude_none=True) for name, record in self.sources.items()}}
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def _get_refs(self) -> Dict[str, int]:
+        if self._refs is None:
+            self._refs = {}
+            for record in self.sources.values():
+                for chunk_hash in set(record.chunk_hashes):
+                    self._refs[chunk_hash] = self._refs.get(chunk_hash, 0) + 1
+        return self._refs
+
+    def update(self, name: str, record: Optional[SourceRecord]) -> List[str]:
+        """Set the record of a source, or remove it if record is None.
+
+        Returns the chunk hashes of the previous record that are no longer used by any source,
+        i.e. the documents to delete from the vector db.
+        """
+        refs = self._get_refs()
+        previous = self.sources.pop(name, None)
+        if record is not None:
+            self.sources[name] = record
+            for chunk_hash in set(record.chunk_hashes):
+                refs[chunk_hash] = refs.get(chunk_hash, 0) + 1
+
+        stale: List[str] = []
+        if previous is not None:
+            for chunk_hash in set(previous.chunk_hashes):
+                refs[chunk_hash] -= 1
+                if refs[chunk_hash] <= 0:
+                    del refs[chunk_hash]
+                    stale.append(chunk_hash)
+        return stale
+
+
+def get_file_hash(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Returns the md5 of the file contents, reading the file in chunks"""
+    file_hash = md5()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
@@ -4,6 +4,7 @@ from typing import Union, List, Iterator
 from phi.document import Document
 from phi.document.reader.pdf import PDFReader, PDFUrlReader, PDFImageReader, PDFUrlImageReader
 from phi.knowledge.base import AssistantKnowledge
+from phi.knowledge.manifest import KnowledgeSource
 
 
 class PDFKnowledgeBase(AssistantKnowledge):
@@ -14,18 +15,26 @@ class PDFKnowledgeBase(AssistantKnowledge):
     def document_lists(self) -> Iterator[List[Document]]:
         """Iterate over PDFs and yield lists of documents.
         Each object yielded by the iterator is a list of documents.
+        Pages are read lazily, so at most `read_batch_size` documents are held in memory.
 
         Returns:
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        for source in self.iter_sources():
+            yield from self.batch_documents(self.read_source(source))
+
+    def iter_sources(self) -> Iterator[KnowledgeSource]:
         _pdf_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _pdf_path.exists() and _pdf_path.is_dir():
             for _pdf in _pdf_path.glob("**/*.pdf"):
-                yield self.reader.read(pdf=_pdf)
+                yield KnowledgeSource(name=str(_pdf), path=_pdf)
         elif _pdf_path.exists() and _pdf_path.is_file() and _pdf_path.suffix == ".pdf":
-            yield self.reader.read(pdf=_pdf_path)
+            yield KnowledgeSource(name=str(_pdf_path), path=_pdf_path)
+
+    def read_source(self, source: KnowledgeSource) -> Iterator[Document]:
+        return self.reader.iter_read(pdf=source.path or source.name)
 
 
 class PDFUrlKnowledgeBase(AssistantKnowledge):
@@ -42,4 +51,11 @@ class PDFUrlKnowledgeBase(AssistantKnowledge):
         """
 
         for url in self.urls:
-            yield self.reader.read(url=url)
+            yield from self.batch_documents(self.reader.iter_read(url=url))
+
+    def iter_sources(self) -> Iterator[KnowledgeSource]:
+        for url in self.urls:
+            yield KnowledgeSource(name=url, url=url)
+
+    def read_source(self, source: KnowledgeSource) -> Iterator[Document]:
+        return self.reader.iter_read(url=source.url or source.name)
@@ -18,4 +18,4 @@ class S3PDFKnowledgeBase(S3KnowledgeBase):
         """
         for s3_object in self.s3_objects:
             if s3_object.name.endswith(".pdf"):
-                yield self.reader.read(s3_object=s3_object)
+                yield from self.batch_documents(self.reader.iter_read(s3_object=s3_object))
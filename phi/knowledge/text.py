@@ -4,6 +4,7 @@ from typing import Union, List, Iterator
 from phi.document import Document
 from phi.document.reader.text import TextReader
 from phi.knowledge.base import AssistantKnowledge
+from phi.knowledge.manifest import KnowledgeSource
 
 
 class TextKnowledgeBase(AssistantKnowledge):
@@ -20,11 +21,18 @@ class TextKnowledgeBase(AssistantKnowledge):
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        for source in self.iter_sources():
+            yield list(self.read_source(source))
+
+    def iter_sources(self) -> Iterator[KnowledgeSource]:
         _file_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _file_path.exists() and _file_path.is_dir():
             for _file in _file_path.glob("**/*"):
                 if _file.suffix in self.formats:
-                    yield self.reader.read(path=_file)
+                    yield KnowledgeSource(name=str(_file), path=_file)
         elif _file_path.exists() and _file_path.is_file() and _file_path.suffix in self.formats:
-            yield self.reader.read(path=_file_path)
+            yield KnowledgeSource(name=str(_file_path), path=_file_path)
+
+    def read_source(self, source: KnowledgeSource) -> Iterator[Document]:
+        return iter(self.reader.read(path=source.path or Path(source.name)))
@@ -1,10 +1,12 @@
-from typing import Iterator, List, Optional
+from hashlib import md5
+from typing import Iterator, List, Optional, Set
 
 from pydantic import model_validator
 
 from phi.document import Document
-from phi.document.reader.website import WebsiteReader
+from phi.document.reader.website import CrawledPage, WebsiteReader
 from phi.knowledge.base import AssistantKnowledge
+from phi.knowledge.manifest import KnowledgeManifest, SourceRecord
 from phi.utils.log import logger
 
 
@@ -32,11 +34,81 @@ class WebsiteKnowledgeBase(AssistantKnowledge):
         """
         if self.reader is not None:
             for _url in self.urls:
-                yield self.reader.read(url=_url)
+                yield from self.batch_documents(self.reader.iter_read(url=_url))
+
+    def _iter_modified_document_lists(self, manifest: KnowledgeManifest) -> Iterator[List[Document]]:
+        """Crawl the websites and yield the documents of new and modified pages.
+
+        Each crawled page is recorded in the manifest with the hash of its content, its links and its
+        ETag/Last-Modified headers. Pages are requested with these headers, so pages that have not changed
+        are not downloaded, and unchanged pages are not chunked nor written again.
+        The documents of pages that are not crawled are only deleted if the crawl did not stop at max_links
+        and the page responds with 404 Not Found or 410 Gone, so pages that failed to fetch or were not reached
+        keep their documents.
+        """
+        if self.vector_db is None or self.reader is None:
+            return
+
+        num_unchanged = 0
+        for url in self.urls:
+            seen: Set[str] = set()
+            known_pages = {
+                name: CrawledPage(url=name, links=r.links, etag=r.etag, last_modified=r.last_modified)
+                for name, r in manifest.sources.items()
+                if r.parent == url and (r.etag or r.last_modified)
+            }
+            for page in self.reader.iter_crawl_pages(url=url, known_pages=known_pages):
+                seen.add(page.url)
+                # Not modified since the last load
+                if page.content is None:
+                    num_unchanged += 1
+                    continue
+                content_hash = md5(page.content.encode()).hexdigest()
+                previous = manifest.sources.get(page.url)
+                if previous is not None and previous.content_hash == content_hash:
+                    previous.links, previous.etag, previous.last_modified = page.links, page.etag, page.last_modified
+                    num_unchanged += 1
+                    continue
+
+                document = Document(name=url, id=page.url, meta_data={"url": page.url}, content=page.content)
+                documents = list(self.reader.iter_chunks([document]))
+                record = SourceRecord(
+                    content_hash=content_hash,
+                    etag=page.etag,
+                    last_modified=page.last_modified,
+                    parent=url,
+                    links=page.links,
+                    chunk_hashes=[self.vector_db.get_content_hash(document) for document in documents],
+                )
+                self._update_source(manifest, page.url, record)
+                yield from self.batch_documents(documents)
+
+            # Keep the pages of a website that could not be crawled
+            if len(seen) == 0:
+                logger.warning(f"No pages crawled from {url}, keeping its documents")
+                continue
+            # Pages crawled are limited to max_links, so pages that were not reached may still exist
+            if len(seen) >= self.reader.max_links:
+                continue
+            not_crawled = [n for n, r in manifest.sources.items() if r.parent == url and n not in seen]
+            for name in self.reader.get_gone_urls(not_crawled):
+                logger.debug(f"Removing {name}")
+                self._update_source(manifest, name, None)
+
+        # Websites removed from the knowledge base
+        for name in [n for n, r in manifest.sources.items() if r.parent not in self.urls]:
+            logger.debug(f"Removing {name}")
+            self._update_source(manifest, name, None)
+        logger.info(f"Skipped {num_unchanged} unchanged pages")
 
     def load(self, recreate: bool = False, upsert: bool = True, skip_existing: bool = True) -> None:
         """Load the website contents to the vector db"""
 
+        # With a manifest, only new and modified pages are written
+        if self.manifest_path is not None:
+            super().load(recreate=recreate, upsert=upsert, skip_existing=skip_existing)
+            return
+
         if self.vector_db is None:
             logger.warning("No vector db provided")
             return
@@ -66,16 +138,17 @@ class WebsiteKnowledgeBase(AssistantKnowledge):
                     urls_to_read.remove(url)
 
         for url in urls_to_read:
-            document_list = self.reader.read(url=url)
-            # Filter out documents which already exist in the vector db
-            if not recreate:
-                document_list = [document for document in document_list if not self.vector_db.doc_exists(document)]
-            if upsert and self.vector_db.upsert_available():
-                self.vector_db.upsert(documents=document_list)
-            else:
-                self.vector_db.insert(documents=document_list)
-            num_documents += len(document_list)
-            logger.info(f"Loaded {num_documents} documents to knowledge base")
+            # Stream documents from the crawler so pages are written as they are read
+            for document_list in self.batch_documents(self.reader.iter_read(url=url)):
+                # Filter out documents which already exist in the vector db
+                if not recreate:
+                    document_list = self._filter_existing_documents(document_list)
+                if upsert and self.vector_db.upsert_available():
+                    self.vector_db.upsert(documents=document_list)
+                else:
+                    self.vector_db.insert(documents=document_list)
+                num_documents += len(document_list)
+                logger.info(f"Loaded {num_documents} documents to knowledge base")
 
         if self.optimize_on is not None and num_documents > self.optimize_on:
             logger.debug("Optimizing Vector DB")
@@ -5,6 +5,7 @@ from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client
 from phi.utils.timer import Timer
 from phi.utils.tools import (
     get_function_call_for_tool_call,
@@ -48,7 +49,7 @@ class Claude(LLM):
         _client_params: Dict[str, Any] = {}
         if self.api_key:
             _client_params["api_key"] = self.api_key
-        return AnthropicClient(**_client_params)
+        return get_cached_client(AnthropicClient, _client_params, http_client_param="http_client")
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -154,10 +155,13 @@ class Claude(LLM):
 
     def response(self, messages: List[Message]) -> str:
         logger.debug("---------- Claude Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        final_response = "".join(self.run_tool_loop(messages=messages, turn=self._response_turn))
+        logger.debug("---------- Claude Response End ----------")
+        return final_response
 
+    def _response_turn(self, messages: List[Message]) -> Iterator[str]:
+        """Generates one assistant message and runs its tool calls, yielding the response text"""
+        tool_ids: List[str] = []
         response_timer = Timer()
         response_timer.start()
         response: AnthropicMessage = self.invoke(messages=messages)
@@ -178,7 +182,6 @@ class Claude(LLM):
         # Check if the response contains a tool call
         if response.stop_reason == "tool_use":
             tool_calls: List[Dict[str, Any]] = []
-            tool_ids: List[str] = []
             for block in response.content:
                 if isinstance(block, ToolUseBlock):
                     tool_use: ToolUseBlock = block
@@ -226,63 +229,26 @@ class Claude(LLM):
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
-        assistant_message.log()
 
         # -*- Parse and run function call
         if assistant_message.tool_calls is not None and self.run_tools:
-            # Remove the tool call from the response content
-            final_response = str(response_content)
-            final_response += "\n\n"
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(Message(role="user", content="Could not find function to call."))
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="user", content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    final_response += f" - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    final_response += "Running:"
-                    for _f in function_calls_to_run:
-                        final_response += f"\n - {_f.get_call_str()}"
-                    final_response += "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run)
-            if len(function_call_results) > 0:
-                fc_responses: List = []
-
-                for _fc_message_index, _fc_message in enumerate(function_call_results):
-                    fc_responses.append(
-                        {
-                            "type": "tool_result",
-                            "tool_use_id": tool_ids[_fc_message_index],
-                            "content": _fc_message.content,
-                        }
-                    )
-
-                messages.append(Message(role="user", content=fc_responses))
+            yield str(response_content) + "\n\n"
+            yield from self._run_tool_calls(assistant_message, messages, tool_ids)
+            return
 
-            # -*- Yield new response using results of tool calls
-            final_response += self.response(messages=messages)
-            return final_response
-        logger.debug("---------- Claude Response End ----------")
         # -*- Return content if no function calls are present
         if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
+            yield assistant_message.get_content_string()
+        else:
+            yield "Something went wrong, please try again."
 
     def response_stream(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- Claude Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        yield from self.run_tool_loop(messages=messages, turn=self._response_stream_turn)
+        logger.debug("---------- Claude Response End ----------")
 
+    def _response_stream_turn(self, messages: List[Message]) -> Iterator[str]:
+        """Streams one assistant message and runs its tool calls"""
         response_content_text = ""
         response_content: List[Optional[Union[TextBlock, ToolUseBlock]]] = []
         response_usage: Optional[Usage] = None
@@ -359,49 +325,46 @@ class Claude(LLM):
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
-        assistant_message.log()
 
         # -*- Parse and run function call
         if assistant_message.tool_calls is not None and self.run_tools:
-            # Remove the tool call from the response content
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(Message(role="user", content="Could not find function to call."))
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="user", content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    yield f" - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    yield "Running:"
-                    for _f in function_calls_to_run:
-                        yield f"\n - {_f.get_call_str()}"
-                    yield "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run)
-            if len(function_call_results) > 0:
-                fc_responses: List = []
-
-                for _fc_message_index, _fc_message in enumerate(function_call_results):
-                    fc_responses.append(
-                        {
-                            "type": "tool_result",
-                            "tool_use_id": tool_ids[_fc_message_index],
-                            "content": _fc_message.content,
-                        }
-                    )
-
-                messages.append(Message(role="user", content=fc_responses))
+            yield from self._run_tool_calls(assistant_message, messages, tool_ids)
+
+    def _run_tool_calls(
+        self, assistant_message: Message, messages: List[Message], tool_ids: List[str]
+    ) -> Iterator[str]:
+        """Runs the tool calls of the assistant message and adds the tool results to messages"""
+        function_calls_to_run: List[FunctionCall] = []
+        for tool_call in assistant_message.tool_calls or []:
+            _function_call = get_function_call_for_tool_call(tool_call, self.functions)
+            if _function_call is None:
+                messages.append(Message(role="user", content="Could not find function to call."))
+                continue
+            if _function_call.error is not None:
+                messages.append(Message(role="user", content=_function_call.error))
+                continue
+            function_calls_to_run.append(_function_call)
+
+        if self.show_tool_calls:
+            if len(function_calls_to_run) == 1:
+                yield f" - Running: {function_calls_to_run[0].get_call_str()}\n\n"
+            elif len(function_calls_to_run) > 1:
+                yield "Running:" + "".join(f"\n - {_f.get_call_str()}" for _f in function_calls_to_run) + "\n\n"
+
+        function_call_results = self.run_function_calls(function_calls_to_run)
+        if len(function_call_results) > 0:
+            fc_responses: List = []
+
+            for _fc_message_index, _fc_message in enumerate(function_call_results):
+                fc_responses.append(
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": tool_ids[_fc_message_index],
+                        "content": _fc_message.content,
+                    }
+                )
 
-            # -*- Yield new response using results of tool calls
-            yield from self.response(messages=messages)
-        logger.debug("---------- Claude Response End ----------")
+            messages.append(Message(role="user", content=fc_responses))
 
     def get_tool_call_prompt(self) -> Optional[str]:
         if self.functions is not None and len(self.functions) > 0:
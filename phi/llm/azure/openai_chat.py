@@ -1,6 +1,7 @@
 from os import getenv
 from typing import Optional, Dict, Any
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client
 from phi.llm.openai.like import OpenAILike
 
 try:
@@ -49,4 +50,4 @@ class AzureOpenAIChat(OpenAILike):
         if self.client_params:
             _client_params.update(self.client_params)
 
-        return AzureOpenAIClient(**_client_params)
+        return get_cached_client(AzureOpenAIClient, _client_params, http_client_param="http_client")
@@ -1,4 +1,8 @@
-from typing import List, Iterator, Optional, Dict, Any, Callable, Union
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import List, Iterator, AsyncIterator, Optional, Dict, Any, Callable, Union, Tuple, Deque
 
 from pydantic import BaseModel, ConfigDict
 
@@ -43,6 +47,19 @@ class LLM(BaseModel):
     function_call_limit: int = 10
     # Function call stack.
     function_call_stack: Optional[List[FunctionCall]] = None
+    # If True, runs the tool calls from a single response concurrently.
+    # Sync functions run on a thread pool and coroutine functions are gathered on an event loop.
+    # Results are always returned in the order of the tool calls.
+    run_tools_in_parallel: bool = False
+    # Maximum number of tool calls to run at the same time when running tools in parallel.
+    max_parallel_tool_calls: int = 10
+    # Maximum number of seconds to wait for each tool call. A tool call that times out returns an error to the LLM.
+    tool_call_timeout: Optional[float] = None
+    # Maximum number of tool rounds (responses that call tools) while generating a single response.
+    # When reached, tools are disabled for the final round so the model answers with the results it has.
+    max_tool_rounds: Optional[int] = None
+    # Maximum number of tokens used across the tool rounds of a single response, enforced like max_tool_rounds.
+    max_tool_round_tokens: Optional[int] = None
 
     system_prompt: Optional[str] = None
     instructions: Optional[List[str]] = None
@@ -50,6 +67,10 @@ class LLM(BaseModel):
     # State from the run
     run_id: Optional[str] = None
 
+    # Tools payload returned by get_tools_for_api, rebuilt when tools are added
+    _tools_for_api: Optional[List[Dict[str, Any]]] = None
+    _tools_for_api_key: Optional[Tuple[int, int]] = None
+
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     @property
@@ -91,18 +112,27 @@ class LLM(BaseModel):
         if self.functions:
             _dict["functions"] = {k: v.to_dict() for k, v in self.functions.items()}
             _dict["function_call_limit"] = self.function_call_limit
+            if self.run_tools_in_parallel:
+                _dict["max_parallel_tool_calls"] = self.max_parallel_tool_calls
         return _dict
 
     def get_tools_for_api(self) -> Optional[List[Dict[str, Any]]]:
         if self.tools is None:
             return None
 
+        # Tools are only added using add_tool(), so the payload is reused until the tools list changes
+        tools_key = (id(self.tools), len(self.tools))
+        if self._tools_for_api is not None and self._tools_for_api_key == tools_key:
+            return self._tools_for_api
+
         tools_for_api = []
         for tool in self.tools:
             if isinstance(tool, Tool):
                 tools_for_api.append(tool.to_dict())
             elif isinstance(tool, Dict):
                 tools_for_api.append(tool)
+        self._tools_for_api = tools_for_api
+        self._tools_for_api_key = tools_key
         return tools_for_api
 
     def add_tool(self, tool: Union[Tool, Toolkit, Callable, Dict, Function]) -> None:
@@ -151,41 +181,261 @@ class LLM(BaseModel):
         # This is triggered when the function call limit is reached.
         self.tool_choice = "none"
 
-    def run_function_calls(self, function_calls: List[FunctionCall], role: str = "tool") -> List[Message]:
-        function_call_results: List[Message] = []
-        for function_call in function_calls:
-            if self.function_call_stack is None:
-                self.function_call_stack = []
-
-            # -*- Run function call
-            _function_call_timer = Timer()
-            _function_call_timer.start()
-            function_call_success = function_call.execute()
-            _function_call_timer.stop()
+    def get_function_calls_within_limit(self, function_calls: List[FunctionCall]) -> List[FunctionCall]:
+        """Returns the function calls that can run before the function call limit is reached"""
+        if self.function_call_stack is None:
+            self.function_call_stack = []
+        # At least one function call is run, matching the behaviour of running function calls one at a time
+        return function_calls[: max(self.function_call_limit - len(self.function_call_stack), 1)]
+
+    def _execute_function_call(self, function_call: FunctionCall) -> Tuple[bool, float]:
+        _function_call_timer = Timer()
+        _function_call_timer.start()
+        function_call_success = function_call.execute()
+        _function_call_timer.stop()
+        return function_call_success, _function_call_timer.elapsed
+
+    def _execute_function_calls_in_threads(self, function_calls: List[FunctionCall]) -> List[Tuple[bool, float]]:
+        """Runs the function calls on a thread pool and returns the results in the order of the function calls.
+
+        At most `max_parallel_tool_calls` function calls run at the same time (one if `run_tools_in_parallel` is False)
+        and each function call times out `tool_call_timeout` seconds after it starts. The pool has a worker per
+        function call, so function calls queued behind a function call that timed out still get a worker.
+        """
+        max_running = max(min(len(function_calls), self.max_parallel_tool_calls), 1)
+        if not self.run_tools_in_parallel:
+            max_running = 1
+        executor = ThreadPoolExecutor(max_workers=max(len(function_calls), 1), thread_name_prefix="phi-tool")
+        results: List[Optional[Tuple[bool, float]]] = [None] * len(function_calls)
+        pending: Deque[int] = deque(range(len(function_calls)))
+        # Running function calls with their index and deadline
+        running: Dict[Future, Tuple[int, Optional[float]]] = {}
+        try:
+            while pending or running:
+                while pending and len(running) < max_running:
+                    i = pending.popleft()
+                    deadline = time.monotonic() + self.tool_call_timeout if self.tool_call_timeout is not None else None
+                    running[executor.submit(self._execute_function_call, function_calls[i])] = (i, deadline)
+
+                deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+                wait_timeout = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+                done, _ = wait(running, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future in list(running):
+                    i, deadline = running[future]
+                    if future in done:
+                        results[i] = future.result()
+                    elif deadline is not None and now >= deadline:
+                        future.cancel()
+                        function_calls[i].error = f"Function call timed out after {self.tool_call_timeout} seconds"
+                        logger.warning(f"Timed out: {function_calls[i].get_call_str()}")
+                        results[i] = (False, float(self.tool_call_timeout or 0))
+                    else:
+                        continue
+                    del running[future]
+            return [result for result in results if result is not None]
+        finally:
+            # Do not wait for function calls that timed out
+            executor.shutdown(wait=False)
+
+    def _build_function_call_results(
+        self, function_calls: List[FunctionCall], results: List[Tuple[bool, float]], role: str
+    ) -> List[Message]:
+        if self.function_call_stack is None:
+            self.function_call_stack = []
 
+        function_call_results: List[Message] = []
+        for function_call, (function_call_success, elapsed) in zip(function_calls, results):
             _function_call_result = Message(
                 role=role,
                 content=function_call.result if function_call_success else function_call.error,
                 tool_call_id=function_call.call_id,
                 tool_call_name=function_call.function.name,
                 tool_call_error=not function_call_success,
-                metrics={"time": _function_call_timer.elapsed},
+                metrics={"time": elapsed},
             )
             if "tool_call_times" not in self.metrics:
                 self.metrics["tool_call_times"] = {}
             if function_call.function.name not in self.metrics["tool_call_times"]:
                 self.metrics["tool_call_times"][function_call.function.name] = []
-            self.metrics["tool_call_times"][function_call.function.name].append(_function_call_timer.elapsed)
+            self.metrics["tool_call_times"][function_call.function.name].append(elapsed)
+            if function_call.cache_hit is not None:
+                _function_call_result.metrics["cache_hit"] = function_call.cache_hit
+                cache_metric = "tool_call_cache_hits" if function_call.cache_hit else "tool_call_cache_misses"
+                if cache_metric not in self.metrics:
+                    self.metrics[cache_metric] = {}
+                self.metrics[cache_metric][function_call.function.name] = (
+                    self.metrics[cache_metric].get(function_call.function.name, 0) + 1
+                )
             function_call_results.append(_function_call_result)
             self.function_call_stack.append(function_call)
 
-            # -*- Check function call limit
-            if len(self.function_call_stack) >= self.function_call_limit:
-                self.deactivate_function_calls()
-                break  # Exit early if we reach the function call limit
+        # -*- Check function call limit
+        if len(self.function_call_stack) >= self.function_call_limit:
+            self.deactivate_function_calls()
 
         return function_call_results
 
+    def run_function_calls(self, function_calls: List[FunctionCall], role: str = "tool") -> List[Message]:
+        function_calls = self.get_function_calls_within_limit(function_calls)
+
+        # -*- Run function calls
+        results: List[Tuple[bool, float]]
+        if (self.run_tools_in_parallel and len(function_calls) > 1) or self.tool_call_timeout is not None:
+            results = self._execute_function_calls_in_threads(function_calls)
+        else:
+            results = [self._execute_function_call(function_call) for function_call in function_calls]
+
+        return self._build_function_call_results(function_calls, results, role=role)
+
+    async def _aexecute_function_call(
+        self, function_call: FunctionCall, semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Tuple[bool, float]:
+        if semaphore is not None:
+            # The timeout starts once the function call acquires the semaphore
+            async with semaphore:
+                return await self._aexecute_function_call(function_call)
+
+        _function_call_timer = Timer()
+        _function_call_timer.start()
+        try:
+            function_call_success = await asyncio.wait_for(function_call.aexecute(), self.tool_call_timeout)
+        except asyncio.TimeoutError:
+            function_call.error = f"Function call timed out after {self.tool_call_timeout} seconds"
+            logger.warning(f"Timed out: {function_call.get_call_str()}")
+            function_call_success = False
+        _function_call_timer.stop()
+        return function_call_success, _function_call_timer.elapsed
+
+    async def arun_function_calls(self, function_calls: List[FunctionCall], role: str = "tool") -> List[Message]:
+        """Async version of `run_function_calls`, function calls do not block the event loop"""
+        function_calls = self.get_function_calls_within_limit(function_calls)
+
+        # -*- Run function calls
+        results: List[Tuple[bool, float]]
+        if self.run_tools_in_parallel and len(function_calls) > 1:
+            semaphore = asyncio.Semaphore(max(self.max_parallel_tool_calls, 1))
+            # gather returns the results in the order of the function calls
+            results = list(
+                await asyncio.gather(*[self._aexecute_function_call(fc, semaphore) for fc in function_calls])
+            )
+        else:
+            results = [await self._aexecute_function_call(function_call) for function_call in function_calls]
+
+        return self._build_function_call_results(function_calls, results, role=role)
+
+    def log_messages(self, messages: List[Message], start: int = 0) -> None:
+        """Log the messages starting at index `start`"""
+        for m in messages[start:]:
+            m.log()
+
+    def get_function_calls_str(self, function_calls: List[FunctionCall]) -> str:
+        """Returns the string shown in the response when show_tool_calls is True"""
+        if len(function_calls) == 1:
+            return f"\n - Running: {function_calls[0].get_call_str()}\n\n"
+        elif len(function_calls) > 1:
+            return "\nRunning:" + "".join(f"\n - {_f.get_call_str()}" for _f in function_calls) + "\n\n"
+        return ""
+
+    def _ran_tools(self, messages: List[Message], num_messages: int) -> bool:
+        """A round ran tools if it added messages after the assistant message, e.g. tool results"""
+        return len(messages) > num_messages and messages[-1].role != "assistant"
+
+    def _get_round_tokens(self, messages: List[Message], num_messages: int) -> int:
+        tokens = 0
+        for m in messages[num_messages:]:
+            if m.role == "assistant":
+                tokens += m.metrics.get("total_tokens") or (
+                    (m.metrics.get("input_tokens") or 0) + (m.metrics.get("output_tokens") or 0)
+                )
+        return tokens
+
+    def _tool_round_limit_reached(self, tool_rounds: int, tool_round_tokens: int) -> bool:
+        if self.max_tool_rounds is not None and tool_rounds >= self.max_tool_rounds:
+            logger.debug(f"Tool round limit ({self.max_tool_rounds}) reached")
+            return True
+        if self.max_tool_round_tokens is not None and tool_round_tokens >= self.max_tool_round_tokens:
+            logger.debug(f"Tool round token limit ({self.max_tool_round_tokens}) reached")
+            return True
+        return False
+
+    def _deactivate_tools_for_final_round(self) -> None:
+        """Asks the model to answer without tools and stops running tool calls for the final round.
+        Some LLMs (e.g. Claude, Ollama) may ignore the tool choice, so their tool calls are not run either.
+        """
+        self.deactivate_function_calls()
+        self.run_tools = False
+
+    def _restore_tools(
+        self, tool_choice: Optional[Union[str, Dict[str, Any]]], run_tools: bool, tools_deactivated: bool
+    ) -> None:
+        """Re-enable tools deactivated by the tool round limits, unless the function call limit was also reached"""
+        if not tools_deactivated:
+            return
+        self.run_tools = run_tools
+        if len(self.function_call_stack or []) < self.function_call_limit:
+            self.tool_choice = tool_choice
+
+    def run_tool_loop(self, messages: List[Message], turn: Callable[[List[Message]], Iterator[str]]) -> Iterator[str]:
+        """Drives tool rounds iteratively until the model responds without calling tools.
+
+        `turn` generates one assistant message, appends it and the results of its tool calls to `messages`,
+        and yields the text to return. Only the messages added by each round are logged.
+        """
+        self.log_messages(messages)
+        tool_choice = self.tool_choice
+        run_tools = self.run_tools
+        tools_deactivated = False
+        tool_rounds = 0
+        tool_round_tokens = 0
+        try:
+            while True:
+                num_messages = len(messages)
+                yield from turn(messages)
+                self.log_messages(messages, start=num_messages)
+                if not self._ran_tools(messages, num_messages):
+                    return
+
+                tool_rounds += 1
+                tool_round_tokens += self._get_round_tokens(messages, num_messages)
+                if self._tool_round_limit_reached(tool_rounds, tool_round_tokens):
+                    # Stop if the final round still added messages, e.g. a tool call error
+                    if tools_deactivated:
+                        return
+                    self._deactivate_tools_for_final_round()
+                    tools_deactivated = True
+        finally:
+            self._restore_tools(tool_choice, run_tools, tools_deactivated)
+
+    async def arun_tool_loop(
+        self, messages: List[Message], turn: Callable[[List[Message]], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        """Async version of `run_tool_loop`"""
+        self.log_messages(messages)
+        tool_choice = self.tool_choice
+        run_tools = self.run_tools
+        tools_deactivated = False
+        tool_rounds = 0
+        tool_round_tokens = 0
+        try:
+            while True:
+                num_messages = len(messages)
+                async for chunk in turn(messages):
+                    yield chunk
+                self.log_messages(messages, start=num_messages)
+                if not self._ran_tools(messages, num_messages):
+                    return
+
+                tool_rounds += 1
+                tool_round_tokens += self._get_round_tokens(messages, num_messages)
+                if self._tool_round_limit_reached(tool_rounds, tool_round_tokens):
+                    if tools_deactivated:
+                        return
+                    self._deactivate_tools_for_final_round()
+                    tools_deactivated = True
+        finally:
+            self._restore_tools(tool_choice, run_tools, tools_deactivated)
+
     def get_system_prompt_from_llm(self) -> Optional[str]:
         return self.system_prompt
 
@@ -5,6 +5,7 @@ from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
 
@@ -57,7 +58,7 @@ class CohereChat(LLM):
         _client_params: Dict[str, Any] = {}
         if self.api_key:
             _client_params["api_key"] = self.api_key
-        return CohereClient(**_client_params)
+        return get_cached_client(CohereClient, _client_params, http_client_param="httpx_client")
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
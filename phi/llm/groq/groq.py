@@ -5,6 +5,7 @@ from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
 
@@ -65,7 +66,7 @@ class Groq(LLM):
             _client_params["default_query"] = self.default_query
         if self.client_params:
             _client_params.update(self.client_params)
-        return GroqClient(**_client_params)
+        return get_cached_client(GroqClient, _client_params, http_client_param="http_client")
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -163,10 +164,12 @@ class Groq(LLM):
 
     def response(self, messages: List[Message]) -> str:
         logger.debug("---------- Groq Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        final_response = "".join(self.run_tool_loop(messages=messages, turn=self._response_turn))
+        logger.debug("---------- Groq Response End ----------")
+        return final_response
 
+    def _response_turn(self, messages: List[Message]) -> Iterator[str]:
+        """Generates one assistant message and runs its tool calls, yielding the response text"""
         response_timer = Timer()
         response_timer.start()
         response = self.invoke(messages=messages)
@@ -195,63 +198,44 @@ class Groq(LLM):
         # Add token usage to metrics
         if response.usage is not None:
             self.metrics.update(response.usage.model_dump())
+            assistant_message.metrics["total_tokens"] = response.usage.total_tokens
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
-        assistant_message.log()
 
         # -*- Parse and run tool calls
-        if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0:
-            final_response = ""
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _tool_call_id = tool_call.get("id")
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(
-                        Message(role="tool", tool_call_id=_tool_call_id, content="Could not find function to call.")
-                    )
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="tool", tool_call_id=_tool_call_id, content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
+        if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
+            yield from self._run_tool_calls(assistant_message, messages)
+            return
 
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    final_response += f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    final_response += "\nRunning:"
-                    for _f in function_calls_to_run:
-                        final_response += f"\n - {_f.get_call_str()}"
-                    final_response += "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run)
-            if len(function_call_results) > 0:
-                messages.extend(function_call_results)
-            # -*- Get new response using result of tool call
-            final_response += self.response(messages=messages)
-            return final_response
-        logger.debug("---------- Groq Response End ----------")
         # -*- Return content if no function calls are present
         if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
+            yield assistant_message.get_content_string()
+        else:
+            yield "Something went wrong, please try again."
 
     def response_stream(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- Groq Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        yield from self.run_tool_loop(messages=messages, turn=self._response_stream_turn)
+        logger.debug("---------- Groq Response End ----------")
 
+    def _response_stream_turn(self, messages: List[Message]) -> Iterator[str]:
+        """Streams one assistant message and runs its tool calls"""
         assistant_message_role = None
         assistant_message_content = ""
         assistant_message_tool_calls: Optional[List[Any]] = None
+        response_usage: Optional[Any] = None
         response_timer = Timer()
         response_timer.start()
         for response in self.invoke_stream(messages=messages):
             # logger.debug(f"Groq response type: {type(response)}")
             # logger.debug(f"Groq response: {response}")
+            # Groq sends the token usage of the stream with the last chunk
+            x_groq = getattr(response, "x_groq", None)
+            if x_groq is not None and getattr(x_groq, "usage", None) is not None:
+                response_usage = x_groq.usage
+            if len(response.choices) == 0:
+                continue
             # -*- Parse response
             response_delta = response.choices[0].delta
             if assistant_message_role is None and response_delta.role is not None:
@@ -288,39 +272,40 @@ class Groq(LLM):
         if "response_times" not in self.metrics:
             self.metrics["response_times"] = []
         self.metrics["response_times"].append(response_timer.elapsed)
+        # Add token usage to metrics
+        if response_usage is not None:
+            self.metrics.update(response_usage.model_dump())
+            assistant_message.metrics["total_tokens"] = response_usage.total_tokens
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
-        assistant_message.log()
 
         # -*- Parse and run tool calls
         if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0:
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _tool_call_id = tool_call.get("id")
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(
-                        Message(role="tool", tool_call_id=_tool_call_id, content="Could not find function to call.")
-                    )
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="tool", tool_call_id=_tool_call_id, content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
+            if self.run_tools:
+                yield from self._run_tool_calls(assistant_message, messages)
+            elif assistant_message.content is None:
+                yield "Something went wrong, please try again."
 
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    yield f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    yield "\nRunning:"
-                    for _f in function_calls_to_run:
-                        yield f"\n - {_f.get_call_str()}"
-                    yield "\n\n"
+    def _run_tool_calls(self, assistant_message: Message, messages: List[Message]) -> Iterator[str]:
+        """Runs the tool calls of the assistant message and adds the tool results to messages"""
+        function_calls_to_run: List[FunctionCall] = []
+        for tool_call in assistant_message.tool_calls or []:
+            _tool_call_id = tool_call.get("id")
+            _function_call = get_function_call_for_tool_call(tool_call, self.functions)
+            if _function_call is None:
+                messages.append(
+                    Message(role="tool", tool_call_id=_tool_call_id, content="Could not find function to call.")
+                )
+                continue
+            if _function_call.error is not None:
+                messages.append(Message(role="tool", tool_call_id=_tool_call_id, content=_function_call.error))
+                continue
+            function_calls_to_run.append(_function_call)
 
-            function_call_results = self.run_function_calls(function_calls_to_run)
-            if len(function_call_results) > 0:
-                messages.extend(function_call_results)
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
-        logger.debug("---------- Groq Response End ----------")
+        if self.show_tool_calls and len(function_calls_to_run) > 0:
+            yield self.get_function_calls_str(function_calls_to_run)
+
+        function_call_results = self.run_function_calls(function_calls_to_run)
+        if len(function_call_results) > 0:
+            messages.extend(function_call_results)
@@ -88,3 +88,105 @@ class Message(BaseModel):
         """Check if the message content is valid."""
 
         return self.content is not None and len(self.content) > 0
+
+    def to_record(self) -> "MessageRecord":
+        """Returns a MessageRecord with the same fields as this message."""
+        return MessageRecord(**self.__dict__, **(self.model_extra or {}))
+
+
+class MessageRecord:
+    """Compact, unvalidated representation of a Message.
+
+    Reading thousands of messages from storage as pydantic models is dominated by validation and each model
+    carries several internal dicts. A MessageRecord only stores the message fields in __slots__ and is used
+    where stored messages are read and serialized again, e.g. when paging the chat history from storage.
+    Use `to_message()` to get a Message wherever a Message is expected.
+    """
+
+    __slots__ = (
+        "role",
+        "content",
+        "name",
+        "tool_call_id",
+        "tool_call_name",
+        "tool_call_error",
+        "tool_calls",
+        "metrics",
+        "internal_id",
+        "function_call",
+        "extra",
+    )
+
+    def __init__(
+        self,
+        role: str,
+        content: Optional[Union[List[Dict], str]] = None,
+        name: Optional[str] = None,
+        tool_call_id: Optional[str] = None,
+        tool_call_name: Optional[str] = None,
+        tool_call_error: bool = False,
+        tool_calls: Optional[List[Dict[str, Any]]] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+        internal_id: Optional[str] = None,
+        function_call: Optional[Dict[str, Any]] = None,
+        **extra: Any,
+    ):
+        self.role = role
+        self.content = content
+        self.name = name
+        self.tool_call_id = tool_call_id
+        self.tool_call_name = tool_call_name
+        self.tool_call_error = tool_call_error
+        self.tool_calls = tool_calls
+        self.metrics = metrics
+        self.internal_id = internal_id
+        self.function_call = function_call
+        # Fields that are not defined on Message, kept like Message keeps its extra fields
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MessageRecord":
+        return cls(**data)
+
+    def get_content_string(self) -> str:
+        """Returns the content as a string."""
+        if isinstance(self.content, str):
+            return self.content
+        if isinstance(self.content, list):
+            return json.dumps(self.content)
+        return ""
+
+    def model_dump(self, exclude_none: bool = False) -> Dict[str, Any]:
+        """Returns the fields as a dictionary, like Message.model_dump()"""
+        _dict: Dict[str, Any] = {
+            "role": self.role,
+            "content": self.content,
+            "name": self.name,
+            "tool_call_id": self.tool_call_id,
+            "tool_call_name": self.tool_call_name,
+            "tool_call_error": self.tool_call_error,
+            "tool_calls": self.tool_calls,
+            "metrics": self.metrics if self.metrics is not None else {},
+            "internal_id": self.internal_id,
+            "function_call": self.function_call,
+        }
+        if self.extra is not None:
+            _dict.update(self.extra)
+        if exclude_none:
+            return {k: v for k, v in _dict.items() if v is not None}
+        return _dict
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the same dictionary as Message.to_dict()"""
+        _dict = self.model_dump(exclude_none=True)
+        for key in ("metrics", "tool_call_name", "internal_id", "tool_call_error"):
+            _dict.pop(key, None)
+        if self.content is None:
+            _dict["content"] = None
+        return _dict
+
+    def to_message(self) -> Message:
+        return Message.model_validate(self.model_dump())
+
+    def __repr__(self) -> str:
+        return f"MessageRecord(role={self.role!r}, content={self.content!r})"
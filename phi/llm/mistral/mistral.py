@@ -4,6 +4,7 @@ from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
 
@@ -59,7 +60,7 @@ class Mistral(LLM):
             _client_params["timeout"] = self.timeout
         if self.client_params:
             _client_params.update(self.client_params)
-        return MistralClient(**_client_params)
+        return get_cached_client(MistralClient, _client_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
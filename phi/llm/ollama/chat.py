@@ -7,6 +7,7 @@ from phi.llm.message import Message
 from phi.llm.ollama.utils import extract_tool_calls
 from phi.tools.function import FunctionCall
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
 
@@ -46,7 +47,7 @@ class Ollama(LLM):
             _ollama_params["timeout"] = self.timeout
         if self.client_kwargs:
             _ollama_params.update(self.client_kwargs)
-        return OllamaClient(**_ollama_params)
+        return get_cached_client(OllamaClient, _ollama_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -107,10 +108,12 @@ class Ollama(LLM):
 
     def response(self, messages: List[Message]) -> str:
         logger.debug("---------- Ollama Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        final_response = "".join(self.run_tool_loop(messages=messages, turn=self._response_turn))
+        logger.debug("---------- Ollama Response End ----------")
+        return final_response
 
+    def _response_turn(self, messages: List[Message]) -> Iterator[str]:
+        """Generates one assistant message and runs its tool calls, yielding the response text"""
         response_timer = Timer()
         response_timer.start()
         response: Mapping[str, Any] = self.invoke(messages=messages)
@@ -185,77 +188,25 @@ class Ollama(LLM):
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
-        assistant_message.log()
 
         # -*- Parse and run function call
-        final_response = ""
-        if assistant_message.tool_call_error:
-            # Add error message to the messages to let the LLM know that the tool call failed
-            messages = self.add_tool_call_error_message(messages)
-
-            # -*- Yield new response using results of tool calls
-            final_response += self.response(messages=messages)
-            return final_response
-
-        elif assistant_message.tool_calls is not None and self.run_tools:
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(Message(role="user", content="Could not find function to call."))
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="user", content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    final_response += f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    final_response += "\nRunning:"
-                    for _f in function_calls_to_run:
-                        final_response += f"\n - {_f.get_call_str()}"
-                    final_response += "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run, role="user")
-
-            # This case rarely happens but it should be handled
-            if len(function_calls_to_run) != len(function_call_results):
-                return final_response + self.response(messages=messages)
-
-            # Add results of the function calls to the messages
-            elif len(function_call_results) > 0:
-                messages.extend(function_call_results)
-                # Reconfigure messages so the LLM is reminded of the original task
-                if self.add_user_message_after_tool_call:
-                    if any(item.tool_call_error for item in function_call_results):
-                        messages = self.add_tool_call_error_message(messages)
-                    else:
-                        messages = self.add_original_user_message(messages)
-
-            # Deactivate tool calls by turning off JSON mode after 1 tool call
-            if self.deactivate_tools_after_use:
-                self.deactivate_function_calls()
-
-            # -*- Yield new response using results of tool calls
-            final_response += self.response(messages=messages)
-            return final_response
-
-        logger.debug("---------- Ollama Response End ----------")
+        if self.run_tools and (assistant_message.tool_call_error or assistant_message.tool_calls is not None):
+            yield from self._run_tool_calls(assistant_message, messages)
+            return
 
         # -*- Return content if no function calls are present
         if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-
-        return "Something went wrong, please try again."
+            yield assistant_message.get_content_string()
+        else:
+            yield "Something went wrong, please try again."
 
     def response_stream(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- Ollama Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        yield from self.run_tool_loop(messages=messages, turn=self._response_stream_turn)
+        logger.debug("---------- Ollama Response End ----------")
 
+    def _response_stream_turn(self, messages: List[Message]) -> Iterator[str]:
+        """Streams one assistant message and runs its tool calls"""
         assistant_message_content = ""
         response_is_tool_call = False
         tool_call_bracket_count = 0
@@ -395,62 +346,58 @@ class Ollama(LLM):
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
-        assistant_message.log()
 
         # -*- Parse and run function call
+        if assistant_message.tool_call_error or assistant_message.tool_calls is not None:
+            if self.run_tools:
+                yield from self._run_tool_calls(assistant_message, messages)
+            else:
+                # Tool calls are not streamed, so there is no answer when they are not run
+                yield "Something went wrong, please try again."
+
+    def _run_tool_calls(self, assistant_message: Message, messages: List[Message]) -> Iterator[str]:
+        """Runs the tool calls of the assistant message and adds the results to messages.
+        If the tool calls could not be parsed, an error message is added so the LLM can try again.
+        """
         if assistant_message.tool_call_error:
             # Add error message to the messages to let the LLM know that the tool call failed
-            messages = self.add_tool_call_error_message(messages)
-
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
+            self.add_tool_call_error_message(messages)
+            return
+
+        function_calls_to_run: List[FunctionCall] = []
+        for tool_call in assistant_message.tool_calls or []:
+            _function_call = get_function_call_for_tool_call(tool_call, self.functions)
+            if _function_call is None:
+                messages.append(Message(role="user", content="Could not find function to call."))
+                continue
+            if _function_call.error is not None:
+                messages.append(Message(role="user", content=_function_call.error))
+                continue
+            function_calls_to_run.append(_function_call)
+
+        if self.show_tool_calls and len(function_calls_to_run) > 0:
+            yield self.get_function_calls_str(function_calls_to_run)
+
+        function_call_results = self.run_function_calls(function_calls_to_run, role="user")
+
+        # This case rarely happens but it should be handled
+        if len(function_calls_to_run) != len(function_call_results):
+            self.add_tool_call_error_message(messages)
+
+        # Add results of the function calls to the messages
+        elif len(function_call_results) > 0:
+            messages.extend(function_call_results)
+
+            # Reconfigure messages so the LLM is reminded of the original task
+            if self.add_user_message_after_tool_call:
+                if any(item.tool_call_error for item in function_call_results):
+                    self.add_tool_call_error_message(messages)
+                else:
+                    self.add_original_user_message(messages)
 
-        elif assistant_message.tool_calls is not None and self.run_tools:
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(Message(role="user", content="Could not find function to call."))
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="user", content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    yield f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    yield "\nRunning:"
-                    for _f in function_calls_to_run:
-                        yield f"\n - {_f.get_call_str()}"
-                    yield "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run, role="user")
-
-            # This case rarely happens but it should be handled
-            if len(function_calls_to_run) != len(function_call_results):
-                messages = self.add_tool_call_error_message(messages)
-
-            # Add results of the function calls to the messages
-            elif len(function_call_results) > 0:
-                messages.extend(function_call_results)
-
-                # Reconfigure messages so the LLM is reminded of the original task
-                if self.add_user_message_after_tool_call:
-                    if any(item.tool_call_error for item in function_call_results):
-                        messages = self.add_tool_call_error_message(messages)
-                    else:
-                        messages = self.add_original_user_message(messages)
-
-            # Deactivate tool calls by turning off JSON mode after 1 tool call
-            if self.deactivate_tools_after_use:
-                self.deactivate_function_calls()
-
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
-
-        logger.debug("---------- Ollama Response End ----------")
+        # Deactivate tool calls by turning off JSON mode after 1 tool call
+        if self.deactivate_tools_after_use:
+            self.deactivate_function_calls()
 
     def add_original_user_message(self, messages: List[Message]) -> List[Message]:
         # Add the original user message to the messages to remind the LLM of the original task
@@ -7,6 +7,7 @@ from phi.llm.message import Message
 from phi.llm.exceptions import InvalidToolCallException
 from phi.tools.function import FunctionCall
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client
 from phi.utils.timer import Timer
 from phi.utils.tools import (
     get_function_call_for_tool_call,
@@ -48,7 +49,7 @@ class OllamaTools(LLM):
             _ollama_params["timeout"] = self.timeout
         if self.client_kwargs:
             _ollama_params.update(self.client_kwargs)
-        return OllamaClient(**_ollama_params)
+        return get_cached_client(OllamaClient, _ollama_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -1,10 +1,11 @@
 import httpx
-from typing import Optional, List, Iterator, Dict, Any, Union, Tuple
+from typing import Optional, List, Iterator, AsyncIterator, Dict, Any, Union, Tuple
 
 from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
 from phi.utils.log import logger
+from phi.utils.client_cache import get_cached_client, get_cached_async_client
 from phi.utils.timer import Timer
 from phi.utils.functions import get_function_call
 from phi.utils.tools import get_function_call_for_tool_call
@@ -90,7 +91,7 @@ class OpenAIChat(LLM):
             _client_params["http_client"] = self.http_client
         if self.client_params:
             _client_params.update(self.client_params)
-        return OpenAIClient(**_client_params)
+        return get_cached_client(OpenAIClient, _client_params, http_client_param="http_client")
 
     def get_async_client(self) -> AsyncOpenAIClient:
         if self.async_client:
@@ -113,13 +114,9 @@ class OpenAIChat(LLM):
             _client_params["default_query"] = self.default_query
         if self.http_client:
             _client_params["http_client"] = self.http_client
-        else:
-            _client_params["http_client"] = httpx.AsyncClient(
-                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
-            )
         if self.client_params:
             _client_params.update(self.client_params)
-        return AsyncOpenAIClient(**_client_params)
+        return get_cached_async_client(AsyncOpenAIClient, _client_params, http_client_param="http_client")
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -280,12 +277,77 @@ class OpenAIChat(LLM):
             return _function_call_message, _function_call
         return Message(role="function", content="Function name is None."), None
 
+    def _get_function_calls_to_run(self, assistant_message: Message, messages: List[Message]) -> List[FunctionCall]:
+        """Returns the function calls for the tool calls of the assistant message.
+        Tool calls that cannot be run are answered with an error message.
+        """
+        function_calls_to_run: List[FunctionCall] = []
+        for tool_call in assistant_message.tool_calls or []:
+            _tool_call_id = tool_call.get("id")
+            _function_call = get_function_call_for_tool_call(tool_call, self.functions)
+            if _function_call is None:
+                messages.append(
+                    Message(
+                        role="tool",
+                        tool_call_id=_tool_call_id,
+                        content="Could not find function to call.",
+                    )
+                )
+                continue
+            if _function_call.error is not None:
+                messages.append(
+                    Message(
+                        role="tool",
+                        tool_call_id=_tool_call_id,
+                        content=_function_call.error,
+                    )
+                )
+                continue
+            function_calls_to_run.append(_function_call)
+        return function_calls_to_run
+
+    def _run_tool_calls(self, assistant_message: Message, messages: List[Message]) -> Iterator[str]:
+        """Runs the function call or tool calls of the assistant message and adds the results to messages"""
+        if not self.run_tools:
+            return
+        if assistant_message.function_call is not None:
+            function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
+            messages.append(function_call_message)
+            if self.show_tool_calls and function_call is not None:
+                yield f"\n - Running: {function_call.get_call_str()}\n\n"
+        elif assistant_message.tool_calls is not None:
+            function_calls_to_run = self._get_function_calls_to_run(assistant_message, messages)
+            if self.show_tool_calls and len(function_calls_to_run) > 0:
+                yield self.get_function_calls_str(function_calls_to_run)
+            function_call_results = self.run_function_calls(function_calls_to_run)
+            if len(function_call_results) > 0:
+                messages.extend(function_call_results)
+
+    async def _arun_tool_calls(self, assistant_message: Message, messages: List[Message]) -> AsyncIterator[str]:
+        """Async version of `_run_tool_calls`"""
+        if not self.run_tools:
+            return
+        if assistant_message.function_call is not None:
+            function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
+            messages.append(function_call_message)
+            if self.show_tool_calls and function_call is not None:
+                yield f"\n - Running: {function_call.get_call_str()}\n\n"
+        elif assistant_message.tool_calls is not None:
+            function_calls_to_run = self._get_function_calls_to_run(assistant_message, messages)
+            if self.show_tool_calls and len(function_calls_to_run) > 0:
+                yield self.get_function_calls_str(function_calls_to_run)
+            function_call_results = await self.arun_function_calls(function_calls_to_run)
+            if len(function_call_results) > 0:
+                messages.extend(function_call_results)
+
     def response(self, messages: List[Message]) -> str:
         logger.debug("---------- OpenAI Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        final_response = "".join(self.run_tool_loop(messages=messages, turn=self._response_turn))
+        logger.debug("---------- OpenAI Response End ----------")
+        return final_response
 
+    def _response_turn(self, messages: List[Message]) -> Iterator[str]:
+        """Generates one assistant message and runs its tool calls, yielding the response text"""
         response_timer = Timer()
         response_timer.start()
         response: ChatCompletion = self.invoke(messages=messages)
@@ -341,73 +403,26 @@ class OpenAIChat(LLM):
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
-        assistant_message.log()
 
         # -*- Parse and run function call
-        need_to_run_functions = assistant_message.function_call is not None or assistant_message.tool_calls is not None
-        if need_to_run_functions and self.run_tools:
-            if assistant_message.function_call is not None:
-                function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
-                messages.append(function_call_message)
-                # -*- Get new response using result of function call
-                final_response = ""
-                if self.show_tool_calls and function_call is not None:
-                    final_response += f"\n - Running: {function_call.get_call_str()}\n\n"
-                final_response += self.response(messages=messages)
-                return final_response
-            elif assistant_message.tool_calls is not None:
-                final_response = ""
-                function_calls_to_run: List[FunctionCall] = []
-                for tool_call in assistant_message.tool_calls:
-                    _tool_call_id = tool_call.get("id")
-                    _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                    if _function_call is None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content="Could not find function to call.",
-                            )
-                        )
-                        continue
-                    if _function_call.error is not None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content=_function_call.error,
-                            )
-                        )
-                        continue
-                    function_calls_to_run.append(_function_call)
-
-                if self.show_tool_calls:
-                    if len(function_calls_to_run) == 1:
-                        final_response += f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                    elif len(function_calls_to_run) > 1:
-                        final_response += "\nRunning:"
-                        for _f in function_calls_to_run:
-                            final_response += f"\n - {_f.get_call_str()}"
-                        final_response += "\n\n"
-
-                function_call_results = self.run_function_calls(function_calls_to_run)
-                if len(function_call_results) > 0:
-                    messages.extend(function_call_results)
-                # -*- Get new response using result of tool call
-                final_response += self.response(messages=messages)
-                return final_response
-        logger.debug("---------- OpenAI Response End ----------")
-        # -*- Return content if no function calls are present
-        if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
+        yield from self._run_tool_calls(assistant_message, messages)
+        if messages[-1] is assistant_message:
+            # -*- Return content if no function calls are present
+            if assistant_message.content is not None:
+                yield assistant_message.get_content_string()
+            else:
+                yield "Something went wrong, please try again."
 
     async def aresponse(self, messages: List[Message]) -> str:
         logger.debug("---------- OpenAI Async Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        final_response = ""
+        async for chunk in self.arun_tool_loop(messages=messages, turn=self._aresponse_turn):
+            final_response += chunk
+        logger.debug("---------- OpenAI Async Response End ----------")
+        return final_response
 
+    async def _aresponse_turn(self, messages: List[Message]) -> AsyncIterator[str]:
+        """Async version of `_response_turn`"""
         response_timer = Timer()
         response_timer.start()
         response: ChatCompletion = await self.ainvoke(messages=messages)
@@ -466,66 +481,16 @@ class OpenAIChat(LLM):
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
-        assistant_message.log()
 
         # -*- Parse and run function call
-        need_to_run_functions = assistant_message.function_call is not None or assistant_message.tool_calls is not None
-        if need_to_run_functions and self.run_tools:
-            if assistant_message.function_call is not None:
-                function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
-                messages.append(function_call_message)
-                # -*- Get new response using result of function call
-                final_response = ""
-                if self.show_tool_calls and function_call is not None:
-                    final_response += f"\n - Running: {function_call.get_call_str()}\n\n"
-                final_response += self.response(messages=messages)
-                return final_response
-            elif assistant_message.tool_calls is not None:
-                final_response = ""
-                function_calls_to_run: List[FunctionCall] = []
-                for tool_call in assistant_message.tool_calls:
-                    _tool_call_id = tool_call.get("id")
-                    _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                    if _function_call is None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content="Could not find function to call.",
-                            )
-                        )
-                        continue
-                    if _function_call.error is not None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content=_function_call.error,
-                            )
-                        )
-                        continue
-                    function_calls_to_run.append(_function_call)
-
-                if self.show_tool_calls:
-                    if len(function_calls_to_run) == 1:
-                        final_response += f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                    elif len(function_calls_to_run) > 1:
-                        final_response += "\nRunning:"
-                        for _f in function_calls_to_run:
-                            final_response += f"\n - {_f.get_call_str()}"
-                        final_response += "\n\n"
-
-                function_call_results = self.run_function_calls(function_calls_to_run)
-                if len(function_call_results) > 0:
-                    messages.extend(function_call_results)
-                # -*- Get new response using result of tool call
-                final_response += await self.aresponse(messages=messages)
-                return final_response
-        logger.debug("---------- OpenAI Async Response End ----------")
-        # -*- Return content if no function calls are present
-        if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
+        async for chunk in self._arun_tool_calls(assistant_message, messages):
+            yield chunk
+        if messages[-1] is assistant_message:
+            # -*- Return content if no function calls are present
+            if assistant_message.content is not None:
+                yield assistant_message.get_content_string()
+            else:
+                yield "Something went wrong, please try again."
 
     def generate(self, messages: List[Message]) -> Dict:
         logger.debug("---------- OpenAI Response Start ----------")
@@ -600,10 +565,11 @@ class OpenAIChat(LLM):
 
     def response_stream(self, messages: List[Message]) -> Iterator[str]:
         logger.debug("---------- OpenAI Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        yield from self.run_tool_loop(messages=messages, turn=self._response_stream_turn)
+        logger.debug("---------- OpenAI Response End ----------")
 
+    def _response_stream_turn(self, messages: List[Message]) -> Iterator[str]:
+        """Streams one assistant message and runs its tool calls"""
         assistant_message_content = ""
         assistant_message_function_name = ""
         assistant_message_function_arguments_str = ""
@@ -769,70 +735,18 @@ class OpenAIChat(LLM):
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
-        assistant_message.log()
 
         # -*- Parse and run function call
-        need_to_run_functions = assistant_message.function_call is not None or assistant_message.tool_calls is not None
-        if need_to_run_functions and self.run_tools:
-            if assistant_message.function_call is not None:
-                function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
-                messages.append(function_call_message)
-                if self.show_tool_calls and function_call is not None:
-                    yield f"\n - Running: {function_call.get_call_str()}\n\n"
-                # -*- Yield new response using result of function call
-                yield from self.response_stream(messages=messages)
-            elif assistant_message.tool_calls is not None:
-                function_calls_to_run: List[FunctionCall] = []
-                for tool_call in assistant_message.tool_calls:
-                    _tool_call_id = tool_call.get("id")
-                    _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                    if _function_call is None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content="Could not find function to call.",
-                            )
-                        )
-                        continue
-                    if _function_call.error is not None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content=_function_call.error,
-                            )
-                        )
-                        continue
-                    function_calls_to_run.append(_function_call)
-
-                if self.show_tool_calls:
-                    if len(function_calls_to_run) == 1:
-                        yield f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                    elif len(function_calls_to_run) > 1:
-                        yield "\nRunning:"
-                        for _f in function_calls_to_run:
-                            yield f"\n - {_f.get_call_str()}"
-                        yield "\n\n"
-
-                function_call_results = self.run_function_calls(function_calls_to_run)
-                if len(function_call_results) > 0:
-                    messages.extend(function_call_results)
-                    # Code to show function call results
-                    # for f in function_call_results:
-                    #     yield "\n"
-                    #     yield f.get_content_string()
-                    #     yield "\n"
-                # -*- Yield new response using results of tool calls
-                yield from self.response_stream(messages=messages)
-        logger.debug("---------- OpenAI Response End ----------")
+        yield from self._run_tool_calls(assistant_message, messages)
 
     async def aresponse_stream(self, messages: List[Message]) -> Any:
         logger.debug("---------- OpenAI Async Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        async for chunk in self.arun_tool_loop(messages=messages, turn=self._aresponse_stream_turn):
+            yield chunk
+        logger.debug("---------- OpenAI Async Response End ----------")
 
+    async def _aresponse_stream_turn(self, messages: List[Message]) -> AsyncIterator[str]:
+        """Async version of `_response_stream_turn`"""
         assistant_message_content = ""
         assistant_message_function_name = ""
         assistant_message_function_arguments_str = ""
@@ -962,69 +876,10 @@ class OpenAIChat(LLM):
 
         # -*- Add assistant message to messages
         messages.append(assistant_message)
-        assistant_message.log()
 
         # -*- Parse and run function call
-        need_to_run_functions = assistant_message.function_call is not None or assistant_message.tool_calls is not None
-        if need_to_run_functions and self.run_tools:
-            if assistant_message.function_call is not None:
-                function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
-                messages.append(function_call_message)
-                if self.show_tool_calls and function_call is not None:
-                    yield f"\n - Running: {function_call.get_call_str()}\n\n"
-                # -*- Yield new response using result of function call
-                fc_stream = self.aresponse_stream(messages=messages)
-                async for fc in fc_stream:
-                    yield fc
-                # yield from self.response_stream(messages=messages)
-            elif assistant_message.tool_calls is not None:
-                function_calls_to_run: List[FunctionCall] = []
-                for tool_call in assistant_message.tool_calls:
-                    _tool_call_id = tool_call.get("id")
-                    _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                    if _function_call is None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content="Could not find function to call.",
-                            )
-                        )
-                        continue
-                    if _function_call.error is not None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content=_function_call.error,
-                            )
-                        )
-                        continue
-                    function_calls_to_run.append(_function_call)
-
-                if self.show_tool_calls:
-                    if len(function_calls_to_run) == 1:
-                        yield f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                    elif len(function_calls_to_run) > 1:
-                        yield "\nRunning:"
-                        for _f in function_calls_to_run:
-                            yield f"\n - {_f.get_call_str()}"
-                        yield "\n\n"
-
-                function_call_results = self.run_function_calls(function_calls_to_run)
-                if len(function_call_results) > 0:
-                    messages.extend(function_call_results)
-                    # Code to show function call results
-                    # for f in function_call_results:
-                    #     yield "\n"
-                    #     yield f.get_content_string()
-                    #     yield "\n"
-                # -*- Yield new response using results of tool calls
-                fc_stream = self.aresponse_stream(messages=messages)
-                async for fc in fc_stream:
-                    yield fc
-                # yield from self.response_stream(messages=messages)
-        logger.debug("---------- OpenAI Async Response End ----------")
+        async for chunk in self._arun_tool_calls(assistant_message, messages):
+            yield chunk
 
     def generate_stream(self, messages: List[Message]) -> Iterator[Dict]:
         logger.debug("---------- OpenAI Response Start ----------")
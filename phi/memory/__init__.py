@@ -1,3 +1,4 @@
 from phi.memory.assistant import AssistantMemory
 from phi.memory.memory import Memory
 from phi.memory.row import MemoryRow
+from phi.memory.context import ContextWindow, ContextWindowResult
@@ -1,9 +1,9 @@
 from enum import Enum
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Set, Tuple, Union
 
 from pydantic import BaseModel, ConfigDict
 
-from phi.llm.message import Message
+from phi.llm.message import Message, MessageRecord
 from phi.llm.references import References
 from phi.memory.db import MemoryDb
 from phi.memory.memory import Memory
@@ -21,9 +21,10 @@ class MemoryRetrieval(str, Enum):
 class AssistantMemory(BaseModel):
     # Messages between the user and the Assistant.
     # Note: the llm prompts are stored in the llm_messages
-    chat_history: List[Message] = []
+    # Messages loaded from storage are kept as a MessageRecord until a Message is needed, see get_last_n_messages()
+    chat_history: List[Union[Message, MessageRecord]] = []
     # Prompts sent to the LLM and the LLM responses.
-    llm_messages: List[Message] = []
+    llm_messages: List[Union[Message, MessageRecord]] = []
     # References from the vector database.
     references: List[References] = []
 
@@ -39,10 +40,17 @@ class AssistantMemory(BaseModel):
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    def to_dict(self) -> Dict[str, Any]:
-        _memory_dict = self.model_dump(
-            exclude_none=True, exclude={"db", "updating", "memories", "classifier", "manager"}
-        )
+    def to_dict(self, exclude: Optional[Set[str]] = None) -> Dict[str, Any]:
+        _exclude = {"db", "updating", "memories", "classifier", "manager"}
+        if exclude is not None:
+            _exclude.update(exclude)
+        # MessageRecords are not pydantic models, so the message lists are dumped here
+        _memory_dict: Dict[str, Any] = {}
+        if "chat_history" not in _exclude:
+            _memory_dict["chat_history"] = self.get_chat_history()
+        if "llm_messages" not in _exclude:
+            _memory_dict["llm_messages"] = self.get_llm_messages()
+        _memory_dict.update(self.model_dump(exclude_none=True, exclude=_exclude | {"chat_history", "llm_messages"}))
         if self.memories:
             _memory_dict["memories"] = [memory.to_dict() for memory in self.memories]
         return _memory_dict
@@ -81,7 +89,16 @@ class AssistantMemory(BaseModel):
             If None, returns all messages.
         :return: A list of Messages in the chat_history.
         """
-        return self.chat_history[-last_n:] if last_n else self.chat_history
+        start = max(len(self.chat_history) - last_n, 0) if last_n else 0
+        messages: List[Message] = []
+        for i in range(start, len(self.chat_history)):
+            message = self.chat_history[i]
+            # Messages loaded from storage are converted once, when they are sent to the LLM
+            if isinstance(message, MessageRecord):
+                message = message.to_message()
+                self.chat_history[i] = message
+            messages.append(message)
+        return messages
 
     def get_llm_messages(self) -> List[Dict[str, Any]]:
         """Returns the llm_messages as a list of dictionaries."""
@@ -101,14 +118,19 @@ class AssistantMemory(BaseModel):
             history += f"{message.role.upper()}: {message.content}\n"
         return history
 
-    def get_chats(self) -> List[Tuple[Message, Message]]:
-        """Returns a list of tuples of user messages and LLM responses."""
+    def get_chats(
+        self, chat_history: Optional[Sequence[Union[Message, MessageRecord]]] = None
+    ) -> List[Tuple[Union[Message, MessageRecord], Union[Message, MessageRecord]]]:
+        """Returns a list of tuples of user messages and LLM responses.
 
-        all_chats: List[Tuple[Message, Message]] = []
-        current_chat: List[Message] = []
+        :param chat_history: The messages to get the chats from. If None, the chat_history is used.
+        """
+
+        all_chats: List[Tuple[Union[Message, MessageRecord], Union[Message, MessageRecord]]] = []
+        current_chat: List[Any] = []
 
         # Make a copy of the chat_history and remove all system messages from the beginning.
-        chat_history = self.chat_history.copy()
+        chat_history = list(self.chat_history if chat_history is None else chat_history)
         while len(chat_history) > 0 and chat_history[0].role in ("system", "assistant"):
             chat_history = chat_history[1:]
 
@@ -128,11 +150,16 @@ class AssistantMemory(BaseModel):
             all_chats.append((current_chat[0], current_chat[1]))
         return all_chats
 
-    def get_tool_calls(self, num_calls: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Returns a list of tool calls from the llm_messages."""
+    def get_tool_calls(
+        self, num_calls: Optional[int] = None, llm_messages: Optional[Sequence[Union[Message, MessageRecord]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Returns a list of tool calls from the llm_messages.
+
+        :param llm_messages: The messages to get the tool calls from. If None, the llm_messages are used.
+        """
 
         tool_calls = []
-        for llm_message in self.llm_messages[::-1]:
+        for llm_message in (self.llm_messages if llm_messages is None else llm_messages)[::-1]:
             if llm_message.tool_calls:
                 for tool_call in llm_message.tool_calls:
                     tool_calls.append(tool_call)
@@ -0,0 +1,289 @@
+import json
+from typing import Any, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, ConfigDict
+
+from phi.document import Document
+from phi.llm.base import LLM
+from phi.llm.message import Message
+from phi.utils.log import logger
+from phi.utils.run_async import run_in_thread
+
+
+class ContextWindowResult(BaseModel):
+    """The chat history and references that fit in the context window"""
+
+    # Chat history messages to send to the LLM, oldest first
+    history: List[Message] = []
+    # Documents to add as references, in the order returned by the knowledge base
+    documents: List[Document] = []
+    # References string (when references are provided as a string instead of documents)
+    references: Optional[str] = None
+    # Summary of the chat history messages that did not fit
+    summary: Optional[Message] = None
+    # Number of chat history messages that did not fit
+    num_evicted: int = 0
+    # Number of tokens used by the fixed messages, history, summary and references
+    num_tokens: int = 0
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class ContextWindow(BaseModel):
+    """Fit the chat history and references sent to the LLM within a token budget.
+
+    The budget is filled in order of priority:
+        1. The fixed messages: system prompt, additional messages and the user message
+        2. The last `num_recent_messages` messages of the chat history
+        3. References from the knowledge base
+        4. Older messages of the chat history, newest first
+    Messages that do not fit are dropped, or summarized if `summarize_evicted` is True.
+    """
+
+    # Maximum number of tokens in the messages sent to the LLM.
+    # Leave room for the response, i.e. set this to the model context length minus max_tokens.
+    max_tokens: int = 8000
+    # Number of chat history messages that are considered before references
+    num_recent_messages: int = 2
+    # Maximum number of chat history messages to consider. If None, all messages in the chat history are considered
+    num_history_messages: Optional[int] = None
+    # Number of documents to fetch from the knowledge base. If None, the knowledge base default is used
+    num_documents: Optional[int] = None
+
+    # Tokenizer used to count tokens, requires `tiktoken`.
+    # If `tiktoken` is not installed, tokens are estimated as 1 token per `chars_per_token` characters.
+    encoding_name: str = "cl100k_base"
+    chars_per_token: int = 4
+    # Tokens added for each message on top of its content
+    tokens_per_message: int = 4
+
+    # If True, the evicted chat history messages are summarized using the `llm`
+    summarize_evicted: bool = False
+    # LLM used to summarize evicted messages
+    llm: Optional[LLM] = None
+    # Maximum number of tokens in the summary
+    summary_max_tokens: int = 256
+
+    # tiktoken encoding, False if tiktoken is not installed
+    _encoding: Optional[Any] = None
+    # Evicted messages covered by the last summary and the summary itself
+    _summary_key: Tuple[Tuple[str, str], ...] = ()
+    _summary: Optional[str] = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def encoding(self) -> Optional[Any]:
+        if self._encoding is None:
+            try:
+                import tiktoken
+
+                self._encoding = tiktoken.get_encoding(self.encoding_name)
+            except ImportError:
+                logger.warning(
+                    "`tiktoken` not installed, estimating token counts. Please install using `pip install tiktoken`"
+                )
+                self._encoding = False
+        return self._encoding or None
+
+    def count_tokens(self, text: Optional[str]) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // self.chars_per_token)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Truncate the text to at most max_tokens tokens"""
+        if max_tokens <= 0:
+            return ""
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            return text if len(tokens) <= max_tokens else self.encoding.decode(tokens[:max_tokens])
+        return text[: max_tokens * self.chars_per_token]
+
+    def count_message_tokens(self, message: Message) -> int:
+        num_tokens = self.tokens_per_message + self.count_tokens(message.get_content_string())
+        if message.tool_calls is not None:
+            num_tokens += self.count_tokens(json.dumps(message.tool_calls))
+        return num_tokens
+
+    def count_messages_tokens(self, messages: List[Message]) -> int:
+        return sum(self.count_message_tokens(m) for m in messages)
+
+    def count_document_tokens(self, document: Document) -> int:
+        return self.count_tokens(json.dumps([document.to_dict()], indent=2))
+
+    def fit_messages(self, messages: List[Message], max_tokens: int) -> Tuple[List[Message], int]:
+        """Return the newest messages that fit in max_tokens, oldest first, and the tokens they use.
+        Stops at the first message that does not fit so the conversation has no gaps.
+        """
+        num_tokens = 0
+        start = len(messages)
+        for message in reversed(messages):
+            message_tokens = self.count_message_tokens(message)
+            if num_tokens + message_tokens > max_tokens:
+                break
+            num_tokens += message_tokens
+            start -= 1
+        return messages[start:], num_tokens
+
+    def fit(
+        self,
+        messages: List[Message],
+        history: Optional[List[Message]] = None,
+        references: Optional[Union[str, List[Document]]] = None,
+    ) -> ContextWindowResult:
+        """Select the chat history and references that fit in the context window.
+
+        :param messages: The messages that are always sent: system prompt, additional messages and the user message.
+        :param history: The chat history, oldest first.
+        :param references: The documents from the knowledge base, or a references string.
+        """
+        result, evicted = self._fit(messages=messages, history=history, references=references)
+        if evicted is not None:
+            self._add_summary(result, self.summarize(evicted))
+        return result
+
+    async def afit(
+        self,
+        messages: List[Message],
+        history: Optional[List[Message]] = None,
+        references: Optional[Union[str, List[Document]]] = None,
+    ) -> ContextWindowResult:
+        """Async version of `fit`, evicted messages are summarized using `asummarize`"""
+        result, evicted = self._fit(messages=messages, history=history, references=references)
+        if evicted is not None:
+            self._add_summary(result, await self.asummarize(evicted))
+        return result
+
+    def _add_summary(self, result: ContextWindowResult, summary: Optional[Message]) -> None:
+        result.summary = summary
+        if summary is not None:
+            result.num_tokens += self.count_message_tokens(summary)
+
+    def _fit(
+        self,
+        messages: List[Message],
+        history: Optional[List[Message]] = None,
+        references: Optional[Union[str, List[Document]]] = None,
+    ) -> Tuple[ContextWindowResult, Optional[List[Message]]]:
+        """Returns the messages and references that fit, and the evicted messages to summarize"""
+        history = history or []
+        if self.num_history_messages is not None:
+            history = history[-self.num_history_messages :] if self.num_history_messages > 0 else []
+
+        num_tokens = self.count_messages_tokens(messages)
+        if num_tokens > self.max_tokens:
+            logger.warning(f"Messages use {num_tokens} tokens, more than the context window of {self.max_tokens}")
+
+        # Recent chat history
+        split = max(len(history) - self.num_recent_messages, 0)
+        recent, recent_tokens = self.fit_messages(history[split:], self.max_tokens - num_tokens)
+        num_tokens += recent_tokens
+        # Older messages are only added if all recent messages fit, so the conversation has no gaps
+        candidates = history[:split] if len(recent) == len(history) - split else []
+
+        # References
+        result = ContextWindowResult()
+        if isinstance(references, str):
+            result.references = self.truncate(references, self.max_tokens - num_tokens) or None
+            num_tokens += self.count_tokens(result.references)
+        elif references:
+            for document in references:
+                document_tokens = self.count_document_tokens(document)
+                if num_tokens + document_tokens > self.max_tokens:
+                    continue
+                result.documents.append(document)
+                num_tokens += document_tokens
+
+        # Older chat history
+        older_budget = self.max_tokens - num_tokens
+        older, older_tokens = self.fit_messages(candidates, older_budget)
+        summarize = self.summarize_evicted and len(older) + len(recent) < len(history)
+        if summarize:
+            # Keep room for the summary of the evicted messages
+            older_budget -= self.count_message_tokens(self._get_summary_message("")) + self.summary_max_tokens
+            older, older_tokens = self.fit_messages(candidates, older_budget)
+        num_tokens += older_tokens
+
+        result.history = older + recent
+        result.num_evicted = len(history) - len(result.history)
+        result.num_tokens = num_tokens
+        evicted: Optional[List[Message]] = None
+        if result.num_evicted > 0:
+            logger.debug(f"Evicted {result.num_evicted} chat history messages from the context window")
+            if summarize and older_budget >= 0:
+                evicted = history[: result.num_evicted]
+        return result, evicted
+
+    def get_summary_messages(self, evicted: List[Message], summary: Optional[str]) -> List[Message]:
+        conversation = "\n".join(f"{m.role.upper()}: {m.get_content_string()}" for m in evicted)
+        system_prompt = (
+            "Summarize the conversation below in a few sentences so it can be used as context for the rest of the "
+            "conversation. Keep names, facts, decisions and open questions. Only respond with the summary."
+        )
+        if summary is not None:
+            system_prompt += f"\nExtend this summary of the conversation before it:\n{summary}"
+        return [Message(role="system", content=system_prompt), Message(role="user", content=conversation)]
+
+    def summarize(self, evicted: List[Message]) -> Optional[Message]:
+        """Summarize the evicted messages. The previous summary is extended when the evicted messages grow."""
+        if len(evicted) == 0:
+            return None
+        if self.llm is None:
+            logger.warning("Provide an `llm` to summarize evicted messages")
+            return None
+
+        key, messages = self._get_summary_request(evicted)
+        if messages is not None:
+            try:
+                summary = self.llm.response(messages=messages)
+            except Exception as e:
+                logger.warning(f"Could not summarize evicted messages: {e}")
+                return None
+            self._set_summary(key, summary)
+        return self._get_summary_message(self._summary) if self._summary else None
+
+    async def asummarize(self, evicted: List[Message]) -> Optional[Message]:
+        """Async version of `summarize`. LLMs without `aresponse` are called in a thread."""
+        if len(evicted) == 0:
+            return None
+        if self.llm is None:
+            logger.warning("Provide an `llm` to summarize evicted messages")
+            return None
+
+        key, messages = self._get_summary_request(evicted)
+        if messages is not None:
+            try:
+                try:
+                    summary = await self.llm.aresponse(messages=messages)
+                except NotImplementedError:
+                    summary = await run_in_thread(self.llm.response, messages=messages)
+            except Exception as e:
+                logger.warning(f"Could not summarize evicted messages: {e}")
+                return None
+            self._set_summary(key, summary)
+        return self._get_summary_message(self._summary) if self._summary else None
+
+    def _get_summary_request(
+        self, evicted: List[Message]
+    ) -> Tuple[Tuple[Tuple[str, str], ...], Optional[List[Message]]]:
+        """Returns the key of the evicted messages and the messages to send to the llm,
+        or None if the last summary already covers the evicted messages.
+        """
+        key = tuple((m.role, m.get_content_string()) for m in evicted)
+        if key == self._summary_key:
+            return key, None
+        # Only summarize the messages evicted since the last summary
+        previous = self._summary_key
+        if self._summary is not None and key[: len(previous)] == previous:
+            return key, self.get_summary_messages(evicted[len(previous) :], self._summary)
+        return key, self.get_summary_messages(evicted, None)
+
+    def _set_summary(self, key: Tuple[Tuple[str, str], ...], summary: str) -> None:
+        self._summary = self.truncate(summary, self.summary_max_tokens)
+        self._summary_key = key
+
+    def _get_summary_message(self, summary: str) -> Message:
+        return Message(role="system", content=f"Summary of the earlier conversation:\n{summary}")
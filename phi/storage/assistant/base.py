@@ -1,10 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Tuple
 
 from phi.assistant.run import AssistantRun
+from phi.utils.run_async import run_in_thread
 
 
 class AssistantStorage(ABC):
+    # If True, the memory lists (chat_history, llm_messages, references) are stored as rows of a separate
+    # messages table and only new items are written on each run, instead of rewriting the memory column.
+    append_only: bool = False
+
     @abstractmethod
     def create(self) -> None:
         raise NotImplementedError
@@ -14,17 +19,84 @@ class AssistantStorage(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_all_run_ids(self, user_id: Optional[str] = None) -> List[str]:
+    def get_all_run_ids(
+        self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: Optional[int] = None
+    ) -> List[str]:
         raise NotImplementedError
 
     @abstractmethod
     def get_all_runs(self, user_id: Optional[str] = None) -> List[AssistantRun]:
         raise NotImplementedError
 
+    def list_runs(
+        self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: Optional[int] = None
+    ) -> List[AssistantRun]:
+        """List runs, newest first, with only the run_id, name, run_name, user_id and timestamps set.
+
+        Storages override this to select only these columns instead of loading every run.
+        """
+        runs = self.get_all_runs(user_id=user_id)
+        start = offset or 0
+        end = start + limit if limit is not None else None
+        return [
+            AssistantRun(
+                run_id=run.run_id,
+                name=run.name,
+                run_name=run.run_name,
+                user_id=run.user_id,
+                created_at=run.created_at,
+                updated_at=run.updated_at,
+            )
+            for run in runs[start:end]
+        ]
+
     @abstractmethod
     def upsert(self, row: AssistantRun) -> Optional[AssistantRun]:
         raise NotImplementedError
 
+    def append(self, row: AssistantRun, memory: Dict[str, List[Dict[str, Any]]], start: Dict[str, int]) -> None:
+        """Upsert the run without reading it back and write the memory items of an append_only storage.
+
+        :param row: The run to upsert. Its memory should not contain the lists stored in the messages table.
+        :param memory: The new items for each memory list.
+        :param start: The position of the first new item for each memory list.
+            Items already stored at or after this position are replaced.
+        """
+        raise NotImplementedError
+
+    def read_memory(
+        self, run_id: str, last_n: Optional[int] = None
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, int]]:
+        """Read the memory lists of an append_only storage.
+
+        :param run_id: The run to read the memory for.
+        :param last_n: Only read the last n items of each memory list. If None, all items are read.
+        :return: The items read for each memory list and the total number of items stored for each memory list.
+        """
+        raise NotImplementedError
+
+    def read_memory_items(self, run_id: str, memory_key: str, start: int, end: int) -> List[Dict[str, Any]]:
+        """Read the items of a memory list of an append_only storage at positions start to end (exclusive)."""
+        raise NotImplementedError
+
+    async def aread(self, run_id: str) -> Optional[AssistantRun]:
+        """Async version of `read`. Runs `read` in a thread unless the storage has an async implementation."""
+        return await run_in_thread(self.read, run_id=run_id)
+
+    async def aupsert(self, row: AssistantRun) -> Optional[AssistantRun]:
+        """Async version of `upsert`. Runs `upsert` in a thread unless the storage has an async implementation."""
+        return await run_in_thread(self.upsert, row=row)
+
+    async def aappend(self, row: AssistantRun, memory: Dict[str, List[Dict[str, Any]]], start: Dict[str, int]) -> None:
+        """Async version of `append`. Runs `append` in a thread unless the storage has an async implementation."""
+        await run_in_thread(self.append, row=row, memory=memory, start=start)
+
+    async def aread_memory(
+        self, run_id: str, last_n: Optional[int] = None
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, int]]:
+        """Async version of `read_memory`. Runs `read_memory` in a thread unless overridden."""
+        return await run_in_thread(self.read_memory, run_id=run_id, last_n=last_n)
+
     @abstractmethod
     def delete(self) -> None:
         raise NotImplementedError
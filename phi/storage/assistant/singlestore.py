@@ -1,4 +1,4 @@
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Dict, Tuple, TYPE_CHECKING
 import json
 
 try:
@@ -8,14 +8,18 @@ try:
     from sqlalchemy.inspection import inspect
     from sqlalchemy.orm import Session, sessionmaker
     from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import text, select
-    from sqlalchemy.types import DateTime
+    from sqlalchemy.sql.expression import text, select, delete, insert, func
+    from sqlalchemy.types import DateTime, Integer
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
 
 from phi.assistant.run import AssistantRun
 from phi.storage.assistant.base import AssistantStorage
 from phi.utils.log import logger
+from phi.utils.run_async import run_in_thread
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
 
 class S2AssistantStorage(AssistantStorage):
@@ -25,6 +29,13 @@ class S2AssistantStorage(AssistantStorage):
         schema: Optional[str] = "ai",
         db_url: Optional[str] = None,
         db_engine: Optional[Engine] = None,
+        append_only: bool = False,
+        async_db_engine: Optional["AsyncEngine"] = None,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+        pool_recycle: Optional[int] = None,
+        pool_pre_ping: Optional[bool] = None,
     ):
         """
         This class provides assistant storage using a singlestore table.
@@ -37,10 +48,31 @@ class S2AssistantStorage(AssistantStorage):
         :param schema: The schema to store the table in.
         :param db_url: The database URL to connect to.
         :param db_engine: The database engine to use.
+        :param append_only: Store the memory lists in a `{table_name}_messages` table and only write new items.
+        :param async_db_engine: The async database engine used by the async methods.
+            If not provided, it is created from the db_engine url using the aiomysql driver.
+        :param pool_size: The number of connections to keep open in the pool of the engines created by this class.
+        :param max_overflow: The number of connections that can be opened beyond the pool_size.
+        :param pool_timeout: The number of seconds to wait for a connection from the pool.
+        :param pool_recycle: Replace connections that have been open for this many seconds.
+        :param pool_pre_ping: Test connections before using them.
         """
+        # Connection pool settings for the engines created by this class
+        self.pool_kwargs: Dict[str, Any] = {
+            k: v
+            for k, v in {
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": pool_timeout,
+                "pool_recycle": pool_recycle,
+                "pool_pre_ping": pool_pre_ping,
+            }.items()
+            if v is not None
+        }
+
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
-            _engine = create_engine(db_url, connect_args={"charset": "utf8mb4"})
+            _engine = create_engine(db_url, connect_args={"charset": "utf8mb4"}, **self.pool_kwargs)
 
         if _engine is None:
             raise ValueError("Must provide either db_url or db_engine")
@@ -50,6 +82,7 @@ class S2AssistantStorage(AssistantStorage):
         self.schema: Optional[str] = schema
         self.db_url: Optional[str] = db_url
         self.db_engine: Engine = _engine
+        self._async_db_engine: Optional["AsyncEngine"] = async_db_engine
         self.metadata: MetaData = MetaData(schema=self.schema)
 
         # Database session
@@ -57,6 +90,25 @@ class S2AssistantStorage(AssistantStorage):
 
         # Database table for storage
         self.table: Table = self.get_table()
+        # Database table for the memory lists of append_only storage
+        self.append_only: bool = append_only
+        self.messages_table: Table = self.get_messages_table()
+
+    @property
+    def async_db_engine(self) -> Optional["AsyncEngine"]:
+        if self._async_db_engine is None and self.db_engine.url.drivername in ("mysql", "mysql+pymysql"):
+            try:
+                from sqlalchemy.ext.asyncio import create_async_engine
+
+                self._async_db_engine = create_async_engine(
+                    self.db_engine.url.set(drivername="mysql+aiomysql"),
+                    connect_args={"charset": "utf8mb4"},
+                    **self.pool_kwargs,
+                )
+            except ImportError:
+                logger.debug("`sqlalchemy[asyncio]` or `aiomysql` not installed, async methods will run in a thread")
+                return None
+        return self._async_db_engine
 
     def get_table(self) -> Table:
         return Table(
@@ -89,6 +141,23 @@ class S2AssistantStorage(AssistantStorage):
             extend_existing=True,
         )
 
+    def get_messages_table(self) -> Table:
+        return Table(
+            f"{self.table_name}_messages",
+            self.metadata,
+            # ID of the run this item belongs to
+            Column("run_id", mysql.TEXT, primary_key=True),
+            # Memory list this item belongs to: chat_history, llm_messages or references
+            Column("memory_key", mysql.TEXT, primary_key=True),
+            # Position of this item in the memory list
+            Column("sequence", Integer, primary_key=True),
+            # The item
+            Column("content", mysql.JSON),
+            # The timestamp of when this item was created.
+            Column("created_at", DateTime(timezone=True), server_default=text("now()")),
+            extend_existing=True,
+        )
+
     def table_exists(self) -> bool:
         logger.debug(f"Checking if table exists: {self.table.name}")
         try:
@@ -101,6 +170,8 @@ class S2AssistantStorage(AssistantStorage):
         if not self.table_exists():
             logger.info(f"\nCreating table: {self.table_name}\n")
             self.table.create(self.db_engine)
+        if self.append_only:
+            self.messages_table.create(self.db_engine, checkfirst=True)
 
     def _read(self, session: Session, run_id: str) -> Optional[Row[Any]]:
         stmt = select(self.table).where(self.table.c.run_id == run_id)
@@ -117,16 +188,23 @@ class S2AssistantStorage(AssistantStorage):
             existing_row: Optional[Row[Any]] = self._read(session=sess, run_id=run_id)
             return AssistantRun.model_validate(existing_row) if existing_row is not None else None
 
-    def get_all_run_ids(self, user_id: Optional[str] = None) -> List[str]:
+    def get_all_run_ids(
+        self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: Optional[int] = None
+    ) -> List[str]:
         run_ids: List[str] = []
         try:
             with self.Session.begin() as sess:
-                # get all run_ids for this user
+                # get the run_ids for this user, selecting only the run_id column
                 stmt = select(self.table.c.run_id)
                 if user_id is not None:
                     stmt = stmt.where(self.table.c.user_id == user_id)
                 # order by created_at desc
                 stmt = stmt.order_by(self.table.c.created_at.desc())
+                # paginate
+                if limit is not None:
+                    stmt = stmt.limit(limit)
+                if offset is not None:
+                    stmt = stmt.offset(offset)
                 # execute query
                 rows = sess.execute(stmt).fetchall()
                 for row in rows:
@@ -155,81 +233,263 @@ class S2AssistantStorage(AssistantStorage):
             logger.debug(f"Table does not exist: {self.table.name}")
         return runs
 
+    def list_runs(
+        self, user_id: Optional[str] = None, limit: Optional[int] = None, offset: Optional[int] = None
+    ) -> List[AssistantRun]:
+        runs: List[AssistantRun] = []
+        try:
+            with self.Session.begin() as sess:
+                # get the runs for this user, selecting only the columns needed to list them
+                stmt = select(
+                    self.table.c.run_id,
+                    self.table.c.name,
+                    self.table.c.run_name,
+                    self.table.c.user_id,
+                    self.table.c.created_at,
+                    self.table.c.updated_at,
+                )
+                if user_id is not None:
+                    stmt = stmt.where(self.table.c.user_id == user_id)
+                # order by created_at desc
+                stmt = stmt.order_by(self.table.c.created_at.desc())
+                # paginate
+                if limit is not None:
+                    stmt = stmt.limit(limit)
+                if offset is not None:
+                    stmt = stmt.offset(offset)
+                # execute query
+                rows = sess.execute(stmt).fetchall()
+                for row in rows:
+                    if row.run_id is not None:
+                        runs.append(AssistantRun.model_validate(row))
+        except Exception:
+            logger.debug(f"Table does not exist: {self.table.name}")
+        return runs
+
+    def _get_upsert_statement(self) -> Any:
+        # Create an insert statement using SingleStore's ON DUPLICATE KEY UPDATE syntax
+        return text(
+            f"""
+        INSERT INTO {self.schema}.{self.table_name}
+        (run_id, name, run_name, user_id, llm, memory, assistant_data, run_data, user_data, task_data)
+        VALUES
+        (:run_id, :name, :run_name, :user_id, :llm, :memory, :assistant_data, :run_data, :user_data, :task_data)
+        ON DUPLICATE KEY UPDATE
+            name = VALUES(name),
+            run_name = VALUES(run_name),
+            user_id = VALUES(user_id),
+            llm = VALUES(llm),
+            memory = VALUES(memory),
+            assistant_data = VALUES(assistant_data),
+            run_data = VALUES(run_data),
+            user_data = VALUES(user_data),
+            task_data = VALUES(task_data);
+        """
+        )
+
+    def _get_upsert_params(self, row: AssistantRun) -> Dict[str, Any]:
+        return {
+            "run_id": row.run_id,
+            "name": row.name,
+            "run_name": row.run_name,
+            "user_id": row.user_id,
+            "llm": json.dumps(row.llm, ensure_ascii=False) if row.llm is not None else None,
+            "memory": json.dumps(row.memory, ensure_ascii=False) if row.memory is not None else None,
+            "assistant_data": json.dumps(row.assistant_data, ensure_ascii=False)
+            if row.assistant_data is not None
+            else None,
+            "run_data": json.dumps(row.run_data, ensure_ascii=False) if row.run_data is not None else None,
+            "user_data": json.dumps(row.user_data, ensure_ascii=False) if row.user_data is not None else None,
+            "task_data": json.dumps(row.task_data, ensure_ascii=False) if row.task_data is not None else None,
+        }
+
     def upsert(self, row: AssistantRun) -> Optional[AssistantRun]:
         """
         Create a new assistant run if it does not exist, otherwise update the existing assistant.
         """
 
         with self.Session.begin() as sess:
-            # Create an insert statement using SingleStore's ON DUPLICATE KEY UPDATE syntax
-            upsert_sql = text(
-                f"""
-            INSERT INTO {self.schema}.{self.table_name}
-            (run_id, name, run_name, user_id, llm, memory, assistant_data, run_data, user_data, task_data)
-            VALUES
-            (:run_id, :name, :run_name, :user_id, :llm, :memory, :assistant_data, :run_data, :user_data, :task_data)
-            ON DUPLICATE KEY UPDATE
-                name = VALUES(name),
-                run_name = VALUES(run_name),
-                user_id = VALUES(user_id),
-                llm = VALUES(llm),
-                memory = VALUES(memory),
-                assistant_data = VALUES(assistant_data),
-                run_data = VALUES(run_data),
-                user_data = VALUES(user_data),
-                task_data = VALUES(task_data);
-            """
-            )
-
             try:
-                sess.execute(
-                    upsert_sql,
-                    {
-                        "run_id": row.run_id,
-                        "name": row.name,
-                        "run_name": row.run_name,
-                        "user_id": row.user_id,
-                        "llm": json.dumps(row.llm, ensure_ascii=False) if row.llm is not None else None,
-                        "memory": json.dumps(row.memory, ensure_ascii=False) if row.memory is not None else None,
-                        "assistant_data": json.dumps(row.assistant_data, ensure_ascii=False)
-                        if row.assistant_data is not None
-                        else None,
-                        "run_data": json.dumps(row.run_data, ensure_ascii=False) if row.run_data is not None else None,
-                        "user_data": json.dumps(row.user_data, ensure_ascii=False)
-                        if row.user_data is not None
-                        else None,
-                        "task_data": json.dumps(row.task_data, ensure_ascii=False)
-                        if row.task_data is not None
-                        else None,
-                    },
-                )
+                sess.execute(self._get_upsert_statement(), self._get_upsert_params(row))
             except Exception:
                 # Create table and try again
                 self.create()
-                sess.execute(
-                    upsert_sql,
+                sess.execute(self._get_upsert_statement(), self._get_upsert_params(row))
+        return self.read(run_id=row.run_id)
+
+    def _get_append_statements(
+        self, row: AssistantRun, memory: Dict[str, List[Dict[str, Any]]], start: Dict[str, int]
+    ) -> List[Tuple[Any, Any]]:
+        """Returns the statements, with their parameters, that upsert the run and write the memory items"""
+        statements: List[Tuple[Any, Any]] = [(self._get_upsert_statement(), self._get_upsert_params(row))]
+        for memory_key, items in memory.items():
+            # Remove items that are replaced by the new items
+            delete_stmt = delete(self.messages_table).where(
+                self.messages_table.c.run_id == row.run_id,
+                self.messages_table.c.memory_key == memory_key,
+                self.messages_table.c.sequence >= start[memory_key],
+            )
+            statements.append((delete_stmt, None))
+            if len(items) > 0:
+                params = [
                     {
                         "run_id": row.run_id,
-                        "name": row.name,
-                        "run_name": row.run_name,
-                        "user_id": row.user_id,
-                        "llm": json.dumps(row.llm) if row.llm is not None else None,
-                        "memory": json.dumps(row.memory, ensure_ascii=False) if row.memory is not None else None,
-                        "assistant_data": json.dumps(row.assistant_data, ensure_ascii=False)
-                        if row.assistant_data is not None
-                        else None,
-                        "run_data": json.dumps(row.run_data, ensure_ascii=False) if row.run_data is not None else None,
-                        "user_data": json.dumps(row.user_data, ensure_ascii=False)
-                        if row.user_data is not None
-                        else None,
-                        "task_data": json.dumps(row.task_data, ensure_ascii=False)
-                        if row.task_data is not None
-                        else None,
-                    },
-                )
-        return self.read(run_id=row.run_id)
+                        "memory_key": memory_key,
+                        "sequence": start[memory_key] + i,
+                        "content": item,
+                    }
+                    for i, item in enumerate(items)
+                ]
+                statements.append((insert(self.messages_table), params))
+        return statements
+
+    def _append(self, row: AssistantRun, memory: Dict[str, List[Dict[str, Any]]], start: Dict[str, int]) -> None:
+        with self.Session.begin() as sess:
+            for stmt, params in self._get_append_statements(row=row, memory=memory, start=start):
+                sess.execute(stmt, params)
+
+    def append(self, row: AssistantRun, memory: Dict[str, List[Dict[str, Any]]], start: Dict[str, int]) -> None:
+        """
+        Create or update the assistant run and write the new memory items, without reading the run back.
+        """
+
+        try:
+            self._append(row=row, memory=memory, start=start)
+        except Exception as e:
+            logger.debug(e)
+            # Create tables and try again
+            self.create()
+            self._append(row=row, memory=memory, start=start)
+
+    def _get_memory_counts_statement(self, run_id: str) -> Any:
+        # get the number of items stored for each memory list
+        return (
+            select(self.messages_table.c.memory_key, func.max(self.messages_table.c.sequence) + 1)
+            .where(self.messages_table.c.run_id == run_id)
+            .group_by(self.messages_table.c.memory_key)
+        )
+
+    def _get_memory_items_statement(self, run_id: str, memory_key: str, count: int, last_n: Optional[int]) -> Any:
+        # get the last_n items of a memory list
+        stmt = select(self.messages_table.c.content).where(
+            self.messages_table.c.run_id == run_id,
+            self.messages_table.c.memory_key == memory_key,
+        )
+        if last_n is not None:
+            stmt = stmt.where(self.messages_table.c.sequence >= count - last_n)
+        return stmt.order_by(self.messages_table.c.sequence)
+
+    def read_memory(
+        self, run_id: str, last_n: Optional[int] = None
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, int]]:
+        memory: Dict[str, List[Dict[str, Any]]] = {}
+        counts: Dict[str, int] = {}
+        try:
+            with self.Session.begin() as sess:
+                for memory_key, count in sess.execute(self._get_memory_counts_statement(run_id)).fetchall():
+                    counts[memory_key] = count
+                for memory_key, count in counts.items():
+                    stmt = self._get_memory_items_statement(run_id, memory_key, count, last_n)
+                    memory[memory_key] = [item.content for item in sess.execute(stmt).fetchall()]
+        except Exception as e:
+            logger.debug(e)
+        return memory, counts
+
+    def read_memory_items(self, run_id: str, memory_key: str, start: int, end: int) -> List[Dict[str, Any]]:
+        stmt = (
+            select(self.messages_table.c.content)
+            .where(
+                self.messages_table.c.run_id == run_id,
+                self.messages_table.c.memory_key == memory_key,
+                self.messages_table.c.sequence >= start,
+                self.messages_table.c.sequence < end,
+            )
+            .order_by(self.messages_table.c.sequence)
+        )
+        try:
+            with self.Session.begin() as sess:
+                return [item.content for item in sess.execute(stmt).fetchall()]
+        except Exception as e:
+            logger.debug(f"Error reading memory items: {e}")
+        return []
+
+    async def aread(self, run_id: str) -> Optional[AssistantRun]:
+        async_db_engine = self.async_db_engine
+        if async_db_engine is None:
+            return await super().aread(run_id=run_id)
+
+        stmt = select(self.table).where(self.table.c.run_id == run_id)
+        try:
+            async with async_db_engine.connect() as conn:
+                existing_row = (await conn.execute(stmt)).first()
+        except Exception as e:
+            logger.debug(e)
+            # Create table if it does not exist
+            await run_in_thread(self.create)
+            return None
+        return AssistantRun.model_validate(existing_row) if existing_row is not None else None
+
+    async def aupsert(self, row: AssistantRun) -> Optional[AssistantRun]:
+        async_db_engine = self.async_db_engine
+        if async_db_engine is None:
+            return await super().aupsert(row=row)
+
+        try:
+            async with async_db_engine.begin() as conn:
+                await conn.execute(self._get_upsert_statement(), self._get_upsert_params(row))
+        except Exception:
+            # Create table and try again
+            await run_in_thread(self.create)
+            async with async_db_engine.begin() as conn:
+                await conn.execute(self._get_upsert_statement(), self._get_upsert_params(row))
+        return await self.aread(run_id=row.run_id)
+
+    async def _aappend(
+        self,
+        async_db_engine: "AsyncEngine",
+        row: AssistantRun,
+        memory: Dict[str, List[Dict[str, Any]]],
+        start: Dict[str, int],
+    ) -> None:
+        async with async_db_engine.begin() as conn:
+            for stmt, params in self._get_append_statements(row=row, memory=memory, start=start):
+                await conn.execute(stmt, params)
+
+    async def aappend(self, row: AssistantRun, memory: Dict[str, List[Dict[str, Any]]], start: Dict[str, int]) -> None:
+        async_db_engine = self.async_db_engine
+        if async_db_engine is None:
+            return await super().aappend(row=row, memory=memory, start=start)
+
+        try:
+            await self._aappend(async_db_engine, row=row, memory=memory, start=start)
+        except Exception as e:
+            logger.debug(e)
+            # Create tables and try again
+            await run_in_thread(self.create)
+            await self._aappend(async_db_engine, row=row, memory=memory, start=start)
+
+    async def aread_memory(
+        self, run_id: str, last_n: Optional[int] = None
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, int]]:
+        async_db_engine = self.async_db_engine
+        if async_db_engine is None:
+            return await super().aread_memory(run_id=run_id, last_n=last_n)
+
+        memory: Dict[str, List[Dict[str, Any]]] = {}
+        counts: Dict[str, int] = {}
+        try:
+            async with async_db_engine.connect() as conn:
+                for memory_key, count in (await conn.execute(self._get_memory_counts_statement(run_id))).fetchall():
+                    counts[memory_key] = count
+                for memory_key, count in counts.items():
+                    stmt = self._get_memory_items_statement(run_id, memory_key, count, last_n)
+                    memory[memory_key] = [item.content for item in (await conn.execute(stmt)).fetchall()]
+        except Exception as e:
+            logger.debug(e)
+        return memory, counts
 
     def delete(self) -> None:
         if self.table_exists():
             logger.info(f"Deleting table: {self.table_name}")
             self.table.drop(self.db_engine)
+        self.messages_table.drop(self.db_engine, checkfirst=True)
@@ -0,0 +1,3 @@
+from phi.tools.cache.base import ToolCache
+from phi.tools.cache.memory import InMemoryToolCache
+from phi.tools.cache.sqlite import SqliteToolCache
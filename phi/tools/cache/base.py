@@ -0,0 +1,34 @@
+import json
+from abc import ABC, abstractmethod
+from hashlib import sha256
+from typing import Any, Dict, Optional
+
+
+class ToolCache(ABC):
+    """Base class for caching tool results by (namespace, function name, normalized arguments)"""
+
+    @staticmethod
+    def get_key(function_name: str, arguments: Optional[Dict[str, Any]], namespace: Optional[str] = None) -> str:
+        """The namespace separates the results of functions with the same name sharing a cache,
+        e.g. the functions of two toolkits, or of the same toolkit with different settings.
+        """
+        # Sort the arguments so calls that only differ in argument order share a key
+        normalized = json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), default=str)
+        arguments_hash = sha256(normalized.encode("utf-8", errors="replace")).hexdigest()
+        if namespace:
+            return f"{namespace}:{function_name}:{arguments_hash}"
+        return f"{function_name}:{arguments_hash}"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached result, or None if the key is missing or expired"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, result: Any, ttl: Optional[float] = None) -> None:
+        """Cache a result for ttl seconds, or until it is evicted if ttl is None"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Optional, Tuple
+
+from phi.tools.cache.base import ToolCache
+
+
+class InMemoryToolCache(ToolCache):
+    def __init__(self, max_size: int = 1000):
+        """
+        Thread-safe LRU cache of tool results held in process memory.
+
+        :param max_size: Maximum number of results to keep, the least recently used entries are evicted first.
+        """
+        self.max_size: int = max_size
+        # Result and expiry time (in time.monotonic seconds) by key
+        self._cache: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            result, expires_at = entry
+            if expires_at is not None and expires_at <= monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return result
+
+    def set(self, key: str, result: Any, ttl: Optional[float] = None) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._cache[key] = (result, expires_at)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
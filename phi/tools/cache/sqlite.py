@@ -0,0 +1,119 @@
+import json
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any, Optional, Union
+
+from phi.tools.cache.base import ToolCache
+from phi.tools.cache.memory import InMemoryToolCache
+from phi.utils.log import logger
+
+
+class SqliteToolCache(ToolCache):
+    def __init__(
+        self,
+        db_file: Union[str, Path] = Path.home().joinpath(".phi", "tool_results.db"),
+        table_name: str = "tool_cache",
+        max_size: int = 100000,
+        memory_cache_size: int = 1000,
+    ):
+        """
+        Persistent tool result cache stored in a local sqlite database, with an in-memory LRU layer in front.
+
+        Results are stored as JSON, results that can not be serialized are only kept in memory.
+        The same cache file can be shared between processes.
+
+        :param db_file: The sqlite database file to store results in.
+        :param table_name: The name of the table to store results in.
+        :param max_size: Maximum number of results to keep, the least recently used entries are evicted first.
+        :param memory_cache_size: Number of results to keep in memory, 0 disables the in-memory layer.
+        """
+        self.db_file: Path = Path(db_file)
+        self.table_name: str = table_name
+        self.max_size: int = max_size
+        self.memory_cache: InMemoryToolCache = InMemoryToolCache(max_size=memory_cache_size)
+
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._num_writes = 0
+        self._connection = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table_name} "
+            "(key TEXT PRIMARY KEY, result TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table_name}_accessed_at ON {self.table_name} (accessed_at)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        result = self.memory_cache.get(key)
+        if result is not None:
+            return result
+
+        now = time()
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    f"SELECT result, expires_at FROM {self.table_name} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] is not None and row[1] <= now:
+                    self._connection.execute(f"DELETE FROM {self.table_name} WHERE key = ?", (key,))
+                    self._connection.commit()
+                    return None
+                self._connection.execute(f"UPDATE {self.table_name} SET accessed_at = ? WHERE key = ?", (now, key))
+                self._connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Error reading from tool cache: {e}")
+            return None
+
+        result = json.loads(row[0])
+        # Keep the remaining time to live in memory
+        self.memory_cache.set(key, result, ttl=row[1] - now if row[1] is not None else None)
+        return result
+
+    def set(self, key: str, result: Any, ttl: Optional[float] = None) -> None:
+        self.memory_cache.set(key, result, ttl=ttl)
+        try:
+            serialized = json.dumps(result)
+        except (TypeError, ValueError):
+            logger.debug(f"Tool result for {key} is not JSON serializable, caching it in memory only")
+            return
+
+        now = time()
+        try:
+            with self._lock:
+                self._connection.execute(
+                    f"INSERT OR REPLACE INTO {self.table_name} (key, result, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, serialized, now + ttl if ttl is not None else None, now),
+                )
+                self._num_writes += 1
+                # Evict expired and least recently used results every 100 writes
+                if self._num_writes % 100 == 0:
+                    self._evict(now)
+                self._connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Error writing to tool cache: {e}")
+
+    def _evict(self, now: float) -> None:
+        self._connection.execute(f"DELETE FROM {self.table_name} WHERE expires_at <= ?", (now,))
+        self._connection.execute(
+            f"DELETE FROM {self.table_name} WHERE key IN "
+            f"(SELECT key FROM {self.table_name} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_size,),
+        )
+
+    def clear(self) -> None:
+        self.memory_cache.clear()
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self.table_name}")
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -1,7 +1,54 @@
+from copy import deepcopy
+from inspect import isawaitable
+from types import GeneratorType, MethodType
 from typing import Any, Dict, Optional, Callable, get_type_hints
-from pydantic import BaseModel, validate_call
+from weakref import WeakKeyDictionary
+from pydantic import BaseModel, ConfigDict, validate_call
 
+from phi.tools.cache.base import ToolCache
 from phi.utils.log import logger
+from phi.utils.run_async import run_in_thread, run_coroutine_sync
+
+# Name, description, JSON schema and validated entrypoint compiled for each function, shared by the process.
+# Bound methods are compiled once for the function they wrap and bound to their instance on use.
+# Entries are removed when the function is garbage collected.
+_compiled_functions: "WeakKeyDictionary[Callable, Dict[str, Any]]" = WeakKeyDictionary()
+
+
+def compile_function(c: Callable) -> Dict[str, Any]:
+    """Returns the name, description, parameters (as a JSON Schema) and validated entrypoint of a function.
+
+    The result is cached for the function, so the type hints are only parsed once per process.
+    """
+    from inspect import getdoc
+    from phi.utils.json_schema import get_json_schema
+
+    try:
+        compiled = _compiled_functions.get(c)
+    except TypeError:
+        # The callable can not be weakly referenced or is not hashable, so it is not cached
+        compiled = None
+    if compiled is not None:
+        return compiled
+
+    parameters = {"type": "object", "properties": {}}
+    try:
+        type_hints = get_type_hints(c)
+        parameters = get_json_schema(type_hints)
+    except Exception as e:
+        logger.warning(f"Could not parse args for {c.__name__}: {e}")
+
+    compiled = {
+        "name": c.__name__,
+        "description": getdoc(c),
+        "parameters": parameters,
+        "entrypoint": validate_call(c),
+    }
+    try:
+        _compiled_functions[c] = compiled
+    except TypeError:
+        pass
+    return compiled
 
 
 class Function(BaseModel):
@@ -20,31 +67,35 @@ class Function(BaseModel):
     # If True, the arguments are sanitized before being passed to the function.
     sanitize_arguments: bool = True
 
+    # -*- Cache for the results of this function, keyed by the function name and normalized arguments.
+    # Calls with the same arguments return the cached result instead of running the function again.
+    cache: Optional[ToolCache] = None
+    # Seconds a result is cached for. If None, results are cached until evicted.
+    cache_ttl: Optional[float] = 3600
+    # Added to the cache keys so functions with the same name sharing a cache do not read each other's results.
+    # Set by the Toolkit to its class, name and a fingerprint of its settings.
+    cache_namespace: Optional[str] = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     def to_dict(self) -> Dict[str, Any]:
         return self.model_dump(exclude_none=True, include={"name", "description", "parameters"})
 
     @classmethod
     def from_callable(cls, c: Callable) -> "Function":
-        from inspect import getdoc
-        from phi.utils.json_schema import get_json_schema
-
-        parameters = {"type": "object", "properties": {}}
-        try:
-            # logger.info(f"Getting type hints for {c}")
-            type_hints = get_type_hints(c)
-            # logger.info(f"Type hints for {c}: {type_hints}")
-            # logger.info(f"Getting JSON schema for {type_hints}")
-            parameters = get_json_schema(type_hints)
-            # logger.info(f"JSON schema for {c}: {parameters}")
-            # logger.debug(f"Type hints for {c.__name__}: {type_hints}")
-        except Exception as e:
-            logger.warning(f"Could not parse args for {c.__name__}: {e}")
+        if isinstance(c, MethodType):
+            # Compile the function once and bind the validated entrypoint to this instance
+            compiled = compile_function(c.__func__)
+            entrypoint: Callable = MethodType(compiled["entrypoint"], c.__self__)
+        else:
+            compiled = compile_function(c)
+            entrypoint = compiled["entrypoint"]
 
         return cls(
-            name=c.__name__,
-            description=getdoc(c),
-            parameters=parameters,
-            entrypoint=validate_call(c),
+            name=compiled["name"],
+            description=compiled["description"],
+            parameters=deepcopy(compiled["parameters"]),
+            entrypoint=entrypoint,
         )
 
     def get_type_name(self, t):
@@ -110,6 +161,9 @@ class FunctionCall(BaseModel):
 
     # Error while parsing arguments or running the function.
     error: Optional[str] = None
+    # True if the result was read from the function cache, False if the result was not cached.
+    # None if the function has no cache.
+    cache_hit: Optional[bool] = None
 
     def get_call_str(self) -> str:
         """Returns a string representation of the function call."""
@@ -125,29 +179,85 @@ class FunctionCall(BaseModel):
         call_str = f"{self.function.name}({', '.join([f'{k}={v}' for k, v in trimmed_arguments.items()])})"
         return call_str
 
+    def _call_entrypoint(self) -> Any:
+        if self.function.entrypoint is None:
+            return None
+        # Call the function with no arguments if none are provided.
+        if self.arguments is None:
+            return self.function.entrypoint()
+        return self.function.entrypoint(**self.arguments)
+
+    def _get_cache_key(self) -> Optional[str]:
+        if self.function.cache is None:
+            return None
+        return self.function.cache.get_key(self.function.name, self.arguments, self.function.cache_namespace)
+
+    @staticmethod
+    def _is_cacheable(result: Any) -> bool:
+        # Generators can only be consumed once
+        return result is not None and not isinstance(result, GeneratorType) and not hasattr(result, "__anext__")
+
     def execute(self) -> bool:
         """Runs the function call.
+        Coroutine functions are run to completion on an event loop.
 
         @return: True if the function call was successful, False otherwise.
         """
         if self.function.entrypoint is None:
             return False
 
+        cache_key = self._get_cache_key()
+        if self.function.cache is not None and cache_key is not None:
+            cached_result = self.function.cache.get(cache_key)
+            self.cache_hit = cached_result is not None
+            if cached_result is not None:
+                logger.debug(f"Cache hit: {self.get_call_str()}")
+                self.result = cached_result
+                return True
+
         logger.debug(f"Running: {self.get_call_str()}")
 
-        # Call the function with no arguments if none are provided.
-        if self.arguments is None:
-            try:
-                self.result = self.function.entrypoint()
+        try:
+            result = self._call_entrypoint()
+            if isawaitable(result):
+                result = run_coroutine_sync(result)
+            self.result = result
+            if self.function.cache is not None and cache_key is not None and self._is_cacheable(result):
+                self.function.cache.set(cache_key, result, ttl=self.function.cache_ttl)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not run function {self.get_call_str()}")
+            logger.exception(e)
+            self.error = str(e)
+            return False
+
+    async def aexecute(self) -> bool:
+        """Runs the function call without blocking the event loop.
+        Coroutine functions are awaited, other functions run in a thread.
+
+        @return: True if the function call was successful, False otherwise.
+        """
+        if self.function.entrypoint is None:
+            return False
+
+        cache_key = self._get_cache_key()
+        if self.function.cache is not None and cache_key is not None:
+            cached_result = await run_in_thread(self.function.cache.get, cache_key)
+            self.cache_hit = cached_result is not None
+            if cached_result is not None:
+                logger.debug(f"Cache hit: {self.get_call_str()}")
+                self.result = cached_result
                 return True
-            except Exception as e:
-                logger.warning(f"Could not run function {self.get_call_str()}")
-                logger.exception(e)
-                self.error = str(e)
-                return False
+
+        logger.debug(f"Running: {self.get_call_str()}")
 
         try:
-            self.result = self.function.entrypoint(**self.arguments)
+            result = await run_in_thread(self._call_entrypoint)
+            if isawaitable(result):
+                result = await result
+            self.result = result
+            if self.function.cache is not None and cache_key is not None and self._is_cacheable(result):
+                await run_in_thread(self.function.cache.set, cache_key, result, self.function.cache_ttl)
             return True
         except Exception as e:
             logger.warning(f"Could not run function {self.get_call_str()}")
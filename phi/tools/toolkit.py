@@ -1,6 +1,10 @@
+import json
 from collections import OrderedDict
-from typing import Callable, Dict
+from hashlib import sha256
+from typing import Any, Callable, Dict, List, Optional
 
+from phi.tools.cache.base import ToolCache
+from phi.tools.cache.memory import InMemoryToolCache
 from phi.tools.function import Function
 from phi.utils.log import logger
 
@@ -10,10 +14,27 @@ class Toolkit:
         self.name: str = name
         self.functions: Dict[str, Function] = OrderedDict()
 
-    def register(self, function: Callable, sanitize_arguments: bool = True):
+    def register(
+        self,
+        function: Callable,
+        sanitize_arguments: bool = True,
+        cache: Optional[ToolCache] = None,
+        cache_ttl: Optional[float] = 3600,
+    ):
+        """Register a function with the toolkit.
+
+        :param function: The function to register.
+        :param sanitize_arguments: If True, the arguments are sanitized before being passed to the function.
+        :param cache: Cache for the results of the function. If None, results are not cached.
+        :param cache_ttl: Seconds a result is cached for. If None, results are cached until evicted.
+        """
         try:
             f = Function.from_callable(function)
             f.sanitize_arguments = sanitize_arguments
+            f.cache = cache
+            f.cache_ttl = cache_ttl
+            if cache is not None:
+                f.cache_namespace = self.get_cache_namespace()
             self.functions[f.name] = f
             logger.debug(f"Function: {f.name} registered with {self.name}")
             # logger.debug(f"Json Schema: {f.to_dict()}")
@@ -21,6 +42,40 @@ class Toolkit:
             logger.warning(f"Failed to create Function for: {function.__name__}")
             raise e
 
+    def cache_results(
+        self,
+        cache: Optional[ToolCache] = None,
+        ttl: Optional[float] = 3600,
+        functions: Optional[List[str]] = None,
+    ) -> "Toolkit":
+        """Cache the results of the registered functions, e.g. `DuckDuckGo().cache_results(ttl=600)`
+
+        :param cache: Cache for the results. Defaults to an in-memory LRU cache for this toolkit.
+        :param ttl: Seconds a result is cached for. If None, results are cached until evicted.
+        :param functions: Names of the functions to cache. If None, all registered functions are cached.
+        """
+        _cache = cache if cache is not None else InMemoryToolCache()
+        namespace = self.get_cache_namespace()
+        for name, f in self.functions.items():
+            if functions is None or name in functions:
+                f.cache = _cache
+                f.cache_ttl = ttl
+                f.cache_namespace = namespace
+        return self
+
+    def get_cache_namespace(self) -> str:
+        """Returns the namespace of the cached results of this toolkit: its class, name and a fingerprint
+        of its settings, so toolkits sharing a cache only read the results of toolkits configured the same way.
+        """
+        settings = {k: v for k, v in vars(self).items() if k != "functions"}
+        try:
+            # Settings that are not JSON serializable, e.g. clients, are identified by their type
+            settings_json = json.dumps(settings, sort_keys=True, default=_get_type_name)
+        except (TypeError, ValueError):
+            settings_json = json.dumps(sorted(settings))
+        fingerprint = sha256(settings_json.encode("utf-8", errors="replace")).hexdigest()[:16]
+        return f"{self.__class__.__qualname__}.{self.name}:{fingerprint}"
+
     def instructions(self) -> str:
         return ""
 
@@ -29,3 +84,7 @@ class Toolkit:
 
     def __str__(self):
         return self.__repr__()
+
+
+def _get_type_name(value: Any) -> str:
+    return type(value).__qualname__
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+from typing import Any, Dict, Hashable, Optional, Type, TypeVar
+from weakref import WeakKeyDictionary
+
+from pydantic import BaseModel
+
+from phi.utils.log import logger
+
+T = TypeVar("T")
+
+
+class ClientCacheSettings(BaseModel):
+    """Settings for the API clients shared by the LLMs and embedders"""
+
+    # If False, a new client is created for every request
+    enabled: bool = True
+    # Use HTTP/2 for the http clients created for the OpenAI, Anthropic and Groq clients, requires `h2`
+    http2: bool = False
+    # Connection pool limits of the http clients
+    max_connections: Optional[int] = 1000
+    max_keepalive_connections: Optional[int] = 100
+    # Seconds an idle connection is kept open
+    keepalive_expiry: Optional[float] = 30
+
+
+client_cache_settings = ClientCacheSettings()
+
+_lock = threading.Lock()
+# Clients by (client class, client params)
+_clients: Dict[Hashable, Any] = {}
+# Async clients by event loop, as their connections can only be used on the loop they were created on
+_async_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, Any]]" = WeakKeyDictionary()
+
+
+def _freeze(value: Any) -> Hashable:
+    """Returns a hashable key for the value. Objects that are not plain data are identified by their id."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if value is None or isinstance(value, (str, int, float, bool, bytes)):
+        return value
+    return ("id", id(value))
+
+
+def _get_limits() -> Any:
+    import httpx
+
+    return httpx.Limits(
+        max_connections=client_cache_settings.max_connections,
+        max_keepalive_connections=client_cache_settings.max_keepalive_connections,
+        keepalive_expiry=client_cache_settings.keepalive_expiry,
+    )
+
+
+def _check_http2() -> None:
+    if client_cache_settings.http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            raise ImportError("`h2` not installed. Please install using `pip install 'httpx[http2]'`")
+
+
+def get_http_client() -> Any:
+    """Returns a new httpx.Client using the client_cache_settings"""
+    import httpx
+
+    _check_http2()
+    return httpx.Client(limits=_get_limits(), http2=client_cache_settings.http2)
+
+
+def get_async_http_client() -> Any:
+    """Returns a new httpx.AsyncClient using the client_cache_settings"""
+    import httpx
+
+    _check_http2()
+    return httpx.AsyncClient(limits=_get_limits(), http2=client_cache_settings.http2)
+
+
+def get_cached_client(client_class: Type[T], params: Dict[str, Any], http_client_param: Optional[str] = None) -> T:
+    """Returns the client of client_class created with params, creating it on first use.
+
+    Clients are shared by all LLMs and embedders in the process with the same params,
+    so consecutive requests reuse the open connections.
+
+    :param client_class: The client class, e.g. openai.OpenAI.
+    :param params: The keyword arguments used to create the client.
+    :param http_client_param: The client argument that accepts an httpx.Client.
+        If set and not in params, the client is created with an http client using the client_cache_settings.
+    """
+    if not client_cache_settings.enabled:
+        return client_class(**params)
+
+    key = (client_class, _freeze(params))
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                _params = dict(params)
+                if http_client_param is not None and _params.get(http_client_param) is None:
+                    _params[http_client_param] = get_http_client()
+                logger.debug(f"Creating {client_class.__name__} client")
+                client = client_class(**_params)
+                _clients[key] = client
+    return client
+
+
+def get_cached_async_client(
+    client_class: Type[T], params: Dict[str, Any], http_client_param: Optional[str] = None
+) -> T:
+    """Async version of `get_cached_client`. Clients are shared on the running event loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if not client_cache_settings.enabled or loop is None:
+        _params = dict(params)
+        if http_client_param is not None and _params.get(http_client_param) is None:
+            _params[http_client_param] = get_async_http_client()
+        return client_class(**_params)
+
+    key = (client_class, _freeze(params))
+    with _lock:
+        # Drop the clients of event loops that were closed without closing their clients
+        for closed_loop in [_loop for _loop in list(_async_clients.keys()) if _loop.is_closed()]:
+            _async_clients.pop(closed_loop, None)
+        loop_clients = _async_clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            _params = dict(params)
+            if http_client_param is not None and _params.get(http_client_param) is None:
+                _params[http_client_param] = get_async_http_client()
+            logger.debug(f"Creating {client_class.__name__} client")
+            client = client_class(**_params)
+            loop_clients[key] = client
+    return client
+
+
+def close_clients() -> None:
+    """Close the cached clients and their connections. New clients are created on the next request."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"Error closing client: {e}")
+
+
+async def aclose_clients() -> None:
+    """Close the cached clients, including the async clients of the running event loop."""
+    close_clients()
+    await aclose_async_clients()
+
+
+async def aclose_async_clients() -> None:
+    """Close the async clients cached for the running event loop, e.g. before a temporary loop is closed."""
+    with _lock:
+        clients = list(_async_clients.pop(asyncio.get_running_loop(), {}).values())
+    for client in clients:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.debug(f"Error closing client: {e}")
@@ -0,0 +1,24 @@
+from threading import Lock
+from time import monotonic, sleep
+from typing import Optional
+
+
+class RateLimiter:
+    """Thread-safe rate limiter that spaces out calls to at most `rate` calls per second"""
+
+    def __init__(self, rate: Optional[float] = None):
+        self.rate: Optional[float] = rate
+        self._lock = Lock()
+        self._next_time: float = 0.0
+
+    def acquire(self) -> None:
+        """Block until the next call is allowed"""
+        if self.rate is None or self.rate <= 0:
+            return
+
+        with self._lock:
+            now = monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + 1.0 / self.rate
+        if wait > 0:
+            sleep(wait)
@@ -0,0 +1,84 @@
+import asyncio
+import queue
+import threading
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Tuple, TypeVar
+
+from phi.utils.client_cache import aclose_async_clients
+
+T = TypeVar("T")
+
+
+async def run_in_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking function in the default thread pool executor without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+
+def run_coroutine_sync(coroutine: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code.
+
+    If the current thread is already running an event loop, the coroutine runs on a new loop in another thread.
+    The async clients cached for the new loop are closed before the loop is closed.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_await(coroutine))
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, _await(coroutine)).result()
+
+
+async def _await(awaitable: Awaitable[T]) -> T:
+    try:
+        return await awaitable
+    finally:
+        await aclose_async_clients()
+
+
+def iter_async_sync(async_iterator: Callable[[], AsyncIterator[T]]) -> Iterator[T]:
+    """Iterate over an async iterator from synchronous code.
+
+    The async iterator runs on a new event loop in another thread and its items are yielded as they are produced,
+    so this also works when the current thread is already running an event loop.
+    The async clients cached for the new loop are closed before the loop is closed.
+
+    :param async_iterator: A function returning the async iterator, called on the new event loop.
+    """
+    items: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=1)
+    stop = threading.Event()
+
+    async def produce() -> None:
+        try:
+            async for item in async_iterator():
+                if stop.is_set():
+                    break
+                await run_in_thread(items.put, ("item", item))
+        except BaseException as e:
+            items.put(("error", e))
+        else:
+            items.put(("done", None))
+        finally:
+            await aclose_async_clients()
+
+    thread = threading.Thread(target=asyncio.run, args=(produce(),), daemon=True)
+    thread.start()
+    try:
+        while True:
+            kind, value = items.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        stop.set()
+        # Unblock the producer if it is waiting to put an item
+        while thread.is_alive():
+            try:
+                items.get(timeout=0.1)
+            except queue.Empty:
+                pass
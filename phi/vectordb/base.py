@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List
+from hashlib import md5
+from typing import List, Set
 
 from phi.document import Document
+from phi.utils.run_async import run_in_thread
 
 
 class VectorDb(ABC):
@@ -15,6 +17,19 @@ class VectorDb(ABC):
     def doc_exists(self, document: Document) -> bool:
         raise NotImplementedError
 
+    def docs_exist(self, documents: List[Document]) -> Set[str]:
+        """Returns the content hashes of the documents that already exist in the vector db.
+
+        Vector dbs that support batch lookups override this method,
+        the default implementation checks one document at a time.
+        """
+        return {self.get_content_hash(document) for document in documents if self.doc_exists(document)}
+
+    @staticmethod
+    def get_content_hash(document: Document) -> str:
+        cleaned_content = document.content.replace("\x00", "\ufffd")
+        return md5(cleaned_content.encode()).hexdigest()
+
     @abstractmethod
     def name_exists(self, name: str) -> bool:
         raise NotImplementedError
@@ -23,6 +38,17 @@ class VectorDb(ABC):
     def insert(self, documents: List[Document]) -> None:
         raise NotImplementedError
 
+    async def async_insert(self, documents: List[Document]) -> None:
+        """Async version of `insert`.
+
+        Vector dbs with an async client override this method, the default implementation
+        embeds the documents asynchronously and runs `insert` in a thread.
+        """
+        embedder = getattr(self, "embedder", None)
+        if embedder is not None:
+            await Document.aembed_documents(documents, embedder=embedder)
+        await run_in_thread(self.insert, documents)
+
     def upsert_available(self) -> bool:
         return False
 
@@ -30,10 +56,32 @@ class VectorDb(ABC):
     def upsert(self, documents: List[Document]) -> None:
         raise NotImplementedError
 
+    async def async_upsert(self, documents: List[Document]) -> None:
+        """Async version of `upsert`, embeds the documents asynchronously and runs `upsert` in a thread"""
+        embedder = getattr(self, "embedder", None)
+        if embedder is not None:
+            await Document.aembed_documents(documents, embedder=embedder)
+        await run_in_thread(self.upsert, documents)
+
     @abstractmethod
     def search(self, query: str, limit: int = 5) -> List[Document]:
         raise NotImplementedError
 
+    async def async_search(self, query: str, limit: int = 5) -> List[Document]:
+        """Async version of `search`.
+
+        Vector dbs with an async client override this method,
+        the default implementation runs `search` in a thread so it does not block the event loop.
+        """
+        return await run_in_thread(self.search, query, limit)
+
+    def delete_by_content_hash(self, content_hashes: List[str]) -> None:
+        """Delete the documents with the given content hashes.
+
+        Used to remove the chunks of changed and removed sources when a knowledge base is loaded incrementally.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def delete(self) -> None:
         raise NotImplementedError
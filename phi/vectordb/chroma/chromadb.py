@@ -1,5 +1,5 @@
 from hashlib import md5
-from typing import List, Optional
+from typing import List, Optional, Set
 
 try:
     from chromadb import Client as ChromaDbClient
@@ -17,6 +17,7 @@ from phi.embedder.openai import OpenAIEmbedder
 from phi.vectordb.base import VectorDb
 from phi.vectordb.distance import Distance
 from phi.utils.log import logger
+from phi.utils.run_async import run_in_thread
 
 
 class ChromaDb(VectorDb):
@@ -92,6 +93,26 @@ class ChromaDb(VectorDb):
                 logger.error(f"Document does not exist: {e}")
         return False
 
+    def docs_exist(self, documents: List[Document], batch_size: int = 1000) -> Set[str]:
+        """Returns the content hashes of the documents that already exist in the collection.
+        Args:
+            documents (List[Document]): Documents to check.
+            batch_size (int): Number of ids to look up per request.
+        Returns:
+            Set[str]: Content hashes of the documents that exist.
+        """
+        existing_ids: Set[str] = set()
+        if self.client:
+            try:
+                collection: Collection = self.client.get_collection(name=self.collection)
+                doc_ids = list({self.get_content_hash(document) for document in documents})
+                for i in range(0, len(doc_ids), batch_size):
+                    collection_data: GetResult = collection.get(ids=doc_ids[i : i + batch_size], include=[])
+                    existing_ids.update(collection_data.get("ids", []))
+            except Exception as e:
+                logger.error(f"Error checking if documents exist: {e}")
+        return existing_ids
+
     def name_exists(self, name: str) -> bool:
         """Check if a document with a given name exists in the collection.
         Args:
@@ -118,8 +139,8 @@ class ChromaDb(VectorDb):
         docs: List = []
         docs_embeddings: List = []
 
+        Document.embed_documents(documents, embedder=self.embedder)
         for document in documents:
-            document.embed(embedder=self.embedder)
             cleaned_content = document.content.replace("\x00", "\ufffd")
             doc_id = md5(cleaned_content.encode()).hexdigest()
             docs_embeddings.append(document.embedding)
@@ -142,8 +163,8 @@ class ChromaDb(VectorDb):
         docs: List = []
         docs_embeddings: List = []
 
+        Document.embed_documents(documents, embedder=self.embedder)
         for document in documents:
-            document.embed(embedder=self.embedder)
             cleaned_content = document.content.replace("\x00", "\ufffd")
             doc_id = md5(cleaned_content.encode()).hexdigest()
             docs_embeddings.append(document.embedding)
@@ -164,11 +185,23 @@ class ChromaDb(VectorDb):
         Returns:
             List[Document]: List of search results.
         """
-        query_embedding = self.embedder.get_embedding(query)
+        query_embedding = self.embedder.get_cached_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
+        return self._search_by_embedding(query_embedding, limit)
 
+    async def async_search(self, query: str, limit: int = 5) -> List[Document]:
+        """Async version of `search`, the query embedding is created asynchronously
+        and the blocking chromadb query runs in a thread.
+        """
+        query_embedding = await self.embedder.aget_cached_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+        return await run_in_thread(self._search_by_embedding, query_embedding, limit)
+
+    def _search_by_embedding(self, query_embedding: List[float], limit: int) -> List[Document]:
         if not self._collection:
             self._collection = self.client.get_collection(name=self.collection)
 
@@ -207,6 +240,18 @@ class ChromaDb(VectorDb):
 
         return search_results
 
+    def delete_by_content_hash(self, content_hashes: List[str], batch_size: int = 1000) -> None:
+        """Delete the documents with the given content hashes.
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete.
+            batch_size (int): Number of ids to delete per request.
+        """
+        if self.client:
+            collection: Collection = self.client.get_collection(name=self.collection)
+            for i in range(0, len(content_hashes), batch_size):
+                collection.delete(ids=content_hashes[i : i + batch_size])
+            logger.debug(f"Deleted {len(content_hashes)} documents")
+
     def delete(self) -> None:
         """Delete the collection."""
         if self.exists():
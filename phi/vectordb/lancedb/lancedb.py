@@ -1,5 +1,5 @@
 from hashlib import md5
-from typing import List, Optional
+from typing import List, Optional, Set
 import json
 
 try:
@@ -14,6 +14,7 @@ from phi.embedder.openai import OpenAIEmbedder
 from phi.vectordb.base import VectorDb
 from phi.vectordb.distance import Distance
 from phi.utils.log import logger
+from phi.utils.run_async import run_in_thread
 
 
 class LanceDb(VectorDb):
@@ -95,11 +96,29 @@ class LanceDb(VectorDb):
             return len(result) > 0
         return False
 
+    def docs_exist(self, documents: List[Document], batch_size: int = 1000) -> Set[str]:
+        """
+        Returns the content hashes of the documents that already exist, using one query per batch
+
+        Args:
+            documents (List[Document]): Documents to validate
+            batch_size (int): Number of ids to look up per query
+        """
+        existing_ids: Set[str] = set()
+        if self.client:
+            doc_ids = list({self.get_content_hash(document) for document in documents})
+            for i in range(0, len(doc_ids), batch_size):
+                batch = doc_ids[i : i + batch_size]
+                id_list = ", ".join(f"'{doc_id}'" for doc_id in batch)
+                result = self.connection.search().where(f"{self._id} IN ({id_list})").limit(len(batch)).to_arrow()
+                existing_ids.update(result[self._id].to_pylist())
+        return existing_ids
+
     def insert(self, documents: List[Document]) -> None:
         logger.debug(f"Inserting {len(documents)} documents")
         data = []
+        Document.embed_documents(documents, embedder=self.embedder)
         for document in documents:
-            document.embed(embedder=self.embedder)
             cleaned_content = document.content.replace("\x00", "\ufffd")
             doc_id = str(md5(cleaned_content.encode()).hexdigest())
             payload = {
@@ -131,11 +150,21 @@ class LanceDb(VectorDb):
         self.insert(documents)
 
     def search(self, query: str, limit: int = 5) -> List[Document]:
-        query_embedding = self.embedder.get_embedding(query)
+        query_embedding = self.embedder.get_cached_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+        return self._search_by_embedding(query_embedding, limit)
+
+    async def async_search(self, query: str, limit: int = 5) -> List[Document]:
+        query_embedding = await self.embedder.aget_cached_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
+        # The lancedb table query is blocking, run it in a thread so it does not block the event loop
+        return await run_in_thread(self._search_by_embedding, query_embedding, limit)
 
+    def _search_by_embedding(self, query_embedding: List[float], limit: int) -> List[Document]:
         results = (
             self.connection.search(
                 query=query_embedding,
@@ -168,6 +197,20 @@ class LanceDb(VectorDb):
 
         return search_results
 
+    def delete_by_content_hash(self, content_hashes: List[str], batch_size: int = 1000) -> None:
+        """
+        Delete the documents with the given content hashes, using one query per batch
+
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+            batch_size (int): Number of ids to delete per query
+        """
+        if self.client:
+            for i in range(0, len(content_hashes), batch_size):
+                id_list = ", ".join(f"'{doc_id}'" for doc_id in content_hashes[i : i + batch_size])
+                self.connection.delete(f"{self._id} IN ({id_list})")
+            logger.debug(f"Deleted {len(content_hashes)} documents")
+
     def delete(self) -> None:
         if self.exists():
             logger.debug(f"Deleting collection: {self.table_name}")
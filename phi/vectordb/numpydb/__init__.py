@@ -0,0 +1 @@
+from phi.vectordb.numpydb.numpydb import NumpyDb
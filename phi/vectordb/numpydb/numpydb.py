@@ -0,0 +1,355 @@
+import json
+from pathlib import Path
+from threading import RLock
+from typing import Any, Dict, List, Optional, Set, Union
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("`numpy` not installed. Please install using `pip install numpy`")
+
+from phi.document import Document
+from phi.embedder import Embedder
+from phi.embedder.openai import OpenAIEmbedder
+from phi.vectordb.base import VectorDb
+from phi.vectordb.distance import Distance
+from phi.utils.log import logger
+
+
+class NumpyDb(VectorDb):
+    """In-process vector db that stores embeddings in a contiguous float32 NumPy matrix.
+
+    Search is an exact, vectorized scan over all embeddings, which is fast for up to a few hundred thousand documents.
+    If `path` is provided, embeddings are stored in a memory-mapped file and documents in a JSON lines file,
+    so the collection is persisted and reloaded on startup. Otherwise the collection only lives in memory.
+    """
+
+    def __init__(
+        self,
+        collection: str = "phi",
+        embedder: Embedder = OpenAIEmbedder(),
+        distance: Distance = Distance.cosine,
+        path: Optional[Union[str, Path]] = None,
+        initial_capacity: int = 1024,
+    ):
+        # Collection attributes
+        self.collection: str = collection
+
+        # Embedder for embedding the document contents
+        self.embedder: Embedder = embedder
+        self.dimensions: int = self.embedder.dimensions
+
+        # Distance metric
+        self.distance: Distance = distance
+
+        # Directory to persist the collection, if None the collection is kept in memory
+        self.path: Optional[Path] = Path(path) if path is not None else None
+        self.initial_capacity: int = max(initial_capacity, 1)
+
+        # Embeddings matrix with room for `capacity` rows, the first `count` rows are in use
+        self._embeddings: np.ndarray = np.empty((0, self.dimensions), dtype=np.float32)
+        # L2 norm of each embedding, used for cosine and l2 distance
+        self._norms: np.ndarray = np.empty(0, dtype=np.float32)
+        self._count: int = 0
+        # Document records stored at the same row as their embedding
+        self._records: List[Dict[str, Any]] = []
+        # Row of each document by id and by content hash
+        self._id_index: Dict[str, int] = {}
+        self._hash_index: Dict[str, int] = {}
+        self._lock = RLock()
+
+        if self.exists():
+            self._load()
+
+    @property
+    def embeddings_file(self) -> Optional[Path]:
+        return self.path.joinpath(f"{self.collection}.f32") if self.path is not None else None
+
+    @property
+    def documents_file(self) -> Optional[Path]:
+        return self.path.joinpath(f"{self.collection}.jsonl") if self.path is not None else None
+
+    @property
+    def capacity(self) -> int:
+        return self._embeddings.shape[0]
+
+    def _open_embeddings(self, capacity: int) -> np.ndarray:
+        """Returns an embeddings matrix with room for `capacity` rows, keeping the rows in use"""
+        if self.embeddings_file is None:
+            embeddings = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            embeddings[: self._count] = self._embeddings[: self._count]
+            return embeddings
+
+        # Grow the file and map it again, the rows already written are kept by the file
+        if isinstance(self._embeddings, np.memmap):
+            self._embeddings.flush()
+        self.embeddings_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.embeddings_file, "ab") as f:
+            f.truncate(capacity * self.dimensions * 4)
+        return np.memmap(self.embeddings_file, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
+
+    def _reserve(self, num_rows: int) -> None:
+        """Make sure there is room for `num_rows` more embeddings, doubling the capacity when needed"""
+        required = self._count + num_rows
+        if required <= self.capacity:
+            return
+        capacity = max(self.capacity, self.initial_capacity)
+        while capacity < required:
+            capacity *= 2
+        self._embeddings = self._open_embeddings(capacity)
+        norms = np.zeros(capacity, dtype=np.float32)
+        norms[: self._count] = self._norms[: self._count]
+        self._norms = norms
+
+    def _load(self) -> None:
+        """Load the documents and map the embeddings of a persisted collection"""
+        if self.embeddings_file is None or self.documents_file is None:
+            return
+
+        logger.debug(f"Loading collection: {self.collection}")
+        records: Dict[int, Dict[str, Any]] = {}
+        with open(self.documents_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    # Later lines are upserts that replace the record at the same row
+                    records[record["row"]] = record
+        # Rows past the end of the collection are marked as deleted until they are written again
+        records = {row: record for row, record in records.items() if not record.get("deleted")}
+        self._count = max(records.keys()) + 1 if len(records) > 0 else 0
+        self._records = [records[row] for row in range(self._count)]
+        self._id_index = {record["id"]: row for row, record in enumerate(self._records)}
+        self._hash_index = {record["content_hash"]: row for row, record in enumerate(self._records)}
+
+        capacity = max(self.embeddings_file.stat().st_size // (self.dimensions * 4), self._count)
+        self._embeddings = self._open_embeddings(capacity)
+        self._norms = np.zeros(capacity, dtype=np.float32)
+        self._norms[: self._count] = np.linalg.norm(self._embeddings[: self._count], axis=1)
+
+    def create(self) -> None:
+        with self._lock:
+            if self.capacity == 0:
+                logger.debug(f"Creating collection: {self.collection}")
+                self._reserve(self.initial_capacity)
+            if self.documents_file is not None:
+                self.documents_file.parent.mkdir(parents=True, exist_ok=True)
+                self.documents_file.touch(exist_ok=True)
+
+    def doc_exists(self, document: Document) -> bool:
+        return self.get_content_hash(document) in self._hash_index
+
+    def docs_exist(self, documents: List[Document]) -> Set[str]:
+        return {
+            content_hash
+            for content_hash in (self.get_content_hash(document) for document in documents)
+            if content_hash in self._hash_index
+        }
+
+    def name_exists(self, name: str) -> bool:
+        return any(record["name"] == name for record in self._records)
+
+    def _write(self, documents: List[Document], upsert: bool) -> None:
+        Document.embed_documents(documents, embedder=self.embedder)
+        with self._lock:
+            self._reserve(len(documents))
+            new_records: List[Dict[str, Any]] = []
+            for document in documents:
+                cleaned_content = document.content.replace("\x00", "\ufffd")
+                content_hash = self.get_content_hash(document)
+                doc_id = document.id or content_hash
+                if upsert and doc_id in self._id_index:
+                    row = self._id_index[doc_id]
+                    self._hash_index.pop(self._records[row]["content_hash"], None)
+                elif not upsert and content_hash in self._hash_index:
+                    logger.debug(f"Skipping existing document: {document.name} ({document.meta_data})")
+                    continue
+                else:
+                    row = self._count
+                    self._count += 1
+                    self._records.append({})
+
+                embedding = np.asarray(document.embedding, dtype=np.float32)
+                if embedding.shape != (self.dimensions,):
+                    raise ValueError(f"Expected embedding of dimension {self.dimensions}, got {embedding.shape}")
+                self._embeddings[row] = embedding
+                self._norms[row] = np.linalg.norm(embedding)
+
+                record = {
+                    "row": row,
+                    "id": doc_id,
+                    "name": document.name,
+                    "meta_data": document.meta_data,
+                    "content": cleaned_content,
+                    "usage": document.usage,
+                    "content_hash": content_hash,
+                }
+                self._records[row] = record
+                self._id_index[doc_id] = row
+                self._hash_index[content_hash] = row
+                new_records.append(record)
+
+            if self.documents_file is not None and len(new_records) > 0:
+                if isinstance(self._embeddings, np.memmap):
+                    self._embeddings.flush()
+                # Append only, upserted records replace earlier records with the same row when loading
+                with open(self.documents_file, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(record) + "\n" for record in new_records)
+            logger.debug(f"Committed {len(new_records)} documents")
+
+    def insert(self, documents: List[Document]) -> None:
+        """Append documents to the collection, skipping documents whose content already exists"""
+        self._write(documents, upsert=False)
+
+    def upsert_available(self) -> bool:
+        return True
+
+    def upsert(self, documents: List[Document]) -> None:
+        """Insert documents, replacing documents that have the same id"""
+        self._write(documents, upsert=True)
+
+    def _matches(self, record: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+        meta_data = record["meta_data"] or {}
+        for key, value in filters.items():
+            if key == "name":
+                if record["name"] != value:
+                    return False
+            elif meta_data.get(key) != value:
+                return False
+        return True
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        query_embedding = self.embedder.get_cached_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+        return self.search_by_embedding(query_embedding, limit=limit, filters=filters)
+
+    def search_by_embedding(
+        self, query_embedding: List[float], limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """Returns the `limit` documents closest to the query embedding, optionally filtered by name and meta_data"""
+        with self._lock:
+            count = self._count
+            if count == 0 or limit <= 0:
+                return []
+            embeddings = self._embeddings[:count]
+            query_vector = np.asarray(query_embedding, dtype=np.float32)
+
+            # Higher scores are closer for every distance metric
+            scores = embeddings @ query_vector
+            if self.distance == Distance.cosine:
+                scores = scores / np.maximum(self._norms[:count] * np.linalg.norm(query_vector), 1e-12)
+            elif self.distance == Distance.l2:
+                # ||x - q||^2 = ||x||^2 - 2 x.q + ||q||^2, the ||q||^2 term does not change the ranking
+                scores = 2 * scores - np.square(self._norms[:count])
+
+            if filters:
+                mask = np.fromiter(
+                    (self._matches(record, filters) for record in self._records[:count]), dtype=bool, count=count
+                )
+                scores = np.where(mask, scores, -np.inf)
+                count = int(mask.sum())
+                if count == 0:
+                    return []
+
+            k = min(limit, count)
+            # argpartition selects the top k in linear time, only those k are sorted
+            top_k = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+            top_k = top_k[np.argsort(-scores[top_k], kind="stable")][:k]
+
+            search_results: List[Document] = []
+            for row in top_k:
+                record = self._records[row]
+                search_results.append(
+                    Document(
+                        id=record["id"],
+                        name=record["name"],
+                        meta_data=record["meta_data"],
+                        content=record["content"],
+                        embedder=self.embedder,
+                        embedding=embeddings[row].tolist(),
+                        usage=record["usage"],
+                    )
+                )
+            return search_results
+
+    def delete_by_content_hash(self, content_hashes: List[str]) -> None:
+        """Delete the documents with the given content hashes.
+
+        The last row is moved into the row of each deleted document so the embeddings stay contiguous.
+        """
+        with self._lock:
+            num_rows = self._count
+            moved_records: List[Dict[str, Any]] = []
+            for content_hash in content_hashes:
+                row = self._hash_index.pop(content_hash, None)
+                if row is None:
+                    continue
+                if self._id_index.get(self._records[row]["id"]) == row:
+                    del self._id_index[self._records[row]["id"]]
+                last = self._count - 1
+                if row != last:
+                    record = dict(self._records[last], row=row)
+                    self._embeddings[row] = self._embeddings[last]
+                    self._norms[row] = self._norms[last]
+                    self._records[row] = record
+                    self._id_index[record["id"]] = row
+                    self._hash_index[record["content_hash"]] = row
+                    moved_records.append(record)
+                self._records.pop()
+                self._count -= 1
+
+            if self.documents_file is not None and self._count < num_rows:
+                if isinstance(self._embeddings, np.memmap):
+                    self._embeddings.flush()
+                # Moved records replace the records at their new row, rows past the end are marked as deleted
+                with open(self.documents_file, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(record) + "\n" for record in moved_records)
+                    f.writelines(
+                        json.dumps({"row": row, "deleted": True}) + "\n" for row in range(self._count, num_rows)
+                    )
+            logger.debug(f"Deleted {num_rows - self._count} documents")
+
+    def delete(self) -> None:
+        with self._lock:
+            logger.debug(f"Deleting collection: {self.collection}")
+            self._reset()
+            for file in (self.embeddings_file, self.documents_file):
+                if file is not None and file.exists():
+                    file.unlink()
+
+    def _reset(self) -> None:
+        if isinstance(self._embeddings, np.memmap):
+            self._embeddings.flush()
+        self._embeddings = np.empty((0, self.dimensions), dtype=np.float32)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._count = 0
+        self._records = []
+        self._id_index = {}
+        self._hash_index = {}
+
+    def exists(self) -> bool:
+        if self.documents_file is not None:
+            return self.documents_file.exists() and self.embeddings_file is not None and self.embeddings_file.exists()
+        return self.capacity > 0
+
+    def get_count(self) -> int:
+        return self._count
+
+    def optimize(self) -> None:
+        """Rewrite the documents file with one line per document, dropping replaced records"""
+        with self._lock:
+            if self.documents_file is None:
+                return
+            logger.debug(f"Compacting collection: {self.collection}")
+            if isinstance(self._embeddings, np.memmap):
+                self._embeddings.flush()
+            tmp_file = self.documents_file.with_suffix(".jsonl.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(record) + "\n" for record in self._records)
+            tmp_file.replace(self.documents_file)
+
+    def clear(self) -> bool:
+        self.delete()
+        self.create()
+        return True
@@ -0,0 +1,64 @@
+import json
+from io import StringIO
+from typing import Any, Dict, List
+
+try:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.schema import Table
+except ImportError:
+    raise ImportError("`sqlalchemy` not installed")
+
+from phi.utils.log import logger
+
+
+def _copy_value(value: Any) -> str:
+    """Format a value for the PostgreSQL COPY text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (list, tuple)):
+        # pgvector accepts the '[1.0,2.0,...]' text representation
+        value = "[" + ",".join(str(float(v)) for v in value) + "]"
+    elif isinstance(value, dict):
+        value = json.dumps(value)
+    else:
+        value = str(value)
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(db_engine: Engine, table: Table, rows: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+    """Write rows to a table using COPY FROM STDIN, committing after every `batch_size` rows.
+
+    COPY does not support ON CONFLICT, so this should only be used to load fresh tables.
+    Works with both the psycopg2 and psycopg (3) drivers.
+    """
+    if len(rows) == 0:
+        return 0
+
+    columns = list(rows[0].keys())
+    preparer = db_engine.dialect.identifier_preparer
+    copy_sql = f"COPY {preparer.format_table(table)} ({', '.join(preparer.quote(c) for c in columns)}) FROM STDIN"
+
+    num_rows = 0
+    raw_connection = db_engine.raw_connection()
+    try:
+        cursor = raw_connection.cursor()
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i : i + batch_size]
+            data = "".join("\t".join(_copy_value(row.get(c)) for c in columns) + "\n" for row in batch)
+            if hasattr(cursor, "copy_expert"):
+                # psycopg2
+                cursor.copy_expert(copy_sql, StringIO(data))
+            else:
+                # psycopg 3
+                with cursor.copy(copy_sql) as copy:
+                    copy.write(data)
+            raw_connection.commit()
+            num_rows += len(batch)
+            logger.info(f"Copied {len(batch)} documents")
+        cursor.close()
+    except Exception:
+        raw_connection.rollback()
+        raise
+    finally:
+        raw_connection.close()
+    return num_rows
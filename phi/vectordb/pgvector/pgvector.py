@@ -1,4 +1,4 @@
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Set, Dict, Any
 from hashlib import md5
 
 try:
@@ -21,6 +21,7 @@ from phi.document import Document
 from phi.embedder import Embedder
 from phi.vectordb.base import VectorDb
 from phi.vectordb.distance import Distance
+from phi.vectordb.pgvector.bulk import copy_rows
 from phi.vectordb.pgvector.index import Ivfflat, HNSW
 from phi.utils.log import logger
 
@@ -35,6 +36,7 @@ class PgVector(VectorDb):
         embedder: Optional[Embedder] = None,
         distance: Distance = Distance.cosine,
         index: Optional[Union[Ivfflat, HNSW]] = HNSW(),
+        use_copy: bool = False,
     ):
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
@@ -67,6 +69,10 @@ class PgVector(VectorDb):
         # Index for the collection
         self.index: Optional[Union[Ivfflat, HNSW]] = index
 
+        # Write documents using COPY instead of INSERT on insert()
+        # COPY is the fastest way to load a fresh collection but does not skip duplicates
+        self.use_copy: bool = use_copy
+
         # Database session
         self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
 
@@ -123,6 +129,25 @@ class PgVector(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
+    def docs_exist(self, documents: List[Document], batch_size: int = 1000) -> Set[str]:
+        """
+        Returns the content hashes of the documents that already exist, using one query per batch
+
+        Args:
+            documents (List[Document]): Documents to validate
+            batch_size (int): Number of content hashes to look up per query
+        """
+        content_hashes = list({self.get_content_hash(document) for document in documents})
+        existing_hashes: Set[str] = set()
+        with self.Session() as sess:
+            with sess.begin():
+                for i in range(0, len(content_hashes), batch_size):
+                    stmt = select(self.table.c.content_hash).where(
+                        self.table.c.content_hash.in_(content_hashes[i : i + batch_size])
+                    )
+                    existing_hashes.update(row.content_hash for row in sess.execute(stmt))
+        return existing_hashes
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -136,69 +161,69 @@ class PgVector(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
-    def insert(self, documents: List[Document], batch_size: int = 10) -> None:
-        with self.Session() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                stmt = postgresql.insert(self.table).values(
-                    name=document.name,
-                    meta_data=document.meta_data,
-                    content=cleaned_content,
-                    embedding=document.embedding,
-                    usage=document.usage,
-                    content_hash=md5(cleaned_content.encode()).hexdigest(),
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+    def _get_row(self, document: Document) -> Dict[str, Any]:
+        cleaned_content = document.content.replace("\x00", "\ufffd")
+        return dict(
+            name=document.name,
+            meta_data=document.meta_data,
+            content=cleaned_content,
+            embedding=document.embedding,
+            usage=document.usage,
+            content_hash=md5(cleaned_content.encode()).hexdigest(),
+        )
 
-                # Commit every `batch_size` documents
-                if counter >= batch_size:
-                    sess.commit()
-                    logger.debug(f"Committed {counter} documents")
-                    counter = 0
+    def insert(self, documents: List[Document], batch_size: int = 100) -> None:
+        Document.embed_documents(documents, embedder=self.embedder)
+        rows = [self._get_row(document) for document in documents]
+        if len(rows) == 0:
+            return
 
-            # Commit any remaining documents
-            if counter > 0:
+        if self.use_copy:
+            copy_rows(db_engine=self.db_engine, table=self.table, rows=rows, batch_size=batch_size)
+            return
+
+        with self.Session() as sess:
+            for i in range(0, len(rows), batch_size):
+                batch_rows = rows[i : i + batch_size]
+                sess.execute(postgresql.insert(self.table).values(batch_rows))
                 sess.commit()
-                logger.debug(f"Committed {counter} documents")
+                logger.debug(f"Committed {len(batch_rows)} documents")
 
-    def upsert(self, documents: List[Document]) -> None:
+    def upsert(self, documents: List[Document], batch_size: int = 100) -> None:
         """
-        Upsert documents into the database.
+        Upsert documents into the database using one multi-row INSERT ... ON CONFLICT per batch.
 
         Args:
             documents (List[Document]): List of documents to upsert
+            batch_size (int): Number of documents to write per statement
         """
+        Document.embed_documents(documents, embedder=self.embedder)
+        # A single statement cannot update the same row twice, so keep the last document for each key
+        rows = list(
+            {
+                (row["name"], row["content_hash"]): row for row in (self._get_row(document) for document in documents)
+            }.values()
+        )
+
         with self.Session() as sess:
             with sess.begin():
-                for document in documents:
-                    document.embed(embedder=self.embedder)
-                    cleaned_content = document.content.replace("\x00", "\ufffd")
-                    stmt = postgresql.insert(self.table).values(
-                        name=document.name,
-                        meta_data=document.meta_data,
-                        content=cleaned_content,
-                        embedding=document.embedding,
-                        usage=document.usage,
-                        content_hash=md5(cleaned_content.encode()).hexdigest(),
-                    )
+                for i in range(0, len(rows), batch_size):
+                    batch_rows = rows[i : i + batch_size]
+                    stmt = postgresql.insert(self.table).values(batch_rows)
                     stmt = stmt.on_conflict_do_update(
                         index_elements=["name", "content_hash"],
                         set_=dict(
-                            meta_data=document.meta_data,
+                            meta_data=stmt.excluded.meta_data,
                             content=stmt.excluded.content,
                             embedding=stmt.excluded.embedding,
                             usage=stmt.excluded.usage,
                         ),
                     )
                     sess.execute(stmt)
-                    logger.debug(f"Upserted document: {document.name} ({document.meta_data})")
+                    logger.debug(f"Upserted {len(batch_rows)} documents")
 
     def search(self, query: str, limit: int = 5) -> List[Document]:
-        query_embedding = self.embedder.get_embedding(query)
+        query_embedding = self.embedder.get_cached_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
@@ -248,6 +273,23 @@ class PgVector(VectorDb):
 
         return search_results
 
+    def delete_by_content_hash(self, content_hashes: List[str], batch_size: int = 1000) -> None:
+        """
+        Delete the documents with the given content hashes, using one statement per batch
+
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+            batch_size (int): Number of content hashes to delete per statement
+        """
+        from sqlalchemy import delete
+
+        with self.Session() as sess:
+            with sess.begin():
+                for i in range(0, len(content_hashes), batch_size):
+                    stmt = delete(self.table).where(self.table.c.content_hash.in_(content_hashes[i : i + batch_size]))
+                    sess.execute(stmt)
+        logger.debug(f"Deleted {len(content_hashes)} documents")
+
     def delete(self) -> None:
         if self.table_exists():
             logger.debug(f"Deleting table: {self.collection}")
@@ -1,9 +1,9 @@
-from typing import Optional, List, Union, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Union, Dict, Any, Set, Sequence
 from hashlib import md5
 
 try:
     from sqlalchemy.dialects import postgresql
-    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.engine import create_engine, Engine, Row
     from sqlalchemy.inspection import inspect
     from sqlalchemy.orm import Session, sessionmaker
     from sqlalchemy.schema import MetaData, Table, Column
@@ -21,8 +21,13 @@ from phi.document import Document
 from phi.embedder import Embedder
 from phi.vectordb.base import VectorDb
 from phi.vectordb.distance import Distance
+from phi.vectordb.pgvector.bulk import copy_rows
 from phi.vectordb.pgvector.index import Ivfflat, HNSW
 from phi.utils.log import logger
+from phi.utils.run_async import run_in_thread
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
 
 class PgVector2(VectorDb):
@@ -32,9 +37,11 @@ class PgVector2(VectorDb):
         schema: Optional[str] = "ai",
         db_url: Optional[str] = None,
         db_engine: Optional[Engine] = None,
+        async_db_engine: Optional["AsyncEngine"] = None,
         embedder: Optional[Embedder] = None,
         distance: Distance = Distance.cosine,
         index: Optional[Union[Ivfflat, HNSW]] = HNSW(),
+        use_copy: bool = False,
     ):
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
@@ -50,6 +57,9 @@ class PgVector2(VectorDb):
         # Database attributes
         self.db_url: Optional[str] = db_url
         self.db_engine: Engine = _engine
+        # Async engine used by async_search, async_insert and async_upsert.
+        # If not provided, it is created from the db_engine url when the url uses the async capable psycopg driver.
+        self._async_db_engine: Optional["AsyncEngine"] = async_db_engine
         self.metadata: MetaData = MetaData(schema=self.schema)
 
         # Embedder for embedding the document contents
@@ -67,12 +77,27 @@ class PgVector2(VectorDb):
         # Index for the collection
         self.index: Optional[Union[Ivfflat, HNSW]] = index
 
+        # Write documents using COPY instead of INSERT on insert()
+        # COPY is the fastest way to load a fresh collection but fails if a document id already exists
+        self.use_copy: bool = use_copy
+
         # Database session
         self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
 
         # Database table for the collection
         self.table: Table = self.get_table()
 
+    @property
+    def async_db_engine(self) -> Optional["AsyncEngine"]:
+        if self._async_db_engine is None and self.db_engine.url.drivername == "postgresql+psycopg":
+            try:
+                from sqlalchemy.ext.asyncio import create_async_engine
+            except ImportError:
+                logger.debug("`sqlalchemy[asyncio]` not installed, async queries will run in a thread")
+                return None
+            self._async_db_engine = create_async_engine(self.db_engine.url)
+        return self._async_db_engine
+
     def get_table(self) -> Table:
         return Table(
             self.collection,
@@ -124,6 +149,25 @@ class PgVector2(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
+    def docs_exist(self, documents: List[Document], batch_size: int = 1000) -> Set[str]:
+        """
+        Returns the content hashes of the documents that already exist, using one query per batch
+
+        Args:
+            documents (List[Document]): Documents to validate
+            batch_size (int): Number of content hashes to look up per query
+        """
+        content_hashes = list({self.get_content_hash(document) for document in documents})
+        existing_hashes: Set[str] = set()
+        with self.Session() as sess:
+            with sess.begin():
+                for i in range(0, len(content_hashes), batch_size):
+                    stmt = select(self.table.c.content_hash).where(
+                        self.table.c.content_hash.in_(content_hashes[i : i + batch_size])
+                    )
+                    existing_hashes.update(row.content_hash for row in sess.execute(stmt))
+        return existing_hashes
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -150,98 +194,184 @@ class PgVector2(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
-    def insert(self, documents: List[Document], batch_size: int = 10) -> None:
-        with self.Session() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-                stmt = postgresql.insert(self.table).values(
-                    id=_id,
-                    name=document.name,
-                    meta_data=document.meta_data,
-                    content=cleaned_content,
-                    embedding=document.embedding,
-                    usage=document.usage,
-                    content_hash=content_hash,
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+    def _get_row(self, document: Document) -> Dict[str, Any]:
+        cleaned_content = document.content.replace("\x00", "\ufffd")
+        content_hash = md5(cleaned_content.encode()).hexdigest()
+        return dict(
+            id=document.id or content_hash,
+            name=document.name,
+            meta_data=document.meta_data,
+            content=cleaned_content,
+            embedding=document.embedding,
+            usage=document.usage,
+            content_hash=content_hash,
+        )
+
+    def insert(self, documents: List[Document], batch_size: int = 100) -> None:
+        """
+        Insert documents into the database using one multi-row INSERT per batch.
+        If `use_copy` is True, documents are written using COPY instead.
+
+        Args:
+            documents (List[Document]): List of documents to insert
+            batch_size (int): Number of documents to write and commit per batch
+        """
+        Document.embed_documents(documents, embedder=self.embedder)
+        rows = [self._get_row(document) for document in documents]
+        if len(rows) == 0:
+            return
 
-                # Commit every `batch_size` documents
-                if counter >= batch_size:
-                    sess.commit()
-                    logger.info(f"Committed {counter} documents")
-                    counter = 0
+        if self.use_copy:
+            copy_rows(db_engine=self.db_engine, table=self.table, rows=rows, batch_size=batch_size)
+            return
 
-            # Commit any remaining documents
-            if counter > 0:
+        with self.Session() as sess:
+            for i in range(0, len(rows), batch_size):
+                batch_rows = rows[i : i + batch_size]
+                sess.execute(postgresql.insert(self.table).values(batch_rows))
                 sess.commit()
-                logger.info(f"Committed {counter} documents")
+                logger.info(f"Committed {len(batch_rows)} documents")
+
+    async def async_insert(self, documents: List[Document], batch_size: int = 100) -> None:
+        """
+        Async version of `insert`. Documents are embedded asynchronously and written using the async engine.
+        If no async engine is available, or `use_copy` is True, the write runs in a thread.
+
+        Args:
+            documents (List[Document]): List of documents to insert
+            batch_size (int): Number of documents to write and commit per batch
+        """
+        await Document.aembed_documents(documents, embedder=self.embedder)
+        async_db_engine = self.async_db_engine
+        if async_db_engine is None or self.use_copy:
+            await run_in_thread(self.insert, documents, batch_size)
+            return
+
+        rows = [self._get_row(document) for document in documents]
+        for i in range(0, len(rows), batch_size):
+            batch_rows = rows[i : i + batch_size]
+            async with async_db_engine.begin() as conn:
+                await conn.execute(postgresql.insert(self.table).values(batch_rows))
+            logger.info(f"Committed {len(batch_rows)} documents")
 
     def upsert_available(self) -> bool:
         return True
 
-    def upsert(self, documents: List[Document], batch_size: int = 20) -> None:
+    def upsert(self, documents: List[Document], batch_size: int = 100) -> None:
         """
-        Upsert documents into the database.
+        Upsert documents into the database using one multi-row INSERT ... ON CONFLICT per batch.
 
         Args:
             documents (List[Document]): List of documents to upsert
             batch_size (int): Batch size for upserting documents
         """
+        Document.embed_documents(documents, embedder=self.embedder)
+        # A single statement cannot update the same row twice, so keep the last document for each id
+        rows = list({row["id"]: row for row in (self._get_row(document) for document in documents)}.values())
+
         with self.Session() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-                stmt = postgresql.insert(self.table).values(
-                    id=_id,
-                    name=document.name,
-                    meta_data=document.meta_data,
-                    content=cleaned_content,
-                    embedding=document.embedding,
-                    usage=document.usage,
-                    content_hash=content_hash,
-                )
-                # Update row when id matches but 'content_hash' is different
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["id"],
-                    set_=dict(
-                        name=stmt.excluded.name,
-                        meta_data=stmt.excluded.meta_data,
-                        content=stmt.excluded.content,
-                        embedding=stmt.excluded.embedding,
-                        usage=stmt.excluded.usage,
-                        content_hash=stmt.excluded.content_hash,
-                    ),
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Upserted document: {document.id} | {document.name} | {document.meta_data}")
+            for i in range(0, len(rows), batch_size):
+                batch_rows = rows[i : i + batch_size]
+                sess.execute(self._get_upsert_statement(batch_rows))
+                sess.commit()
+                logger.info(f"Committed {len(batch_rows)} documents")
 
-                # Commit every `batch_size` documents
-                if counter >= batch_size:
-                    sess.commit()
-                    logger.info(f"Committed {counter} documents")
-                    counter = 0
+    async def async_upsert(self, documents: List[Document], batch_size: int = 100) -> None:
+        """
+        Async version of `upsert`. Documents are embedded asynchronously and written using the async engine.
+        If no async engine is available, the write runs in a thread.
 
-            # Commit any remaining documents
-            if counter > 0:
-                sess.commit()
-                logger.info(f"Committed {counter} documents")
+        Args:
+            documents (List[Document]): List of documents to upsert
+            batch_size (int): Batch size for upserting documents
+        """
+        await Document.aembed_documents(documents, embedder=self.embedder)
+        async_db_engine = self.async_db_engine
+        if async_db_engine is None:
+            await run_in_thread(self.upsert, documents, batch_size)
+            return
+
+        rows = list({row["id"]: row for row in (self._get_row(document) for document in documents)}.values())
+        for i in range(0, len(rows), batch_size):
+            batch_rows = rows[i : i + batch_size]
+            async with async_db_engine.begin() as conn:
+                await conn.execute(self._get_upsert_statement(batch_rows))
+            logger.info(f"Committed {len(batch_rows)} documents")
+
+    def _get_upsert_statement(self, rows: List[Dict[str, Any]]):
+        stmt = postgresql.insert(self.table).values(rows)
+        # Update row when id matches but 'content_hash' is different
+        return stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_=dict(
+                name=stmt.excluded.name,
+                meta_data=stmt.excluded.meta_data,
+                content=stmt.excluded.content,
+                embedding=stmt.excluded.embedding,
+                usage=stmt.excluded.usage,
+                content_hash=stmt.excluded.content_hash,
+            ),
+        )
 
     def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
-        query_embedding = self.embedder.get_embedding(query)
+        query_embedding = self.embedder.get_cached_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
+        return self._search_by_embedding(query_embedding=query_embedding, limit=limit, filters=filters)
 
+    def _search_by_embedding(
+        self, query_embedding: List[float], limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        stmt = self._get_search_statement(query_embedding=query_embedding, limit=limit, filters=filters)
+        logger.debug(f"Query: {stmt}")
+
+        # Get neighbors
+        try:
+            with self.Session() as sess:
+                with sess.begin():
+                    for setting in self._get_search_settings():
+                        sess.execute(setting)
+                    neighbors = sess.execute(stmt).fetchall() or []
+        except Exception as e:
+            logger.error(f"Error searching for documents: {e}")
+            logger.error("Table might not exist, creating for future use")
+            self.create()
+            return []
+
+        return self._build_search_results(neighbors)
+
+    async def async_search(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        query_embedding = await self.embedder.aget_cached_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+
+        async_db_engine = self.async_db_engine
+        if async_db_engine is None:
+            # Only the query runs in a thread, the query is not embedded again
+            return await run_in_thread(self._search_by_embedding, query_embedding, limit, filters)
+
+        stmt = self._get_search_statement(query_embedding=query_embedding, limit=limit, filters=filters)
+        logger.debug(f"Query: {stmt}")
+
+        # Get neighbors
+        try:
+            async with async_db_engine.begin() as conn:
+                for setting in self._get_search_settings():
+                    await conn.execute(setting)
+                neighbors = (await conn.execute(stmt)).fetchall() or []
+        except Exception as e:
+            logger.error(f"Error searching for documents: {e}")
+            logger.error("Table might not exist, creating for future use")
+            await run_in_thread(self.create)
+            return []
+
+        return self._build_search_results(neighbors)
+
+    def _get_search_statement(self, query_embedding: List[float], limit: int, filters: Optional[Dict[str, Any]] = None):
         columns = [
             self.table.c.name,
             self.table.c.meta_data,
@@ -264,26 +394,17 @@ class PgVector2(VectorDb):
         if self.distance == Distance.max_inner_product:
             stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
 
-        stmt = stmt.limit(limit=limit)
-        logger.debug(f"Query: {stmt}")
+        return stmt.limit(limit=limit)
 
-        # Get neighbors
-        try:
-            with self.Session() as sess:
-                with sess.begin():
-                    if self.index is not None:
-                        if isinstance(self.index, Ivfflat):
-                            sess.execute(text(f"SET LOCAL ivfflat.probes = {self.index.probes}"))
-                        elif isinstance(self.index, HNSW):
-                            sess.execute(text(f"SET LOCAL hnsw.ef_search  = {self.index.ef_search}"))
-                    neighbors = sess.execute(stmt).fetchall() or []
-        except Exception as e:
-            logger.error(f"Error searching for documents: {e}")
-            logger.error("Table might not exist, creating for future use")
-            self.create()
-            return []
+    def _get_search_settings(self) -> List[Any]:
+        """Returns the statements that tune the index for the search transaction"""
+        if isinstance(self.index, Ivfflat):
+            return [text(f"SET LOCAL ivfflat.probes = {self.index.probes}")]
+        elif isinstance(self.index, HNSW):
+            return [text(f"SET LOCAL hnsw.ef_search  = {self.index.ef_search}")]
+        return []
 
-        # Build search results
+    def _build_search_results(self, neighbors: Sequence[Row]) -> List[Document]:
         search_results: List[Document] = []
         for neighbor in neighbors:
             search_results.append(
@@ -299,6 +420,23 @@ class PgVector2(VectorDb):
 
         return search_results
 
+    def delete_by_content_hash(self, content_hashes: List[str], batch_size: int = 1000) -> None:
+        """
+        Delete the documents with the given content hashes, using one statement per batch
+
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+            batch_size (int): Number of content hashes to delete per statement
+        """
+        from sqlalchemy import delete
+
+        with self.Session() as sess:
+            with sess.begin():
+                for i in range(0, len(content_hashes), batch_size):
+                    stmt = delete(self.table).where(self.table.c.content_hash.in_(content_hashes[i : i + batch_size]))
+                    sess.execute(stmt)
+        logger.debug(f"Deleted {len(content_hashes)} documents")
+
     def delete(self) -> None:
         if self.table_exists():
             logger.debug(f"Deleting table: {self.collection}")
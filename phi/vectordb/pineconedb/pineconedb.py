@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Union, List, Any
+from typing import Optional, Dict, Union, List, Any, Set
 
 try:
     from pinecone import Pinecone
@@ -166,6 +166,32 @@ class PineconeDB(VectorDb):
         response = self.index.fetch(ids=[document.id])
         return len(response.vectors) > 0
 
+    def docs_exist(self, documents: List[Document], batch_size: int = 1000) -> Set[str]:
+        """Return the content hashes of the documents that exist in the index.
+
+        Documents are looked up by id, using one fetch request per batch.
+
+        Args:
+            documents (List[Document]): The documents to check.
+            batch_size (int): The number of ids to fetch per request. Defaults to 1000.
+
+        Returns:
+            Set[str]: The content hashes of the documents that exist.
+
+        """
+        hashes_by_id: Dict[str, Set[str]] = {}
+        for document in documents:
+            if document.id is not None:
+                hashes_by_id.setdefault(document.id, set()).add(self.get_content_hash(document))
+
+        existing_hashes: Set[str] = set()
+        doc_ids = list(hashes_by_id.keys())
+        for i in range(0, len(doc_ids), batch_size):
+            response = self.index.fetch(ids=doc_ids[i : i + batch_size])
+            for doc_id in response.vectors:
+                existing_hashes.update(hashes_by_id.get(doc_id, set()))
+        return existing_hashes
+
     def name_exists(self, name: str) -> bool:
         """Check if an index with the given name exists.
 
@@ -200,8 +226,8 @@ class PineconeDB(VectorDb):
         """
 
         vectors = []
+        Document.embed_documents(documents, embedder=self.embedder)
         for document in documents:
-            document.embed(embedder=self.embedder)
             document.meta_data["text"] = document.content
             vectors.append(
                 Vector(
@@ -262,7 +288,7 @@ class PineconeDB(VectorDb):
             List[Document]: The list of matching documents.
 
         """
-        query_embedding = self.embedder.get_embedding(query)
+        query_embedding = self.embedder.get_cached_embedding(query)
 
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
@@ -1,8 +1,9 @@
 from hashlib import md5
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
+from uuid import UUID
 
 try:
-    from qdrant_client import QdrantClient  # noqa: F401
+    from qdrant_client import QdrantClient, AsyncQdrantClient  # noqa: F401
     from qdrant_client.http import models
 except ImportError:
     raise ImportError(
@@ -15,6 +16,7 @@ from phi.embedder.openai import OpenAIEmbedder
 from phi.vectordb.base import VectorDb
 from phi.vectordb.distance import Distance
 from phi.utils.log import logger
+from phi.utils.run_async import run_in_thread
 
 
 class Qdrant(VectorDb):
@@ -46,8 +48,9 @@ class Qdrant(VectorDb):
         # Distance metric
         self.distance: Distance = distance
 
-        # Qdrant client instance
+        # Qdrant client instances
         self._client: Optional[QdrantClient] = None
+        self._async_client: Optional[AsyncQdrantClient] = None
 
         # Qdrant client arguments
         self.location: Optional[str] = location
@@ -85,6 +88,33 @@ class Qdrant(VectorDb):
             )
         return self._client
 
+    @property
+    def is_local(self) -> bool:
+        """True if the collection is stored in memory or on disk by this process instead of on a Qdrant server.
+        Local collections can only be opened by one client, so async calls use the sync client in a thread.
+        """
+        return self.location == ":memory:" or self.path is not None
+
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        if self._async_client is None:
+            logger.debug("Creating Async Qdrant Client")
+            self._async_client = AsyncQdrantClient(
+                location=self.location,
+                url=self.url,
+                port=self.port,
+                grpc_port=self.grpc_port,
+                prefer_grpc=self.prefer_grpc,
+                https=self.https,
+                api_key=self.api_key,
+                prefix=self.prefix,
+                timeout=self.timeout,
+                host=self.host,
+                path=self.path,
+                **self.kwargs,
+            )
+        return self._async_client
+
     def create(self) -> None:
         # Collection distance
         _distance = models.Distance.COSINE
@@ -117,6 +147,32 @@ class Qdrant(VectorDb):
             return len(collection_points) > 0
         return False
 
+    def docs_exist(self, documents: List[Document], batch_size: int = 1000) -> Set[str]:
+        """
+        Returns the content hashes of the documents that already exist, using one request per batch
+
+        Args:
+            documents (List[Document]): Documents to validate
+            batch_size (int): Number of ids to retrieve per request
+        """
+        existing_ids: Set[str] = set()
+        if self.client:
+            # Qdrant returns md5 hex ids in UUID format
+            ids_by_uuid: Dict[str, str] = {
+                str(UUID(doc_id)): doc_id for doc_id in {self.get_content_hash(document) for document in documents}
+            }
+            doc_ids = list(ids_by_uuid.values())
+            for i in range(0, len(doc_ids), batch_size):
+                collection_points = self.client.retrieve(
+                    collection_name=self.collection,
+                    ids=doc_ids[i : i + batch_size],
+                    with_payload=False,
+                    with_vectors=False,
+                )
+                for point in collection_points:
+                    existing_ids.add(ids_by_uuid.get(str(point.id), str(point.id)))
+        return existing_ids
+
     def name_exists(self, name: str) -> bool:
         """
         Validates if a document with the given name exists in the collection.
@@ -138,11 +194,9 @@ class Qdrant(VectorDb):
             return len(scroll_result[0]) > 0
         return False
 
-    def insert(self, documents: List[Document], batch_size: int = 10) -> None:
-        logger.debug(f"Inserting {len(documents)} documents")
+    def _get_points(self, documents: List[Document]) -> List[models.PointStruct]:
         points = []
         for document in documents:
-            document.embed(embedder=self.embedder)
             cleaned_content = document.content.replace("\x00", "\ufffd")
             doc_id = md5(cleaned_content.encode()).hexdigest()
             points.append(
@@ -158,10 +212,27 @@ class Qdrant(VectorDb):
                 )
             )
             logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+        return points
+
+    def insert(self, documents: List[Document], batch_size: int = 10) -> None:
+        logger.debug(f"Inserting {len(documents)} documents")
+        Document.embed_documents(documents, embedder=self.embedder)
+        points = self._get_points(documents)
         if len(points) > 0:
             self.client.upsert(collection_name=self.collection, wait=False, points=points)
         logger.debug(f"Upsert {len(points)} documents")
 
+    async def async_insert(self, documents: List[Document]) -> None:
+        logger.debug(f"Inserting {len(documents)} documents")
+        await Document.aembed_documents(documents, embedder=self.embedder)
+        points = self._get_points(documents)
+        if len(points) > 0:
+            if self.is_local:
+                await run_in_thread(self.client.upsert, collection_name=self.collection, wait=False, points=points)
+            else:
+                await self.async_client.upsert(collection_name=self.collection, wait=False, points=points)
+        logger.debug(f"Upsert {len(points)} documents")
+
     def upsert(self, documents: List[Document]) -> None:
         """
         Upsert documents into the database.
@@ -172,8 +243,12 @@ class Qdrant(VectorDb):
         logger.debug("Redirecting the request to insert")
         self.insert(documents)
 
+    async def async_upsert(self, documents: List[Document]) -> None:
+        logger.debug("Redirecting the request to insert")
+        await self.async_insert(documents)
+
     def search(self, query: str, limit: int = 5) -> List[Document]:
-        query_embedding = self.embedder.get_embedding(query)
+        query_embedding = self.embedder.get_cached_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
@@ -185,8 +260,28 @@ class Qdrant(VectorDb):
             with_payload=True,
             limit=limit,
         )
+        return self._build_search_results(results)
 
-        # Build search results
+    async def async_search(self, query: str, limit: int = 5) -> List[Document]:
+        query_embedding = await self.embedder.aget_cached_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+
+        search_kwargs = dict(
+            collection_name=self.collection,
+            query_vector=query_embedding,
+            with_vectors=True,
+            with_payload=True,
+            limit=limit,
+        )
+        if self.is_local:
+            results = await run_in_thread(self.client.search, **search_kwargs)
+        else:
+            results = await self.async_client.search(**search_kwargs)
+        return self._build_search_results(results)
+
+    def _build_search_results(self, results: List[models.ScoredPoint]) -> List[Document]:
         search_results: List[Document] = []
         for result in results:
             if result.payload is None:
@@ -204,6 +299,22 @@ class Qdrant(VectorDb):
 
         return search_results
 
+    def delete_by_content_hash(self, content_hashes: List[str], batch_size: int = 1000) -> None:
+        """
+        Delete the documents with the given content hashes, using one request per batch
+
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+            batch_size (int): Number of ids to delete per request
+        """
+        if self.client:
+            for i in range(0, len(content_hashes), batch_size):
+                self.client.delete(
+                    collection_name=self.collection,
+                    points_selector=models.PointIdsList(points=list(content_hashes[i : i + batch_size])),
+                )
+            logger.debug(f"Deleted {len(content_hashes)} documents")
+
     def delete(self) -> None:
         if self.exists():
             logger.debug(f"Deleting collection: {self.collection}")
@@ -1,5 +1,5 @@
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from hashlib import md5
 
 try:
@@ -141,6 +141,24 @@ class S2VectorDb(VectorDb):
             result = sess.execute(stmt).first()
             return result is not None
 
+    def docs_exist(self, documents: List[Document], batch_size: int = 1000) -> Set[str]:
+        """
+        Returns the content hashes of the documents that already exist, using one query per batch
+
+        Args:
+            documents (List[Document]): Documents to validate
+            batch_size (int): Number of content hashes to look up per query
+        """
+        content_hashes = list({self.get_content_hash(document) for document in documents})
+        existing_hashes: Set[str] = set()
+        with self.Session.begin() as sess:
+            for i in range(0, len(content_hashes), batch_size):
+                stmt = select(self.table.c.content_hash).where(
+                    self.table.c.content_hash.in_(content_hashes[i : i + batch_size])
+                )
+                existing_hashes.update(row.content_hash for row in sess.execute(stmt))
+        return existing_hashes
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -165,92 +183,62 @@ class S2VectorDb(VectorDb):
             result = sess.execute(stmt).first()
             return result is not None
 
-    def insert(self, documents: List[Document], batch_size: int = 10) -> None:
+    def _get_row(self, document: Document) -> Dict[str, Any]:
+        cleaned_content = document.content.replace("\x00", "\ufffd")
+        content_hash = md5(cleaned_content.encode()).hexdigest()
+        return dict(
+            id=document.id or content_hash,
+            name=document.name,
+            meta_data=json.dumps(document.meta_data),
+            content=cleaned_content,
+            # Convert embedding to a JSON array string
+            embedding=json.dumps(document.embedding),
+            usage=json.dumps(document.usage),
+            content_hash=content_hash,
+        )
+
+    def insert(self, documents: List[Document], batch_size: int = 100) -> None:
         """
-        Insert documents into the table.
+        Insert documents into the table using one multi-row INSERT per batch.
 
         Args:
             documents (List[Document]): List of documents to insert.
             batch_size (int): Number of documents to insert in each batch.
         """
+        Document.embed_documents(documents, embedder=self.embedder)
+        rows = [self._get_row(document) for document in documents]
         with self.Session.begin() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-
-                meta_data_json = json.dumps(document.meta_data)
-                usage_json = json.dumps(document.usage)
-
-                # Convert embedding to a JSON array string
-                embedding_json = json.dumps(document.embedding)
-
-                stmt = mysql.insert(self.table).values(
-                    id=_id,
-                    name=document.name,
-                    meta_data=meta_data_json,
-                    content=cleaned_content,
-                    embedding=embedding_json,  # Properly formatted embedding as a JSON array string
-                    usage=usage_json,
-                    content_hash=content_hash,
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+            for i in range(0, len(rows), batch_size):
+                batch_rows = rows[i : i + batch_size]
+                sess.execute(mysql.insert(self.table).values(batch_rows))
+                logger.debug(f"Inserted {len(batch_rows)} documents")
+            logger.debug(f"Committed {len(rows)} documents")
 
-            sess.commit()
-            logger.debug(f"Committed {counter} documents")
-
-    def upsert(self, documents: List[Document], batch_size: int = 20) -> None:
+    def upsert(self, documents: List[Document], batch_size: int = 100) -> None:
         """
-        Upsert (insert or update) documents in the table.
+        Upsert (insert or update) documents in the table using one multi-row INSERT ... ON DUPLICATE KEY per batch.
 
         Args:
             documents (List[Document]): List of documents to upsert.
             batch_size (int): Number of documents to upsert in each batch.
         """
+        Document.embed_documents(documents, embedder=self.embedder)
+        rows = [self._get_row(document) for document in documents]
         with self.Session.begin() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-
-                meta_data_json = json.dumps(document.meta_data)
-                usage_json = json.dumps(document.usage)
-
-                # Convert embedding to a JSON array string
-                embedding_json = json.dumps(document.embedding)
-
-                stmt = (
-                    mysql.insert(self.table)
-                    .values(
-                        id=_id,
-                        name=document.name,
-                        meta_data=meta_data_json,
-                        content=cleaned_content,
-                        embedding=embedding_json,
-                        usage=usage_json,
-                        content_hash=content_hash,
-                    )
-                    .on_duplicate_key_update(
-                        name=document.name,
-                        meta_data=meta_data_json,
-                        content=cleaned_content,
-                        embedding=embedding_json,
-                        usage=usage_json,
-                        content_hash=content_hash,
-                    )
+            for i in range(0, len(rows), batch_size):
+                batch_rows = rows[i : i + batch_size]
+                stmt = mysql.insert(self.table).values(batch_rows)
+                stmt = stmt.on_duplicate_key_update(
+                    name=stmt.inserted.name,
+                    meta_data=stmt.inserted.meta_data,
+                    content=stmt.inserted.content,
+                    embedding=stmt.inserted.embedding,
+                    usage=stmt.inserted.usage,
+                    content_hash=stmt.inserted.content_hash,
                 )
                 sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Upserted document: {document.name} ({document.meta_data})")
-
-            sess.commit()
-            logger.debug(f"Committed {counter} documents")
+                logger.debug(f"Upserted {len(batch_rows)} documents")
+            logger.debug(f"Committed {len(rows)} documents")
 
     def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
         """
@@ -264,7 +252,7 @@ class S2VectorDb(VectorDb):
         Returns:
             List[Document]: List of documents that match the query.
         """
-        query_embedding = self.embedder.get_embedding(query)
+        query_embedding = self.embedder.get_cached_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
@@ -333,6 +321,22 @@ class S2VectorDb(VectorDb):
 
         return search_results
 
+    def delete_by_content_hash(self, content_hashes: List[str], batch_size: int = 1000) -> None:
+        """
+        Delete the documents with the given content hashes, using one statement per batch
+
+        Args:
+            content_hashes (List[str]): Content hashes of the documents to delete
+            batch_size (int): Number of content hashes to delete per statement
+        """
+        from sqlalchemy import delete
+
+        with self.Session.begin() as sess:
+            for i in range(0, len(content_hashes), batch_size):
+                stmt = delete(self.table).where(self.table.c.content_hash.in_(content_hashes[i : i + batch_size]))
+                sess.execute(stmt)
+        logger.debug(f"Deleted {len(content_hashes)} documents")
+
     def delete(self) -> None:
         """
         Delete the table.
@@ -0,0 +1,102 @@
+import pytest
+
+from phi.document import Document
+from phi.document.chunking import FixedSizeChunking, RecursiveChunking, SentenceChunking, TokenChunking
+from phi.document.reader.base import Reader
+
+TEXT = (
+    "Phidata is a framework for building assistants. It adds memory, knowledge and tools to LLMs.\n\n"
+    "Knowledge is stored in a vector db.   Documents are split into chunks before they are embedded!\n"
+    "Each chunk is embedded and written to the vector db. Is the chunk size important? Yes."
+)
+
+
+def test_fixed_size_chunks_fit_and_cover_text():
+    chunker = FixedSizeChunking(chunk_size=40)
+    chunks = chunker.split_text(TEXT)
+
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    # Without overlap, the chunks are consecutive slices of the cleaned text broken at spaces
+    assert "".join(chunks) == FixedSizeChunking.clean_text(TEXT)
+    assert all(chunk.startswith(" ") for chunk in chunks[1:])
+
+
+def test_fixed_size_splits_long_words():
+    chunks = FixedSizeChunking(chunk_size=4).split_text("abcdefghij")
+
+    assert chunks == ["abcd", "efgh", "ij"]
+
+
+def test_fixed_size_overlap():
+    chunks = FixedSizeChunking(chunk_size=40, chunk_overlap=15).split_text(TEXT)
+
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        # The next chunk repeats at most chunk_overlap characters of the previous chunk, starting at a space
+        assert current.startswith(" ")
+        assert any(previous.endswith(current[:n]) for n in range(1, 16))
+
+
+def test_recursive_keeps_paragraphs_together():
+    chunker = RecursiveChunking(chunk_size=100)
+    chunks = chunker.split_text(TEXT)
+
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert chunks[0] == "Phidata is a framework for building assistants. It adds memory, knowledge and tools to LLMs."
+    assert " ".join(chunks).split() == TEXT.split()
+
+
+def test_recursive_splits_text_without_separators():
+    chunks = RecursiveChunking(chunk_size=4).split_text("abcdefghij")
+
+    assert chunks == ["abcd", "efgh", "ij"]
+
+
+def test_sentence_chunks_group_whole_sentences():
+    chunker = SentenceChunking(chunk_size=100)
+    chunks = chunker.split_text(TEXT)
+
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    sentences = chunker.split_sentences(TEXT)
+    assert sentences[1] == "It adds memory, knowledge and tools to LLMs."
+    assert sentences[-2:] == ["Is the chunk size important?", "Yes."]
+    # Every sentence is in a single chunk
+    assert all(any(sentence in chunk for chunk in chunks) for sentence in sentences)
+
+
+def test_sentence_splits_long_sentences():
+    chunks = SentenceChunking(chunk_size=10).split_text("one two three four five six.")
+
+    assert all(len(chunk) <= 10 for chunk in chunks)
+    assert " ".join(chunks) == "one two three four five six."
+
+
+def test_token_chunks():
+    pytest.importorskip("tiktoken")
+    chunker = TokenChunking(chunk_size=8, chunk_overlap=2)
+    chunks = chunker.split_text(TEXT)
+
+    assert all(len(chunker.encoding.encode(chunk)) <= 8 for chunk in chunks)
+    assert chunks[0] == chunker.encoding.decode(chunker.encoding.encode(chunker.clean_text(TEXT))[:8])
+
+
+def test_chunk_documents_ids_and_meta_data():
+    document = Document(id="doc", name="name", meta_data={"page": 1}, content=TEXT)
+    chunks = FixedSizeChunking(chunk_size=100).chunk(document)
+
+    assert [chunk.id for chunk in chunks] == [f"doc_{i}" for i in range(1, len(chunks) + 1)]
+    assert all(chunk.name == "name" for chunk in chunks)
+    assert chunks[0].meta_data == {"page": 1, "chunk": 1, "chunk_size": len(chunks[0].content)}
+    # The meta_data of the document is not modified
+    assert document.meta_data == {"page": 1}
+
+
+def test_reader_default_strategy_follows_chunk_size():
+    reader = Reader(chunk_size=100)
+    document = Document(id="doc", content=TEXT)
+    assert all(len(chunk.content) <= 100 for chunk in reader.chunk_document(document))
+
+    reader.chunk_size = 40
+    chunks = reader.chunk_document(document)
+    assert chunks == FixedSizeChunking(chunk_size=40).chunk(document)
+    assert reader.chunking_strategy is None
@@ -0,0 +1,92 @@
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from phi.document.reader.website import CrawledPage, WebsiteReader
+
+PAGES = {
+    "/": '<main>Home <a href="/a">a</a> <a href="/b">b</a></main>',
+    "/a": "<main>Page a</main>",
+    "/b": "<main>Page b</main>",
+}
+
+
+class Site:
+    """Serves PAGES with an ETag per page and records the requests"""
+
+    def __init__(self) -> None:
+        self.requests: List[str] = []
+        self.not_modified: List[str] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path not in PAGES:
+            return httpx.Response(404)
+        self.requests.append(path)
+        etag = f'"{path}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified.append(path)
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, headers={"ETag": etag}, content=PAGES[path].encode())
+
+
+@pytest.fixture
+def site(monkeypatch) -> Site:
+    _site = Site()
+    async_client = httpx.AsyncClient
+
+    def get_client(**kwargs) -> httpx.AsyncClient:
+        kwargs.pop("limits", None)
+        return async_client(transport=httpx.MockTransport(_site.handler), **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", get_client)
+    return _site
+
+
+def get_reader(**kwargs) -> WebsiteReader:
+    return WebsiteReader(respect_robots_txt=False, requests_per_second=None, **kwargs)
+
+
+def crawl(reader: WebsiteReader, **kwargs) -> Dict[str, CrawledPage]:
+    return {page.url: page for page in reader.iter_crawl_pages("https://example.com/", **kwargs)}
+
+
+def test_cached_pages_are_not_downloaded_again(site):
+    reader = get_reader()
+    first = reader.crawl("https://example.com/")
+    second = reader.crawl("https://example.com/")
+
+    assert first == second
+    assert first["https://example.com/a"] == "Page a"
+    assert sorted(site.not_modified) == ["/", "/a", "/b"]
+
+
+def test_page_cache_is_bounded(site):
+    reader = get_reader(max_cached_pages=2)
+    reader.crawl("https://example.com/")
+
+    assert len(reader._page_cache) == 2
+    # The home page is crawled first, so it is the least recently used
+    assert "https://example.com/" not in reader._page_cache
+
+
+def test_known_pages_from_a_previous_crawl(site):
+    pages = crawl(get_reader())
+    known_pages = {url: page.model_copy(update={"content": None}) for url, page in pages.items()}
+
+    # A new reader, e.g. in another process, only has the validators and links
+    recrawled = crawl(get_reader(max_cached_pages=0), known_pages=known_pages)
+
+    assert sorted(recrawled) == sorted(pages)
+    assert all(page.content is None for page in recrawled.values())
+    assert sorted(site.not_modified) == ["/", "/a", "/b"]
+
+
+def test_modified_known_pages_are_downloaded(site):
+    known_pages = {"https://example.com/a": CrawledPage(url="https://example.com/a", etag='"old"')}
+
+    pages = crawl(get_reader(), known_pages=known_pages)
+
+    assert pages["https://example.com/a"].content == "Page a"
+    assert site.not_modified == []
@@ -0,0 +1,71 @@
+from hashlib import md5
+
+from phi.knowledge.manifest import KnowledgeManifest, SourceRecord, get_file_hash
+
+
+def test_update_returns_hashes_no_longer_used():
+    manifest = KnowledgeManifest(path="manifest.json")
+
+    assert manifest.update("a", SourceRecord(chunk_hashes=["1", "2"])) == []
+    assert manifest.update("b", SourceRecord(chunk_hashes=["2", "3"])) == []
+
+    # "2" is still used by b
+    assert sorted(manifest.update("a", SourceRecord(chunk_hashes=["4"]))) == ["1"]
+    assert sorted(manifest.update("b", None)) == ["2", "3"]
+    assert sorted(manifest.update("a", None)) == ["4"]
+    assert manifest.sources == {}
+
+
+def test_update_with_the_same_chunks_keeps_them():
+    manifest = KnowledgeManifest(path="manifest.json")
+    manifest.update("a", SourceRecord(chunk_hashes=["1", "1", "2"]))
+
+    assert manifest.update("a", SourceRecord(chunk_hashes=["1", "2"])) == []
+    assert sorted(manifest.update("a", None)) == ["1", "2"]
+
+
+def test_update_of_a_missing_source():
+    manifest = KnowledgeManifest(path="manifest.json")
+
+    assert manifest.update("missing", None) == []
+
+
+def test_reference_counts_are_rebuilt_after_read(tmp_path):
+    path = tmp_path / "manifest.json"
+    manifest = KnowledgeManifest(path=path)
+    manifest.update("a", SourceRecord(content_hash="x", chunk_hashes=["1", "2"]))
+    manifest.update("b", SourceRecord(mtime=1.5, size=3, chunk_hashes=["2"]))
+    manifest.write()
+
+    reloaded = KnowledgeManifest.read(path)
+    assert reloaded.sources == manifest.sources
+    assert reloaded.update("a", None) == ["1"]
+    assert reloaded.update("b", None) == ["2"]
+
+
+def test_read_missing_or_invalid_manifest(tmp_path):
+    assert KnowledgeManifest.read(tmp_path / "missing.json").sources == {}
+
+    path = tmp_path / "invalid.json"
+    path.write_text("{not json")
+    assert KnowledgeManifest.read(path).sources == {}
+
+
+def test_write_replaces_the_manifest(tmp_path):
+    path = tmp_path / "nested" / "manifest.json"
+    manifest = KnowledgeManifest(path=path)
+    manifest.update("a", SourceRecord(chunk_hashes=["1"]))
+    manifest.write()
+    manifest.update("a", None)
+    manifest.write()
+
+    assert KnowledgeManifest.read(path).sources == {}
+    assert [p.name for p in path.parent.iterdir()] == ["manifest.json"]
+
+
+def test_get_file_hash(tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"x" * 100)
+
+    # The file is read in chunks, the hash does not depend on the chunk size
+    assert get_file_hash(path, chunk_size=7) == get_file_hash(path) == md5(b"x" * 100).hexdigest()
@@ -0,0 +1,140 @@
+import asyncio
+from typing import List
+
+from phi.document import Document
+from phi.llm.base import LLM
+from phi.llm.message import Message
+from phi.memory.context import ContextWindow
+
+
+class FakeLLM(LLM):
+    model: str = "fake"
+    calls: List[str] = []
+
+    def response(self, messages: List[Message]) -> str:
+        self.calls.append("response")
+        return "sync summary"
+
+    async def aresponse(self, messages: List[Message]) -> str:
+        self.calls.append("aresponse")
+        return "async summary"
+
+
+def get_context_window(**kwargs) -> ContextWindow:
+    # Count 1 token per character so the budgets are easy to follow
+    context_window = ContextWindow(chars_per_token=1, tokens_per_message=0, **kwargs)
+    context_window._encoding = False
+    return context_window
+
+
+def get_history(num_messages: int, size: int = 10) -> List[Message]:
+    return [Message(role="user" if i % 2 == 0 else "assistant", content=str(i) * size) for i in range(num_messages)]
+
+
+def test_everything_fits():
+    context_window = get_context_window(max_tokens=1000)
+    history = get_history(4)
+    documents = [Document(content="doc")]
+
+    result = context_window.fit(
+        messages=[Message(role="user", content="question")], history=history, references=documents
+    )
+
+    assert result.history == history
+    assert result.documents == documents
+    assert result.num_evicted == 0
+    assert result.num_tokens <= 1000
+
+
+def test_recent_history_before_references_before_older_history():
+    document = Document(content="d")
+    document_tokens = get_context_window().count_document_tokens(document)
+    # Room for the fixed message, the document and 4 messages of the history
+    context_window = get_context_window(max_tokens=5 + document_tokens + 40, num_recent_messages=2)
+    history = get_history(6)
+
+    result = context_window.fit(
+        messages=[Message(role="user", content="q" * 5)], history=history, references=[document]
+    )
+
+    assert result.documents == [document]
+    assert result.history == history[-4:]
+    assert result.num_evicted == 2
+    assert result.num_tokens == context_window.max_tokens
+
+
+def test_references_before_older_history():
+    document = Document(content="d")
+    document_tokens = get_context_window().count_document_tokens(document)
+    # The recent messages and the document fit, older messages do not
+    context_window = get_context_window(max_tokens=20 + document_tokens + 5, num_recent_messages=2)
+    history = get_history(6)
+
+    result = context_window.fit(messages=[], history=history, references=[document])
+
+    assert result.documents == [document]
+    assert result.history == history[-2:]
+
+
+def test_documents_that_do_not_fit_are_skipped():
+    context_window = get_context_window(max_tokens=200)
+    small, large = Document(content="small"), Document(content="x" * 500)
+
+    result = context_window.fit(messages=[], references=[large, small])
+
+    assert result.documents == [small]
+
+
+def test_references_string_is_truncated():
+    context_window = get_context_window(max_tokens=20)
+
+    result = context_window.fit(messages=[Message(role="user", content="q" * 5)], references="r" * 100)
+
+    assert result.references == "r" * 15
+
+
+def test_no_gaps_in_history():
+    context_window = get_context_window(max_tokens=35, num_recent_messages=1)
+    history = get_history(2, size=10) + get_history(1, size=30)
+
+    result = context_window.fit(messages=[], history=history)
+
+    # The last message uses 30 tokens, the previous messages do not fit and are dropped together
+    assert result.history == history[-1:]
+    assert result.num_evicted == 2
+
+
+def test_num_history_messages():
+    context_window = get_context_window(max_tokens=1000, num_history_messages=2)
+    history = get_history(6)
+
+    assert context_window.fit(messages=[], history=history).history == history[-2:]
+
+
+def test_evicted_messages_are_summarized_once():
+    llm = FakeLLM(calls=[])
+    context_window = get_context_window(
+        max_tokens=100, num_recent_messages=2, summarize_evicted=True, llm=llm, summary_max_tokens=20
+    )
+    history = get_history(12)
+
+    result = context_window.fit(messages=[], history=history)
+    assert result.summary is not None and "sync summary" in result.summary.get_content_string()
+    assert result.num_evicted > 0
+    assert result.num_tokens <= 100
+
+    # The summary of the same evicted messages is reused
+    context_window.fit(messages=[], history=history)
+    assert llm.calls == ["response"]
+
+
+def test_afit_summarizes_with_aresponse():
+    llm = FakeLLM(calls=[])
+    context_window = get_context_window(
+        max_tokens=100, num_recent_messages=2, summarize_evicted=True, llm=llm, summary_max_tokens=20
+    )
+
+    result = asyncio.run(context_window.afit(messages=[], history=get_history(12)))
+
+    assert result.summary is not None and "async summary" in result.summary.get_content_string()
+    assert llm.calls == ["aresponse"]
@@ -0,0 +1,159 @@
+from typing import List
+
+import pytest
+
+from phi.tools import Toolkit
+from phi.tools.cache import InMemoryToolCache, SqliteToolCache, ToolCache
+from phi.tools.function import FunctionCall
+
+
+class Clock:
+    """Replaces time.monotonic and time.time in the cache modules"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    _clock = Clock()
+    monkeypatch.setattr("phi.tools.cache.memory.monotonic", _clock)
+    monkeypatch.setattr("phi.tools.cache.sqlite.time", _clock)
+    return _clock
+
+
+def test_get_key_normalizes_arguments():
+    assert ToolCache.get_key("f", {"a": 1, "b": 2}) == ToolCache.get_key("f", {"b": 2, "a": 1})
+    assert ToolCache.get_key("f", None) == ToolCache.get_key("f", {})
+    assert ToolCache.get_key("f", {"a": 1}) != ToolCache.get_key("g", {"a": 1})
+    assert ToolCache.get_key("f", {"a": 1}, "x") != ToolCache.get_key("f", {"a": 1}, "y")
+
+
+def test_in_memory_ttl(clock):
+    cache = InMemoryToolCache()
+    cache.set("a", "result", ttl=10)
+    cache.set("b", "result", ttl=None)
+
+    clock.now += 9
+    assert cache.get("a") == "result"
+    clock.now += 1
+    assert cache.get("a") is None
+    assert cache.get("b") == "result"
+    assert len(cache) == 1
+
+
+def test_in_memory_lru():
+    cache = InMemoryToolCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Reading a makes b the least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_sqlite_persists_results(tmp_path):
+    db_file = tmp_path / "cache.db"
+    cache = SqliteToolCache(db_file=db_file)
+    cache.set("a", {"result": [1, 2]}, ttl=60)
+    cache.close()
+
+    reopened = SqliteToolCache(db_file=db_file)
+    assert reopened.get("a") == {"result": [1, 2]}
+    reopened.clear()
+    assert SqliteToolCache(db_file=db_file).get("a") is None
+
+
+def test_sqlite_ttl(tmp_path, clock):
+    cache = SqliteToolCache(db_file=tmp_path / "cache.db", memory_cache_size=0)
+    cache.set("a", "result", ttl=10)
+
+    clock.now += 9
+    assert cache.get("a") == "result"
+    clock.now += 1
+    assert cache.get("a") is None
+
+
+def test_sqlite_memory_layer_keeps_remaining_ttl(tmp_path, clock):
+    db_file = tmp_path / "cache.db"
+    SqliteToolCache(db_file=db_file).set("a", "result", ttl=10)
+
+    cache = SqliteToolCache(db_file=db_file)
+    clock.now += 5
+    assert cache.get("a") == "result"
+    # The result read from the table expires from memory at the same time
+    clock.now += 5
+    assert cache.memory_cache.get("a") is None
+
+
+def test_sqlite_evicts_least_recently_used(tmp_path, clock):
+    cache = SqliteToolCache(db_file=tmp_path / "cache.db", max_size=10, memory_cache_size=0)
+    for i in range(99):
+        clock.now += 1
+        cache.set(str(i), i)
+    # Reading 0 makes it recently used
+    clock.now += 1
+    assert cache.get("0") == 0
+    clock.now += 1
+    # Results are evicted every 100 writes
+    cache.set("99", 99)
+
+    assert cache.get("0") == 0
+    assert cache.get("1") is None
+    assert [cache.get(str(i)) for i in range(91, 100)] == list(range(91, 100))
+
+
+def test_sqlite_keeps_results_that_are_not_json_in_memory(tmp_path):
+    cache = SqliteToolCache(db_file=tmp_path / "cache.db")
+    result = object()
+    cache.set("a", result)
+
+    assert cache.get("a") is result
+    assert SqliteToolCache(db_file=tmp_path / "cache.db").get("a") is None
+
+
+class Weather(Toolkit):
+    def __init__(self, unit: str = "celsius"):
+        super().__init__(name="weather")
+        self.unit = unit
+        self.calls: List[str] = []
+        self.register(self.get_weather)
+
+    def get_weather(self, city: str) -> str:
+        """Returns the weather in a city"""
+        self.calls.append(city)
+        return f"20 {self.unit} in {city}"
+
+
+def call(toolkit: Toolkit, **arguments) -> FunctionCall:
+    function_call = FunctionCall(function=toolkit.functions["get_weather"], arguments=arguments)
+    assert function_call.execute()
+    return function_call
+
+
+def test_toolkit_cache_results():
+    toolkit = Weather().cache_results(ttl=60)
+
+    assert call(toolkit, city="Paris").cache_hit is False
+    function_call = call(toolkit, city="Paris")
+    assert function_call.cache_hit is True
+    assert function_call.result == "20 celsius in Paris"
+    assert toolkit.calls == ["Paris"]
+
+
+def test_toolkits_sharing_a_cache_are_namespaced():
+    cache = InMemoryToolCache()
+    celsius, fahrenheit = Weather().cache_results(cache), Weather(unit="fahrenheit").cache_results(cache)
+
+    assert call(celsius, city="Paris").result == "20 celsius in Paris"
+    assert call(fahrenheit, city="Paris").result == "20 fahrenheit in Paris"
+    # A toolkit with the same settings reads the cached results
+    assert call(Weather().cache_results(cache), city="Paris").cache_hit is True
@@ -0,0 +1,102 @@
+import asyncio
+from typing import AsyncIterator, List
+
+import pytest
+
+from phi.utils import client_cache
+from phi.utils.client_cache import get_cached_async_client
+from phi.utils.run_async import iter_async_sync, run_coroutine_sync
+
+
+async def count(n: int, produced: List[int]) -> AsyncIterator[int]:
+    for i in range(n):
+        await asyncio.sleep(0)
+        produced.append(i)
+        yield i
+
+
+def test_iter_async_sync_yields_items_in_order():
+    assert list(iter_async_sync(lambda: count(5, []))) == [0, 1, 2, 3, 4]
+
+
+def test_iter_async_sync_raises_errors():
+    async def fail() -> AsyncIterator[int]:
+        yield 1
+        raise ValueError("failed")
+
+    iterator = iter_async_sync(fail)
+    assert next(iterator) == 1
+    with pytest.raises(ValueError, match="failed"):
+        next(iterator)
+
+
+def test_iter_async_sync_produces_items_as_they_are_consumed():
+    produced: List[int] = []
+    iterator = iter_async_sync(lambda: count(100, produced))
+
+    assert next(iterator) == 0
+    # The producer is at most a couple of items ahead of the consumer
+    assert len(produced) <= 3
+    iterator.close()
+
+
+def test_iter_async_sync_stops_producer_when_closed():
+    cleanup: List[str] = []
+
+    async def produce() -> AsyncIterator[int]:
+        try:
+            for i in range(100):
+                yield i
+        finally:
+            cleanup.append("closed")
+
+    iterator = iter_async_sync(produce)
+    assert next(iterator) == 0
+    iterator.close()
+
+    assert cleanup == ["closed"]
+
+
+def test_iter_async_sync_in_running_event_loop():
+    async def main() -> List[int]:
+        return list(iter_async_sync(lambda: count(3, [])))
+
+    assert asyncio.run(main()) == [0, 1, 2]
+
+
+def test_run_coroutine_sync():
+    async def add(a: int, b: int) -> int:
+        await asyncio.sleep(0)
+        return a + b
+
+    assert run_coroutine_sync(add(1, 2)) == 3
+
+    async def main() -> int:
+        return run_coroutine_sync(add(2, 3))
+
+    assert asyncio.run(main()) == 5
+
+
+class AsyncClient:
+    def __init__(self, **kwargs) -> None:
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def test_async_clients_of_temporary_loops_are_closed():
+    clients: List[AsyncClient] = []
+
+    async def get_client() -> AsyncClient:
+        clients.append(get_cached_async_client(AsyncClient, {}))
+        return clients[-1]
+
+    async def iterate_clients() -> AsyncIterator[AsyncClient]:
+        yield await get_client()
+
+    run_coroutine_sync(get_client())
+    list(iter_async_sync(iterate_clients))
+
+    assert len(clients) == 2 and all(client.closed for client in clients)
+    assert len(client_cache._async_clients) == 0
@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional, Tuple
+
+from phi.document import Document
+from phi.embedder.base import Embedder
+from phi.vectordb.distance import Distance
+from phi.vectordb.numpydb import NumpyDb
+
+VECTORS = {
+    "apple": [1.0, 0.0, 0.0],
+    "banana": [0.0, 1.0, 0.0],
+    "cherry": [0.0, 0.0, 1.0],
+    "apple pie": [0.9, 0.1, 0.0],
+    "banana bread": [0.1, 0.9, 0.0],
+}
+
+
+class FakeEmbedder(Embedder):
+    dimensions: int = 3
+
+    def get_embedding(self, text: str) -> List[float]:
+        return VECTORS.get(text, [1.0, 1.0, 1.0])
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+
+def get_documents(*contents: str) -> List[Document]:
+    return [
+        Document(id=content, name="fruits", meta_data={"first": content[0]}, content=content) for content in contents
+    ]
+
+
+def get_db(**kwargs) -> NumpyDb:
+    db = NumpyDb(collection="test", embedder=FakeEmbedder(), **kwargs)
+    db.create()
+    return db
+
+
+def test_search_returns_closest_documents():
+    db = get_db()
+    db.insert(get_documents("apple", "banana", "cherry", "apple pie", "banana bread"))
+
+    assert db.get_count() == 5
+    assert [d.content for d in db.search("apple", limit=2)] == ["apple", "apple pie"]
+    assert [d.content for d in db.search("banana", limit=10)][:2] == ["banana", "banana bread"]
+    assert len(db.search("banana", limit=10)) == 5
+
+
+def test_search_with_filters():
+    db = get_db()
+    db.insert(get_documents("apple", "banana", "apple pie", "banana bread"))
+
+    assert [d.content for d in db.search("apple", filters={"first": "b"})] == ["banana bread", "banana"]
+    assert db.search("apple", filters={"first": "z"}) == []
+    assert len(db.search("apple", filters={"name": "fruits"})) == 4
+
+
+def test_l2_and_dot_distance():
+    for distance in (Distance.l2, Distance.max_inner_product):
+        db = get_db(distance=distance)
+        db.insert(get_documents("apple", "banana", "apple pie"))
+        assert db.search("apple", limit=1)[0].content == "apple"
+
+
+def test_insert_skips_existing_content_and_upsert_replaces_by_id():
+    db = get_db()
+    db.insert(get_documents("apple", "banana"))
+    db.insert(get_documents("apple"))
+    assert db.get_count() == 2
+
+    db.upsert([Document(id="apple", name="fruits", content="cherry")])
+    assert db.get_count() == 2
+    assert [d.id for d in db.search("cherry", limit=1)] == ["apple"]
+    assert not db.doc_exists(Document(content="apple"))
+    assert db.doc_exists(Document(content="cherry"))
+
+
+def test_capacity_grows():
+    db = get_db(initial_capacity=2)
+    db.insert([Document(content=f"document {i}") for i in range(10)])
+
+    assert db.get_count() == 10
+    assert db.capacity >= 10
+    assert len(db.search("document", limit=20)) == 10
+
+
+def test_delete_by_content_hash():
+    db = get_db()
+    documents = get_documents("apple", "banana", "cherry")
+    db.insert(documents)
+
+    db.delete_by_content_hash([db.get_content_hash(documents[0])])
+
+    assert db.get_count() == 2
+    assert sorted(d.content for d in db.search("apple", limit=5)) == ["banana", "cherry"]
+    # The last document was moved into the deleted row and can still be found and replaced
+    assert db.search("cherry", limit=1)[0].content == "cherry"
+    db.upsert([Document(id="cherry", name="fruits", content="apple pie")])
+    assert sorted(d.content for d in db.search("apple", limit=5)) == ["apple pie", "banana"]
+
+
+def test_persisted_collection_is_reloaded(tmp_path):
+    db = get_db(path=tmp_path)
+    documents = get_documents("apple", "banana", "cherry", "apple pie")
+    db.insert(documents)
+    db.upsert([Document(id="banana", name="fruits", content="banana bread")])
+    db.delete_by_content_hash([db.get_content_hash(documents[0])])
+    expected = [d.content for d in db.search("apple", limit=5)]
+
+    reloaded = NumpyDb(collection="test", embedder=FakeEmbedder(), path=tmp_path)
+    assert reloaded.get_count() == 3
+    assert [d.content for d in reloaded.search("apple", limit=5)] == expected
+
+    # Compacting the documents file keeps the same collection
+    reloaded.optimize()
+    compacted = NumpyDb(collection="test", embedder=FakeEmbedder(), path=tmp_path)
+    assert [d.content for d in compacted.search("apple", limit=5)] == expected
+    assert len((tmp_path / "test.jsonl").read_text().splitlines()) == 3
+
+
+def test_delete_collection(tmp_path):
+    db = get_db(path=tmp_path)
+    db.insert(get_documents("apple"))
+    db.delete()
+
+    assert not db.exists()
+    assert db.get_count() == 0
+    assert not NumpyDb(collection="test", embedder=FakeEmbedder(), path=tmp_path).exists()